@@ -0,0 +1,220 @@
+"""Mesures de performance : énumération, statistiques et dessin des pages.
+
+    python bench_chemins.py                      # mesure et affiche
+    python bench_chemins.py --save base.json     # garde les mesures comme référence
+    python bench_chemins.py --compare base.json  # signale les régressions (code de sortie 1)
+
+Chaque mesure est répétée (--repeat) et on garde le meilleur temps ; la
+mémoire de pointe vient d'un passage de plus sous tracemalloc (qui ralentit
+beaucoup, donc séparé des mesures de temps). Le dessin des pages est mesuré
+sur un vrai canevas Tk si un écran est disponible, sinon seulement hors
+écran (rendu PNG des vignettes, voir GridPathsViewer.render_page).
+"""
+import argparse
+import json
+import os
+import platform
+import sys
+import time
+import tracemalloc
+from typing import Callable, Dict, List, Optional, Tuple
+
+import moteur_chemins as moteur
+
+# (m, n) des grilles mesurées ; --quick ne garde que les premières
+GRID_SIZES = [(3, 3), (4, 4), (5, 4), (5, 5)]
+QUICK_GRID_SIZES = GRID_SIZES[:2]
+RENDER_GRID = (4, 4)
+RENDER_PAGES = 5
+DEFAULT_THRESHOLD = 0.20   # +20 % de temps ou de mémoire : régression
+MIN_TRIAL_SECONDS = 0.05
+
+
+def measure(run: Callable[[], Optional[int]], repeat: int) -> Dict[str, object]:
+    """Meilleur temps de `run` sur `repeat` essais, débit (run renvoie le
+    nombre d'éléments traités, ou None s'il n'y a pas de débit qui ait un
+    sens) et mémoire de pointe (tracemalloc). Une mesure
+    très courte est répétée dans chaque essai jusqu'à MIN_TRIAL_SECONDS,
+    sinon le bruit de l'horloge l'emporte."""
+    started = time.perf_counter()
+    items = run()
+    loops = max(1, int(MIN_TRIAL_SECONDS / max(time.perf_counter() - started, 1e-6)))
+    best = None
+    for _ in range(max(repeat, 1)):
+        started = time.perf_counter()
+        for _ in range(loops):
+            items = run()
+        elapsed = (time.perf_counter() - started) / loops
+        best = elapsed if best is None else min(best, elapsed)
+    tracemalloc.start()
+    try:
+        run()
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    return {
+        "seconds": round(best, 6),
+        "items": items,
+        "per_second": round(items / best, 1) if best and items is not None else None,
+        "peak_memory_kb": peak // 1024,
+    }
+
+
+def selected(name: str, only: Optional[str]) -> bool:
+    return not only or only in name
+
+
+def count_dp(m: int, n: int) -> None:
+    """Comptage par programmation dynamique : un seul calcul, quel que soit
+    le nombre de chemins, donc pas de débit en chemins par seconde."""
+    moteur.grid_path_stats(m, n)
+
+
+def engine_benchmarks(sizes: List[Tuple[int, int]],
+                      only: Optional[str] = None) -> Dict[str, Callable[[], Optional[int]]]:
+    """Mesures du moteur (sans interface) retenues par `only`, par nom."""
+    benchmarks: Dict[str, Callable[[], Optional[int]]] = {}
+    for m, n in sizes:
+        benchmarks[f"enumeration_grille_{m}x{n}"] = (
+            lambda m=m, n=n: len(moteur.find_all_paths_packed(m, n, workers=1)))
+        benchmarks[f"comptage_dp_{m}x{n}"] = lambda m=m, n=n: count_dp(m, n)
+        benchmarks[f"statistiques_enumeration_{m}x{n}"] = (
+            lambda m=m, n=n: moteur.grid_path_statistics(m, n, workers=1).counts()[0])
+        name = f"statistiques_stockees_{m}x{n}"
+        if selected(name, only):   # énumération préalable seulement si la mesure est demandée
+            store = moteur.find_all_paths_packed(m, n, workers=1)
+            benchmarks[name] = lambda store=store: moteur.path_statistics(store).counts()[0]
+    benchmarks["enumeration_cube"] = lambda: len(moteur.find_all_cube_paths())
+    benchmarks["enumeration_cube4"] = lambda: len(moteur.find_all_hypercube_paths_4d())
+    benchmarks["enumeration_hypercube_q4"] = (
+        lambda: sum(1 for _ in moteur.HypercubePathWalker(4).iter_vertices()))
+    return {name: run for name, run in benchmarks.items() if selected(name, only)}
+
+
+def render_benchmarks(pages: int, only: Optional[str] = None
+                      ) -> Tuple[Dict[str, Callable[[], Optional[int]]], Optional[object]]:
+    """Mesures du dessin : rendu hors écran d'une page (toujours) et dessin
+    sur les canevas Tk (seulement si une fenêtre peut être ouverte). Renvoie
+    aussi la fenêtre Tk à détruire à la fin (ou None). Rien n'est préparé si
+    `only` n'en retient aucune."""
+    m, n = RENDER_GRID
+    offscreen_name, canvas_name = f"rendu_png_{m}x{n}_pages", f"rendu_tk_{m}x{n}_pages"
+    if not (selected(offscreen_name, only) or selected(canvas_name, only)):
+        return {}, None
+    try:
+        import tkinter as tk
+        import chemins_grille
+    except ImportError:
+        return {}, None
+    store = moteur.find_all_paths_packed(m, n, workers=1)
+    per_page = 12
+    page_paths = [[store[k] for k in range(page * per_page, (page + 1) * per_page)]
+                  for page in range(pages)]
+    layout = chemins_grille.GridPathsViewer.grid_layout(m, n, 300, 200)
+    layouts = [(("grid", (m, n), 300, 200), layout)] * per_page
+
+    def offscreen() -> int:
+        for paths in page_paths:
+            chemins_grille.GridPathsViewer.render_page(("grid", paths, layouts))
+        return pages
+
+    benchmarks = {offscreen_name: offscreen} if selected(offscreen_name, only) else {}
+    if not selected(canvas_name, only):
+        return benchmarks, None
+    try:
+        root = tk.Tk()
+    except tk.TclError:   # pas d'écran : seulement le rendu hors écran
+        return benchmarks, None
+    root.state = lambda *args: None   # pas de fenêtre maximisée pendant les mesures
+    root.geometry("1200x800")
+    viewer = chemins_grille.GridPathsViewer(root)
+    viewer.show_paths(store)
+    root.update()
+
+    def on_canvas() -> int:
+        for page in range(pages):
+            viewer.page_renders.clear()   # dessin vectoriel, pas les images pré-rendues
+            viewer.current_page = page
+            viewer.draw_current_page()
+            root.update_idletasks()
+        return pages
+
+    benchmarks[canvas_name] = on_canvas
+    return benchmarks, root
+
+
+def run_benchmarks(quick: bool = False, repeat: int = 3, only: Optional[str] = None) -> dict:
+    sizes = QUICK_GRID_SIZES if quick else GRID_SIZES
+    benchmarks = engine_benchmarks(sizes, only)
+    render, root = render_benchmarks(2 if quick else RENDER_PAGES, only)
+    benchmarks.update(render)
+    results = {}
+    try:
+        for name, run in benchmarks.items():
+            results[name] = measure(run, repeat)
+            result = results[name]
+            rate = f", {result['per_second']:.0f}/s" if result["per_second"] else ""
+            print(f"{name:40s} {result['seconds'] * 1000:10.2f} ms{rate}, "
+                  f"{result['peak_memory_kb']} Kio", flush=True)
+    finally:
+        if root is not None:
+            root.destroy()
+    return {
+        "meta": {
+            "date": time.strftime("%Y-%m-%d %H:%M:%S"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "numpy": moteur.HAS_NUMPY,
+            "quick": quick,
+        },
+        "results": results,
+    }
+
+
+def compare(current: dict, baseline: dict, threshold: float) -> List[str]:
+    """Mesures plus lentes (ou plus gourmandes) que la référence de plus de
+    `threshold` (0.2 = 20 %)."""
+    regressions = []
+    for name, result in current["results"].items():
+        reference = baseline.get("results", {}).get(name)
+        if reference is None:
+            continue
+        for key, label in (("seconds", "temps"), ("peak_memory_kb", "mémoire")):
+            old, new = reference.get(key), result.get(key)
+            if old and new is not None and new > old * (1 + threshold):
+                regressions.append(f"{name} : {label} {old} -> {new} (+{new / old - 1:.0%})")
+    return regressions
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Mesures de performance des chemins sur grille.")
+    parser.add_argument("--quick", action="store_true", help="petites grilles seulement")
+    parser.add_argument("--repeat", type=int, default=3, help="essais par mesure (meilleur temps gardé)")
+    parser.add_argument("--only", default=None, help="seulement les mesures dont le nom contient ce texte")
+    parser.add_argument("--save", default=None, help="écrire les mesures dans ce fichier JSON")
+    parser.add_argument("--compare", default=None, help="fichier JSON de référence (--save précédent)")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                        help=f"hausse tolérée avant de signaler une régression (défaut {DEFAULT_THRESHOLD})")
+    args = parser.parse_args(argv)
+
+    current = run_benchmarks(args.quick, args.repeat, args.only)
+    if args.save:
+        with open(args.save, "w", encoding="utf-8") as handle:
+            json.dump(current, handle, indent=2)
+    if args.compare:
+        if not os.path.exists(args.compare):
+            print(f"Référence introuvable : {args.compare}", file=sys.stderr)
+            return 2
+        with open(args.compare, "r", encoding="utf-8") as handle:
+            baseline = json.load(handle)
+        regressions = compare(current, baseline, args.threshold)
+        for line in regressions:
+            print(f"RÉGRESSION {line}")
+        if regressions:
+            return 1
+        print(f"Pas de régression (seuil {args.threshold:.0%}).")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
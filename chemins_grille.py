@@ -1,22 +1,283 @@
+import math
+import os
+import queue
+import sys
+import threading
+import time
 import tkinter as tk
+from collections import OrderedDict
 from tkinter import ttk
-from typing import List, Tuple
+from typing import Callable, Dict, List, Optional, Tuple
+
+from moteur_chemins import (
+    INSTRUMENTATION_ENV, PATH_STORE_DIR, Chemin, FilteredPaths, GridPathSampler,
+    GridSearch, LazyPathSequence, PageFetcher, PathQueryIndex, ResultCache,
+    batch_main, cached_paths, describe_heatmap, direction_shares,
+    find_all_cube_paths, find_all_hypercube_paths_4d, find_all_paths_symmetric,
+    format_big, grid_path_stats, instrumentation, lazy_grid_paths, page_run_ends,
+    parse_path_query, path_count, path_to_codes, run_end_flags, step_summary,
+    stored_codes,
+)
+
+
+# --- Rendu hors écran des vignettes (PNG, en Python pur) ---
+# Couleurs nommées utilisées par les dessins, valeurs de Tk 8.6 (où "green"
+# vaut #008000 comme en CSS, pas #00ff00)
+_RASTER_COLORS = {"black": (0, 0, 0), "blue": (0, 0, 255), "green": (0, 128, 0), "red": (255, 0, 0)}
+PAGE_RENDER_CACHE_PAGES = 6   # pages de vignettes rendues gardées (voir PageRenderCache)
+
+
+def _raster_color(color: str) -> bytes:
+    if color.startswith("#") and len(color) == 7:
+        rgb = tuple(int(color[k:k + 2], 16) for k in (1, 3, 5))
+    else:
+        rgb = _RASTER_COLORS.get(color, (0, 0, 0))
+    return bytes(rgb) + b"\xff"
+
+
+class OverlayRaster:
+    """Image RGBA transparente où l'on dessine les éléments d'un chemin
+    (lignes épaisses avec flèches à la manière de Tk, ovales pleins), sans Tk :
+    utilisable dans un thread. png() l'encode pour tk.PhotoImage.
+    """
+
+    def __init__(self, width: int, height: int):
+        self.width = width
+        self.height = height
+        self.pixels = bytearray(width * height * 4)
+
+    def fill_polygon(self, points: List[Tuple[float, float]], rgba: bytes) -> None:
+        """Remplit un polygone (règle pair-impair, centres des pixels)."""
+        ys = [y for _, y in points]
+        top = max(int(math.floor(min(ys))), 0)
+        bottom = min(int(math.ceil(max(ys))), self.height)
+        edges = list(zip(points, points[1:] + points[:1]))
+        stride = self.width * 4
+        for row in range(top, bottom):
+            yc = row + 0.5
+            xs = sorted(
+                x1 + (yc - y1) * (x2 - x1) / (y2 - y1)
+                for (x1, y1), (x2, y2) in edges
+                if (y1 <= yc < y2) or (y2 <= yc < y1)
+            )
+            base = row * stride
+            for left, right in zip(xs[0::2], xs[1::2]):
+                start = max(int(left + 0.5), 0)
+                stop = min(int(right + 0.5), self.width)
+                if stop > start:
+                    self.pixels[base + 4 * start:base + 4 * stop] = rgba * (stop - start)
+
+    def fill_oval(self, x0: float, y0: float, x1: float, y1: float, rgba: bytes) -> None:
+        cx, cy = (x0 + x1) / 2, (y0 + y1) / 2
+        rx, ry = max((x1 - x0) / 2, 0.5), max((y1 - y0) / 2, 0.5)
+        stride = self.width * 4
+        for row in range(max(int(y0), 0), min(int(math.ceil(y1)) + 1, self.height)):
+            dy = (row + 0.5 - cy) / ry
+            if abs(dy) > 1:
+                continue
+            half = rx * math.sqrt(1 - dy * dy)
+            start = max(int(cx - half + 0.5), 0)
+            stop = min(int(cx + half + 0.5), self.width)
+            if stop > start:
+                self.pixels[row * stride + 4 * start:row * stride + 4 * stop] = rgba * (stop - start)
+
+    def line(self, coords, fill: str = "black", width: float = 1, arrow: str = "none",
+             arrowshape=(8, 10, 3), **_options) -> None:
+        """Ligne brisée épaisse (bouts droits) ; arrow="last" : la ligne
+        s'arrête au col de la flèche, dessinée comme par Tk (arrowshape)."""
+        rgba = _raster_color(fill)
+        points = list(zip(coords[0::2], coords[1::2]))
+        half = width / 2
+        for index, ((x1, y1), (x2, y2)) in enumerate(zip(points, points[1:])):
+            length = math.hypot(x2 - x1, y2 - y1)
+            if not length:
+                continue
+            ux, uy = (x2 - x1) / length, (y2 - y1) / length
+            nx, ny = -uy * half, ux * half
+            last = index == len(points) - 2
+            if last and arrow == tk.LAST:
+                neck, back, side = arrowshape
+                tip_x, tip_y = x2, y2
+                x2, y2 = tip_x - ux * min(neck, length), tip_y - uy * min(neck, length)
+                wing = half + side
+                self.fill_polygon([
+                    (tip_x, tip_y),
+                    (tip_x - ux * back - uy * wing, tip_y - uy * back + ux * wing),
+                    (tip_x - ux * neck - uy * half, tip_y - uy * neck + ux * half),
+                    (tip_x - ux * neck + uy * half, tip_y - uy * neck - ux * half),
+                    (tip_x - ux * back + uy * wing, tip_y - uy * back - ux * wing),
+                ], rgba)
+            self.fill_polygon([(x1 + nx, y1 + ny), (x2 + nx, y2 + ny), (x2 - nx, y2 - ny), (x1 - nx, y1 - ny)], rgba)
+            if not last and width > 2:
+                self.fill_oval(x2 - half, y2 - half, x2 + half, y2 + half, rgba)   # jointure
+
+    def draw(self, items: List[tuple]) -> None:
+        """Dessine des éléments (("line" | "oval", coordonnées, options))."""
+        for kind, coords, options in items:
+            if kind == "line":
+                self.line(coords, **options)
+            else:
+                self.fill_oval(*coords, _raster_color(options.get("fill", "black")))
+
+    def png(self) -> bytes:
+        import struct   # modules du rendu hors écran : pas au démarrage de la fenêtre
+        import zlib
+        stride = self.width * 4
+        raw = b"".join(b"\x00" + bytes(self.pixels[row * stride:(row + 1) * stride])
+                       for row in range(self.height))
+
+        def chunk(kind: bytes, data: bytes) -> bytes:
+            return struct.pack(">I", len(data)) + kind + data + struct.pack(">I", zlib.crc32(kind + data))
+
+        header = struct.pack(">IIBBBBB", self.width, self.height, 8, 6, 0, 0, 0)   # RGBA 8 bits
+        return (b"\x89PNG\r\n\x1a\n" + chunk(b"IHDR", header)
+                + chunk(b"IDAT", zlib.compress(raw, 1)) + chunk(b"IEND", b""))
+
+
+class PageRenderCache:
+    """Pages de vignettes rendues à l'avance par un thread, gardées dans un LRU.
+
+    request(clé, travail) met un travail en file s'il n'est ni fait ni en
+    cours ; le thread appelle `render(travail)`, qui renvoie une image PNG par
+    vignette, et range le résultat sous la clé. get(clé) est appelé par
+    l'interface quand elle change de page. Seules les max_pages dernières
+    pages sont gardées.
+    """
+
+    def __init__(self, render: Callable[[tuple], List[bytes]],
+                 max_pages: int = PAGE_RENDER_CACHE_PAGES):
+        self._render = render
+        self.max_pages = max_pages
+        self._pages: "OrderedDict[tuple, List[bytes]]" = OrderedDict()
+        self._pending = set()
+        self._lock = threading.Lock()
+        self._jobs: "queue.Queue[tuple]" = queue.Queue()
+        self._thread: Optional[threading.Thread] = None
+
+    def get(self, key: tuple) -> Optional[List[bytes]]:
+        with self._lock:
+            images = self._pages.get(key)
+            if images is not None:
+                self._pages.move_to_end(key)
+            return images
+
+    def request(self, key: tuple, job: tuple) -> None:
+        with self._lock:
+            if key in self._pages or key in self._pending:
+                return
+            self._pending.add(key)
+        self._jobs.put((key, job))
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, daemon=True)
+            self._thread.start()
+
+    def clear(self) -> None:
+        with self._lock:
+            self._pages.clear()
+
+    def _run(self) -> None:
+        while True:
+            key, job = self._jobs.get()
+            try:
+                images = self._render(job)
+            except Exception:   # page non pré-rendue : elle sera dessinée normalement
+                images = None
+            with self._lock:
+                self._pending.discard(key)
+                if images is not None:
+                    self._pages[key] = images
+                    while len(self._pages) > self.max_pages:
+                        self._pages.popitem(last=False)
+
+
+# --- Réutilisation des éléments dessinés sur les vignettes ---
+class CanvasItemPool:
+    """Lignes et ovales d'un canevas réutilisés d'un dessin à l'autre.
+
+    Au lieu de supprimer puis recréer les éléments du chemin à chaque page,
+    begin() commence un dessin, line() / oval() déplacent (coords) et
+    reconfigurent (itemconfig, seulement les options qui changent) un élément
+    déjà créé s'il en reste un de libre, sinon en créent un, et finish() cache
+    les éléments en trop. Après un canvas.delete("all"), appeler clear().
+    """
+
+    def __init__(self, canvas, tag: str):
+        self.canvas = canvas
+        self.tag = tag
+        self._items: Dict[str, List[int]] = {"line": [], "oval": []}
+        self._used = {"line": 0, "oval": 0}
+        self._options: Dict[int, dict] = {}   # options actuelles de chaque élément
+
+    def begin(self) -> None:
+        self._used = {"line": 0, "oval": 0}
+
+    def line(self, coords, **options) -> int:
+        return self._draw("line", coords, options)
+
+    def oval(self, coords, **options) -> int:
+        return self._draw("oval", coords, options)
+
+    def _draw(self, kind: str, coords, options: dict) -> int:
+        options["state"] = "normal"
+        items = self._items[kind]
+        used = self._used[kind]
+        if used < len(items):
+            item = items[used]
+            self.canvas.coords(item, *coords)
+            current = self._options[item]
+            changed = {key: value for key, value in options.items() if current.get(key) != value}
+            if changed:
+                self.canvas.itemconfig(item, **changed)
+                current.update(changed)
+        else:
+            create = self.canvas.create_line if kind == "line" else self.canvas.create_oval
+            item = create(*coords, tags=self.tag, **options)
+            items.append(item)
+            self._options[item] = options
+        self._used[kind] = used + 1
+        return item
+
+    def finish(self) -> None:
+        for kind, items in self._items.items():
+            for item in items[self._used[kind]:]:
+                if self._options[item]["state"] != "hidden":
+                    self.canvas.itemconfig(item, state="hidden")
+                    self._options[item]["state"] = "hidden"
+
+    def clear(self) -> None:
+        """Oublie les éléments (déjà supprimés du canevas)."""
+        self._items = {"line": [], "oval": []}
+        self._options.clear()
+        self.begin()
 
-Point = Tuple[int, int]
-Chemin = List[Tuple[int, int]]
 
 class GridPathsViewer:
-    def __init__(self, root):
+    POLL_MS = 100   # intervalle de lecture des messages du calcul en arrière-plan
+    RESIZE_DELAY_MS = 80   # attente après le dernier <Configure> avant de redessiner
+    COUNTERS_REFRESH_MS = 500   # mise à jour du panneau des compteurs (menu Débogage)
+
+    def __init__(self, root, defer_thumbnails: bool = False):
         self.root = root
         self.root.title("BOUADJADJ ISLAM – v.1.1")
-        self.root.state("zoomed")
+        try:
+            self.root.state("zoomed")
+        except tk.TclError:   # X11 : pas d'état « zoomed »
+            self.root.attributes("-zoomed", True)
+        # defer_thumbnails : les vignettes sont créées par create_thumbnails(),
+        # après le premier affichage de la fenêtre (démarrage plus rapide)
+        self.defer_thumbnails = defer_thumbnails
         self.root.rowconfigure(2, weight=1)
         self.root.columnconfigure(0, weight=1)
 
         # Variables
         self.m = tk.IntVar(value=3)   # largeur 
         self.n = tk.IntVar(value=2)   # hauteur 
-        self.paths = []               # liste de tous les chemins
+        self.workers = tk.IntVar(value=os.cpu_count() or 1)  # processus pour l'énumération
+        self.use_disk_store = tk.BooleanVar(value=False)  # grandes grilles : chemins écrits sur disque
+        self.goto_value = tk.StringVar(value="")  # numéro de page ou de chemin à afficher
+        self.filter_value = tk.StringVar(value="")  # filtre sur les chemins, voir parse_path_query
+        self.paths = []               # chemins (liste, ou LazyPathSequence énumérée page par page)
+        self.query_index: Optional[PathQueryIndex] = None  # index des chemins affichés sans filtre
         self.current_page = 0         # page courante (pour affichage par page)
         self.paths_per_page = 12      # nombre de chemins par page (3 lignes x 4 colonnes)
         self.selected_path_index = None  # indice global du chemin sélectionné
@@ -27,11 +288,45 @@ class GridPathsViewer:
         self.directions_text = tk.StringVar(value="")
         self.stats_text = tk.StringVar(value="")
         self.last_stats = ""          # texte des statistiques globales à afficher dans la zone de texte
+        # résultats déjà calculés, par (mode, m, n) : en mémoire et dans PATH_STORE_DIR
+        self.result_cache = ResultCache(PATH_STORE_DIR)
+        self.search: Optional[GridSearch] = None  # énumération en cours (thread)
+        self.shown_path_count = 0     # nombre de chemins connus au dernier dessin
+        # fond fixe des vignettes : positions par (mode, grille, taille), et fond présent sur chaque canevas
+        self.canvas_layouts: Dict[tuple, Dict[tuple, Tuple[float, float]]] = {}
+        self.canvas_backgrounds: Dict[object, tuple] = {}
+        self.canvas_pools: Dict[object, CanvasItemPool] = {}  # éléments du chemin, réutilisés
+        self._draw_job = None         # dessin de la page courante déjà demandé (voir schedule_draw)
+        # pages voisines rendues à l'avance en images (voir prerender_neighbour_pages)
+        self.page_renders = PageRenderCache(self.render_page)
+        self.canvas_images: Dict[object, list] = {}   # canevas -> [élément image, PhotoImage affichée]
+        self.paths_version = 0        # change avec self.paths : invalide les pages rendues
+        self._prerender_job = None
+        # pages des grandes grilles lues dans un thread (LazyPathSequence, voir request_page)
+        self.page_fetcher = PageFetcher()
+        self.fetched_page: Optional[tuple] = None   # ((version, début, fin), chemins) dernière page lue
+        self._requested_page: Optional[tuple] = None
+        self._label_before_fetch = ""   # texte de progress_label rétabli après la lecture
+        self._fetch_polling = False
+        # menu « Débogage » : compteurs et profil des calculs (voir Instrumentation)
+        self.instrumentation_on = tk.BooleanVar(value=instrumentation.enabled)
+        self.counters_window: Optional[tk.Toplevel] = None
 
         self.create_widgets()
 
     # Interface graphique 
     def create_widgets(self):
+        # Menu « Débogage » : mesures des calculs et du dessin
+        menubar = tk.Menu(self.root)
+        debug_menu = tk.Menu(menubar, tearoff=False)
+        debug_menu.add_checkbutton(label="Instrumentation", variable=self.instrumentation_on,
+                                   command=self.toggle_instrumentation)
+        debug_menu.add_command(label="Compteurs…", command=self.show_counters_panel)
+        debug_menu.add_command(label="Enregistrer le profil du dernier calcul (.prof)",
+                               command=self.save_profile)
+        menubar.add_cascade(label="Débogage", menu=debug_menu)
+        self.root.config(menu=menubar)
+
         # Cadre de contrôle (m, n, Calculer) en haut
         control_frame = ttk.Frame(self.root, padding=10)
         control_frame.grid(row=0, column=0, sticky="ew")
@@ -50,6 +345,16 @@ class GridPathsViewer:
         # Bouton pour calculer les chemins sur un hypercube (16 sommets)
         ttk.Button(control_frame, text="Calculer cube 4D (16 sommets)", command=self.calculate_hypercube_paths).grid(row=0, column=6, padx=10)
 
+        # Nombre de processus utilisés pour énumérer les chemins de la grille
+        ttk.Label(control_frame, text="Processus :").grid(row=0, column=7, padx=2)
+        ttk.Spinbox(control_frame, from_=1, to=64, textvariable=self.workers, width=4).grid(row=0, column=8, padx=2)
+
+        # Grandes grilles : énumérer dans un fichier (relu par mmap) au lieu de page par page
+        ttk.Checkbutton(control_frame, text="Sur disque", variable=self.use_disk_store).grid(row=0, column=9, padx=10)
+
+        # Grilles trop grandes pour tout énumérer : chemins tirés au hasard
+        ttk.Button(control_frame, text="Échantillon aléatoire", command=self.calculate_sample_paths).grid(row=0, column=10, padx=10)
+
         # Cadre navigation (Précédent / Suivant + compteur de pages)
         nav_frame = ttk.Frame(self.root, padding=10)
         nav_frame.grid(row=1, column=0, sticky="ew")
@@ -59,6 +364,25 @@ class GridPathsViewer:
         self.page_label.grid(row=0, column=1, padx=20)
         ttk.Button(nav_frame, text="Suivant", command=self.next_page).grid(row=0, column=2, padx=5)
 
+        # Accès direct à une page ou à un chemin (numéros à partir de 1)
+        ttk.Entry(nav_frame, textvariable=self.goto_value, width=12).grid(row=0, column=3, padx=(20, 2))
+        ttk.Button(nav_frame, text="Aller à la page", command=self.go_to_page).grid(row=0, column=4, padx=2)
+        ttk.Button(nav_frame, text="Aller au chemin n°", command=self.go_to_path).grid(row=0, column=5, padx=2)
+
+        # Calcul en cours : bouton d'arrêt et progression (chemins, cases visitées, temps)
+        self.cancel_button = ttk.Button(nav_frame, text="Annuler", command=self.cancel_search, state="disabled")
+        self.cancel_button.grid(row=0, column=6, padx=20)
+        self.progress_label = ttk.Label(nav_frame, text="")
+        self.progress_label.grid(row=0, column=7, padx=5)
+
+        # Filtre sur les chemins calculés (ex. « gauche=0 bas=3 », « longueur=min »)
+        ttk.Label(nav_frame, text="Filtre :").grid(row=1, column=0, padx=5, pady=(5, 0))
+        filter_entry = ttk.Entry(nav_frame, textvariable=self.filter_value, width=40)
+        filter_entry.grid(row=1, column=1, columnspan=3, sticky="ew", padx=2, pady=(5, 0))
+        filter_entry.bind("<Return>", lambda event: self.apply_filter())
+        ttk.Button(nav_frame, text="Filtrer", command=self.apply_filter).grid(row=1, column=4, padx=2, pady=(5, 0))
+        ttk.Button(nav_frame, text="Tout afficher", command=self.clear_filter).grid(row=1, column=5, padx=2, pady=(5, 0))
+
         # Cadre principal pour le contenu : zone de saisie + grilles en bas sur toute la largeur
         content_frame = ttk.Frame(self.root, padding=10)
         content_frame.grid(row=2, column=0, sticky="nsew")
@@ -73,8 +397,12 @@ class GridPathsViewer:
         self.canvas_frame = ttk.Frame(content_frame)
         self.canvas_frame.grid(row=1, column=0, padx=10, pady=10, sticky="nsew")
 
-        # Création des mini-canevas (3 lignes x 4 colonnes)
         self.thumbnail_canvases = []
+        if not self.defer_thumbnails:
+            self.create_thumbnails()
+
+    def create_thumbnails(self) -> None:
+        """Création des mini-canevas (3 lignes x 4 colonnes)."""
         rows, cols = 3, 4
         for r in range(rows):
             self.canvas_frame.rowconfigure(r, weight=1)
@@ -87,15 +415,58 @@ class GridPathsViewer:
             canvas = tk.Canvas(self.canvas_frame, bg="white")
             canvas.grid(row=r, column=c, padx=5, pady=5, sticky="nsew")
             canvas.bind("<Button-1>", lambda event, idx=i: self.on_thumbnail_click(idx))
+            # redimensionnement : un seul dessin une fois la rafale d'événements passée
+            canvas.bind("<Configure>", lambda event: self.schedule_draw(self.RESIZE_DELAY_MS))
+            self.canvas_pools[canvas] = CanvasItemPool(canvas, self.PATH_TAG)
             self.thumbnail_canvases.append(canvas)
 
         # Mise en page initiale des canevas (adaptée au mode courant)
         self.update_canvas_layout()
 
+    # --- Débogage : instrumentation et profil ---
+    def toggle_instrumentation(self) -> None:
+        instrumentation.enabled = self.instrumentation_on.get()
+        if instrumentation.enabled:
+            self.show_counters_panel()
+
+    def show_counters_panel(self) -> None:
+        """Petite fenêtre qui affiche les compteurs, mise à jour en continu."""
+        if self.counters_window is not None and self.counters_window.winfo_exists():
+            self.counters_window.lift()
+            return
+        window = tk.Toplevel(self.root)
+        window.title("Compteurs")
+        label = ttk.Label(window, text="", justify="left", font=("Courier", 10), padding=10)
+        label.grid(row=0, column=0, sticky="nw")
+        ttk.Button(window, text="Remettre à zéro", command=instrumentation.reset).grid(row=1, column=0, pady=5)
+        self.counters_window = window
+        self.refresh_counters_panel(label)
+
+    def refresh_counters_panel(self, label) -> None:
+        if self.counters_window is None or not self.counters_window.winfo_exists():
+            self.counters_window = None
+            return
+        if instrumentation.enabled:
+            label.config(text=instrumentation.describe())
+        else:
+            label.config(text=f"Instrumentation désactivée (menu Débogage ou {INSTRUMENTATION_ENV}=1).")
+        self.root.after(self.COUNTERS_REFRESH_MS, self.refresh_counters_panel, label)
+
+    def save_profile(self) -> None:
+        """Écrit le profil cProfile du dernier « Calculer » dans PATH_STORE_DIR."""
+        filename = os.path.join(PATH_STORE_DIR, "dernier_calcul.prof")
+        os.makedirs(PATH_STORE_DIR, exist_ok=True)
+        if instrumentation.dump_profile(filename):
+            self.progress_label.config(text=f"Profil enregistré : {filename}")
+        else:
+            self.progress_label.config(text="Pas de profil : activer l'instrumentation puis relancer le calcul")
+
     # --- Calcul des chemins ---
     def calculate_paths(self):
         m = self.m.get()
         n = self.n.get()
+        self.stop_search()
+        self.release_paths()
         if m < 0 or n < 0:
             self.paths = []
             self.current_page = 0
@@ -106,108 +477,291 @@ class GridPathsViewer:
             if hasattr(self, "user_text"):
                 self.user_text.delete("1.0", "end")
             for canvas in self.thumbnail_canvases:
-                canvas.delete("all")
+                self.clear_canvas(canvas)
             return
 
-        self.paths = self.find_all_paths(m, n)
         self.current_page = 0
-        self.selected_path_index = 0 if self.paths else None
         self.current_mode = "grid"
 
-        # Statistiques globales sur les directions haut / gauche
-        self.update_global_direction_stats()
+        self.progress_label.config(text="")
+
+        cached = self.result_cache.get("grid", m, n)
+        total = None
+        if cached is not None:
+            # Même grille déjà calculée (dans cette session ou une précédente)
+            total = cached["total"]
+            self.last_stats = cached["stats"]
+            paths = cached["paths"]
+            page_by_page = isinstance(getattr(paths, "base", paths), LazyPathSequence)
+            if paths is not None and not (page_by_page and self.use_disk_store.get()):
+                self.show_paths(paths)
+                return
+        else:
+            self.last_stats = "Comptage des chemins…"
+
+        # Comptage (DP) et énumération dans un thread ; les chemins trouvés
+        # s'affichent au fur et à mesure (voir poll_search)
+        self.search = GridSearch(m, n, max(self.workers.get(), 1), self.use_disk_store.get(), total)
+        self.cancel_button.config(state="normal")
+        self.progress_label.config(text="Calcul en cours…")
+        self.show_paths(self.search.paths)
+        self.search.start()
+        self.root.after(self.POLL_MS, self.poll_search, self.search)
+
+    def show_paths(self, paths) -> None:
+        """Affiche une nouvelle série de chemins à partir de la première page."""
+        self.paths = paths
+        self.paths_version += 1
+        self.current_page = 0
+        self.selected_path_index = 0 if self.path_total() else None
+        self.shown_path_count = self.path_total()
 
         self.update_canvas_layout()
         self.update_page_label()
         self.draw_current_page()
         self.update_current_path_details()
 
-    def find_all_paths(self, m: int, n: int) -> List[Chemin]:
-        rows = n + 1
-        cols = m + 1
-        start: Point = (0, 0)
-        end: Point = (m, n)
-
-        directions: List[Point] = [
-            (1, 0),
-            (0, 1),
-            (-1, 0),
-            (0, -1),
-        ]
-
-        all_paths: List[Chemin] = []
-
-        def is_valid(x: int, y: int, visited: set[Point]) -> bool:
-            return 0 <= x < cols and 0 <= y < rows and (x, y) not in visited
-
-        def dfs(current: Point, visited: set[Point], path: Chemin) -> None:
-            if current == end:
-                all_paths.append(list(path))
+    # --- Calcul en arrière-plan ---
+    def poll_search(self, search: GridSearch) -> None:
+        """Lit les messages du thread de calcul (appelé par root.after)."""
+        if search is not self.search:
+            return   # calcul remplacé par un autre : messages ignorés
+        while True:
+            try:
+                message = search.messages.get_nowait()
+            except queue.Empty:
+                break
+            kind = message[0]
+            if kind == "stats":
+                self.set_direction_stats(*message[1:])
+                self.update_current_path_details()
+            elif kind == "progress":
+                _kind, found, nodes, elapsed = message
+                self.progress_label.config(
+                    text=f"{found} chemins trouvés, {nodes} cases visitées, {elapsed:.1f} s"
+                )
+            elif kind == "done":
+                self.finish_search(search, message[1])
+                return
+            elif kind == "cancelled":
+                self.end_search()
+                self.progress_label.config(text=f"Calcul interrompu après {search.elapsed():.1f} s")
+                self.last_stats += f"\nCalcul interrompu : {message[1]} chemins trouvés sur {search.total}"
+                details = search.path_stats().describe()
+                if details:
+                    self.last_stats += "\nSur les chemins trouvés :\n" + details
+                self.refresh_partial_results()
+                self.update_current_path_details()
+                return
+            elif kind == "error":
+                self.end_search()
+                self.progress_label.config(text="Erreur pendant le calcul")
+                self.last_stats += f"\nErreur pendant le calcul : {message[1]}"
+                self.update_current_path_details()
                 return
+        self.refresh_partial_results()
+        self.root.after(self.POLL_MS, self.poll_search, search)
+
+    def refresh_partial_results(self) -> None:
+        """Pendant le calcul : met à jour le nombre de pages et redessine la page
+        courante si de nouveaux chemins y sont arrivés."""
+        total = self.path_total()
+        if total == self.shown_path_count:
+            return
+        page_end = (self.current_page + 1) * self.get_paths_per_page()
+        if self.shown_path_count < page_end:
+            self.draw_current_page()
+        self.shown_path_count = total
+        self.update_page_label()
+        if self.selected_path_index is None:
+            self.selected_path_index = 0
+            self.update_current_path_details()
 
-            x, y = current
-            for dx, dy in directions:
-                nx, ny = x + dx, y + dy
-                next_point = (nx, ny)
-                if is_valid(nx, ny, visited):
-                    visited.add(next_point)
-                    path.append(next_point)
-                    dfs(next_point, visited, path)
-                    path.pop()
-                    visited.remove(next_point)
+    def finish_search(self, search: GridSearch, result) -> None:
+        """Fin normale du calcul : on garde le résultat (et on le met en cache)."""
+        self.end_search()
+        m, n = search.m, search.n
+        if result is None:
+            # Grille trop grande : on n'énumère que les pages affichées (plus une page d'avance)
+            result = lazy_grid_paths(m, n, search.total, self.get_paths_per_page())
+            self.progress_label.config(text="Chemins énumérés page par page")
+        else:
+            self.progress_label.config(text=f"{len(result)} chemins en {search.elapsed():.1f} s")
+            # statistiques accumulées pendant l'énumération : pas de second parcours
+            started = time.perf_counter()
+            details = search.path_stats().describe()
+            instrumentation.add_time("statistiques", time.perf_counter() - started)
+            if details:
+                self.last_stats += "\n" + details
+            if search.heatmap is not None and m <= 12:
+                self.last_stats += "\n" + describe_heatmap(search.heatmap, len(result))
+        self.result_cache.put("grid", m, n, result, self.last_stats, search.total)
+        if result is not self.paths:
+            # même ordre que les chemins partiels : on reste sur la page courante
+            self.paths = result
+            self.paths_version += 1
+            self.draw_current_page()
+            self.shown_path_count = self.path_total()
+            self.update_page_label()
+        else:
+            # chemins arrivés depuis la dernière lecture (calcul court : tous)
+            self.refresh_partial_results()
+        self.schedule_prerender()   # pas de pré-rendu pendant le calcul : les pages voisines maintenant
+        if self.selected_path_index is None and self.path_total():
+            self.selected_path_index = 0
+        self.update_current_path_details()
 
-        visited_set: set[Point] = {start}
-        path_list: Chemin = [start]
-        dfs(start, visited_set, path_list)
+    def end_search(self) -> None:
+        self.search = None
+        self.cancel_button.config(state="disabled")
+
+    def cancel_search(self) -> None:
+        """Bouton « Annuler » : arrête le calcul en gardant les chemins déjà trouvés."""
+        if self.search is not None:
+            self.search.cancel()
+            self.progress_label.config(text="Arrêt du calcul…")
+
+    def stop_search(self) -> None:
+        """Arrête le calcul en cours avant d'en lancer un autre (sans attendre
+        le thread, sauf s'il écrit un fichier de chemins)."""
+        search = self.search
+        if search is None:
+            return
+        search.cancel()
+        self.end_search()
+        if search.to_disk:
+            search.wait_file()
 
-        return all_paths
+    def find_all_paths(self, m: int, n: int) -> List[Chemin]:
+        return list(find_all_paths_symmetric(m, n, workers=1))
+
+    def path_total(self) -> int:
+        """Nombre de chemins courants ; pas len(self.paths), qui échoue au-delà
+        de sys.maxsize (grandes grilles énumérées page par page)."""
+        return path_count(self.paths)
+
+    def release_paths(self) -> None:
+        """Libère les chemins courants (ferme la projection mmap s'il y en a une),
+        sauf s'ils sont gardés par le cache des résultats."""
+        if isinstance(self.paths, FilteredPaths):
+            self.paths = self.paths.source
+        self.query_index = None
+        close = getattr(self.paths, "close", None)
+        if close is not None and not self.result_cache.holds(self.paths):
+            close()
+        self.paths = []
+        self.paths_version += 1
+        self.fetched_page = None
+        self.page_renders.clear()
+
+    # --- Filtre sur les chemins calculés ---
+    def apply_filter(self):
+        """Bouton « Filtrer » : n'affiche que les chemins qui vérifient le filtre
+        (pages, numéros et « aller à » portent alors sur ces chemins)."""
+        text = self.filter_value.get().strip()
+        if not text:
+            self.clear_filter()
+            return
+        source = self.paths.source if isinstance(self.paths, FilteredPaths) else self.paths
+        if self.current_mode != "grid" or not path_count(source):
+            self.progress_label.config(text="Filtre : seulement sur les chemins d'une grille")
+            return
+        if self.search is not None:
+            self.progress_label.config(text="Filtre : attendre la fin du calcul")
+            return
+        if isinstance(getattr(source, "base", source), LazyPathSequence):
+            self.progress_label.config(text="Filtre impossible : chemins énumérés page par page "
+                                            "(cocher « Sur disque » et recalculer)")
+            return
+        try:
+            conditions = parse_path_query(text)
+        except ValueError as exc:
+            self.progress_label.config(text=f"Filtre : {exc}")
+            return
+        started = time.perf_counter()
+        if self.query_index is None or self.query_index.paths is not source:
+            self.query_index = PathQueryIndex(source)
+        view = FilteredPaths(source, self.query_index.query(conditions), text)
+        self.show_paths(view)
+        self.progress_label.config(
+            text=f"{len(view)} chemins sur {len(source)} ({time.perf_counter() - started:.2f} s)"
+        )
 
-    # --- Chemins sur un cube (8 sommets) ---
-    def find_all_cube_paths(self) -> list[list[tuple[int, int, int]]]:
-        """Calcule tous les chemins simples entre (0,0,0) et (1,1,1) sur le cube 0/1.
+    def clear_filter(self):
+        """Bouton « Tout afficher » : revient à tous les chemins."""
+        if isinstance(self.paths, FilteredPaths):
+            self.show_paths(self.paths.source)
+            self.progress_label.config(text="")
 
-        On travaille uniquement sur les 8 sommets (0 ou 1 pour chaque coordonnée)
-        et on n'autorise pas de revisiter un sommet.
-        """
-        def neighbors(v: tuple[int, int, int]) -> list[tuple[int, int, int]]:
-            x, y, z = v
-            res: list[tuple[int, int, int]] = []
-            for dx, dy, dz in ((1, 0, 0), (-1, 0, 0), (0, 1, 0), (0, -1, 0), (0, 0, 1), (0, 0, -1)):
-                nx, ny, nz = x + dx, y + dy, z + dz
-                if nx in (0, 1) and ny in (0, 1) and nz in (0, 1):
-                    res.append((nx, ny, nz))
-            return res
-
-        start = (0, 0, 0)
-        end = (1, 1, 1)
-        all_paths: list[list[tuple[int, int, int]]] = []
-
-        def dfs(current: tuple[int, int, int], visited: set[tuple[int, int, int]], path: list[tuple[int, int, int]]) -> None:
-            if current == end:
-                all_paths.append(list(path))
-                return
-            for nxt in neighbors(current):
-                if nxt in visited:
-                    continue
-                visited.add(nxt)
-                path.append(nxt)
-                dfs(nxt, visited, path)
-                path.pop()
-                visited.remove(nxt)
+    # --- Échantillon aléatoire (grandes grilles) ---
+    def calculate_sample_paths(self):
+        """Remplit les pages avec des chemins de la grille tirés au hasard, et
+        affiche les nombres estimés (avec intervalles de confiance)."""
+        m = self.m.get()
+        n = self.n.get()
+        self.stop_search()
+        self.release_paths()
+        self.current_mode = "grid"
+        self.progress_label.config(text="")
+        if m < 0 or n < 0:
+            self.last_stats = ""
+            self.show_paths([])
+            return
 
-        dfs(start, {start}, [start])
-        return all_paths
+        sampler = GridPathSampler(m, n)
+        if sampler.exact_possible():
+            paths, _numbers = sampler.exact_sample()
+            total, with_up, with_left = grid_path_stats(m, n)
+            shares = direction_shares([path_to_codes(path) for path in paths])
+            self.last_stats = (
+                f"Échantillon de {len(paths)} chemins tirés uniformément (tirage exact par numéro)\n"
+                f"Total chemins : {total}\n"
+                f"Chemins avec direction haut (vert) : {with_up}\n"
+                f"Chemins avec direction gauche (bleu) : {with_left}\n"
+                f"Dans l'échantillon : haut {self.format_share(shares['with_up'])}, "
+                f"gauche {self.format_share(shares['with_left'])}"
+            )
+        else:
+            paths, estimates = sampler.importance_sample()
+            total, low, high = estimates["total"]
+            self.last_stats = (
+                f"Échantillon de {len(paths)} chemins retirés parmi {estimates['walks']} marches "
+                f"aléatoires (échantillonnage préférentiel)\n"
+                f"Total chemins estimé : ≈ {format_big(total)} (IC 95 % : {format_big(low)} – {format_big(high)})\n"
+                f"Chemins avec direction haut (vert) : {self.format_share(estimates['with_up'])}\n"
+                f"Chemins avec direction gauche (bleu) : {self.format_share(estimates['with_left'])}"
+            )
+        self.show_paths(paths)
+
+    @staticmethod
+    def format_share(share: Tuple[float, float, float]) -> str:
+        value, low, high = share
+        return f"{value:.1%} (IC 95 % : {low:.1%} – {high:.1%})"
+
+    # --- Chemins sur un cube (8 sommets) ---
+    def find_all_cube_paths(self) -> list[list[tuple[int, int, int]]]:
+        """Calcule tous les chemins simples entre (0,0,0) et (1,1,1) sur le cube 0/1
+        (voir moteur_chemins.find_all_cube_paths)."""
+        return find_all_cube_paths()
 
     def calculate_cube_paths(self):
         """Calcule tous les chemins sur le cube (8 sommets) et les affiche dans les vignettes."""
-        self.paths = self.find_all_cube_paths()
+        self.stop_search()
+        self.release_paths()
+        # (m, n) ne servent pas pour le cube : clé (0, 0) dans le cache
+        cached = self.result_cache.get("cube", 0, 0)
+        if cached is not None:
+            self.paths = cached["paths"]
+            self.last_stats = cached["stats"]
+        else:
+            self.paths = self.find_all_cube_paths()
+            total = self.path_total()
+            self.last_stats = f"Mode cube 8 sommets : {total} chemins simples entre a000 et a111"
+            self.result_cache.put("cube", 0, 0, self.paths, self.last_stats, total)
         self.current_page = 0
-        self.selected_path_index = 0 if self.paths else None
+        self.selected_path_index = 0 if self.path_total() else None
         self.current_mode = "cube"
 
-        total = len(self.paths)
-        self.last_stats = f"Mode cube 8 sommets : {total} chemins simples entre a000 et a111"
-
         self.update_canvas_layout()
         self.update_page_label()
         self.draw_current_page()
@@ -215,82 +769,50 @@ class GridPathsViewer:
 
     # --- Chemins sur un hypercube 4D (16 sommets) ---
     def find_all_hypercube_paths_4d(self) -> list[list[tuple[int, int, int, int]]]:
-        """Calcule tous les chemins monotones entre (0,0,0,0) et (1,1,1,1) dans le cube 4D.
-
-        On autorise uniquement les mouvements qui changent un 0 en 1 (jamais 1 -> 0),
-        donc il y a 4! = 24 chemins au total, chacun de longueur 4.
-        """
-        start = (0, 0, 0, 0)
-        end = (1, 1, 1, 1)
-        all_paths: list[list[tuple[int, int, int, int]]] = []
-
-        def dfs(current: tuple[int, int, int, int], path: list[tuple[int, int, int, int]]) -> None:
-            if current == end:
-                all_paths.append(list(path))
-                return
-
-            x, y, z, t = current
-            coords = [x, y, z, t]
-            for i in range(4):
-                if coords[i] == 0:
-                    new_coords = coords.copy()
-                    new_coords[i] = 1
-                    nxt = tuple(new_coords)  # type: ignore[arg-type]
-                    path.append(nxt)
-                    dfs(nxt, path)
-                    path.pop()
-
-        dfs(start, [start])
-        return all_paths
+        """Calcule tous les chemins monotones entre (0,0,0,0) et (1,1,1,1) dans le cube 4D
+        (voir moteur_chemins.find_all_hypercube_paths_4d)."""
+        return find_all_hypercube_paths_4d()
 
     def calculate_hypercube_paths(self):
         """Calcule tous les chemins sur le cube 4D (16 sommets) et les affiche dans les vignettes."""
-        self.paths = self.find_all_hypercube_paths_4d()
+        self.stop_search()
+        self.release_paths()
+        cached = self.result_cache.get("cube4", 0, 0)
+        if cached is not None:
+            self.paths = cached["paths"]
+            self.last_stats = cached["stats"]
+        else:
+            self.paths = self.find_all_hypercube_paths_4d()
+            total = self.path_total()
+            self.last_stats = f"Mode cube 4D 16 sommets : {total} chemins monotones entre a0000 et a1111"
+            self.result_cache.put("cube4", 0, 0, self.paths, self.last_stats, total)
         self.current_page = 0
-        self.selected_path_index = 0 if self.paths else None
+        self.selected_path_index = 0 if self.path_total() else None
         self.current_mode = "cube4"
 
-        total = len(self.paths)
-        self.last_stats = f"Mode cube 4D 16 sommets : {total} chemins monotones entre a0000 et a1111"
-
         self.update_canvas_layout()
         self.update_page_label()
         self.draw_current_page()
         self.update_current_path_details()
 
-    def update_global_direction_stats(self):
-        """Calcule des statistiques globales sur tous les chemins :
+    def set_direction_stats(self, total: int, count_with_up: int, count_with_left: int) -> None:
+        """Texte des statistiques globales sur tous les chemins :
+        - nb total de chemins
         - nb de chemins qui ont AU MOINS un mouvement vers le haut (vert)
         - nb de chemins qui ont AU MOINS un mouvement vers la gauche (bleu)
-        - nb de chemins qui ont AU MOINS un haut ET AU MOINS une gauche
+
+        Les nombres viennent de grid_path_stats (message « stats » de
+        GridSearch) : aucun chemin n'est parcouru. Les autres statistiques
+        (longueurs, virages...) sont ajoutées à la fin de l'énumération, à
+        partir du PathStats rempli au fil du calcul.
         """
-        if not self.paths:
+        if total == 0:
             self.last_stats = "Aucun chemin trouvé."
             if hasattr(self, "user_text"):
                 self.user_text.delete("1.0", "end")
                 self.user_text.insert("end", self.last_stats)
             return
 
-        count_with_up = 0      # chemins contenant au moins un segment vers le haut
-        count_with_left = 0    # chemins contenant au moins un segment vers la gauche
-
-        for path in self.paths:
-            has_up = False
-            has_left = False
-            for (x1, y1), (x2, y2) in zip(path, path[1:]):
-                dx = x2 - x1
-                dy = y2 - y1
-                if dx == 0 and dy == 1:        # haut
-                    has_up = True
-                elif dx == -1 and dy == 0:     # gauche
-                    has_left = True
-
-            if has_up:
-                count_with_up += 1
-            if has_left:
-                count_with_left += 1
-
-        total = len(self.paths)
         self.last_stats = (
             f"Total chemins : {total}\n"\
             f"Chemins avec direction haut (vert) : {count_with_up}\n"\
@@ -302,96 +824,19 @@ class GridPathsViewer:
         """Dessine un cube projeté en 2D et surligne un chemin sur ce cube.
 
         Les sommets sont (0,0,0) à (1,1,1) et sont annotés a000, a001, ... a111.
+        Le cube lui-même est le fond fixe de la vignette (voir prepare_canvas).
         """
-        canvas.delete("all")
         if not path_3d:
+            self.clear_canvas(canvas)
             return
-
-        # Projection simple : on décale légèrement selon z pour donner un effet de profondeur
-        def project(v: tuple[int, int, int]) -> tuple[float, float]:
-            x, y, z = v
-            return x + 0.5 * z, y + 0.5 * z
-
-        vertices = [(x, y, z) for x in (0, 1) for y in (0, 1) for z in (0, 1)]
-        proj_coords = {v: project(v) for v in vertices}
-
-        xs = [p[0] for p in proj_coords.values()]
-        ys = [p[1] for p in proj_coords.values()]
-        min_x, max_x = min(xs), max(xs)
-        min_y, max_y = min(ys), max(ys)
-
-        canvas_width = max(canvas.winfo_width(), 100)
-        canvas_height = max(canvas.winfo_height(), 100)
-        margin = 10
-        usable_width = max(canvas_width - 2 * margin, 1)
-        usable_height = max(canvas_height - 2 * margin, 1)
-
-        # Échelle uniforme pour garder les proportions du cube
-        scale = min(
-            usable_width / max(max_x - min_x, 1e-3),
-            usable_height / max(max_y - min_y, 1e-3),
-        )
-
-        # Centrer le dessin dans le canevas
-        shape_width = (max_x - min_x) * scale
-        shape_height = (max_y - min_y) * scale
-        offset_x = margin + (usable_width - shape_width) / 2
-        offset_y = margin + (usable_height - shape_height) / 2
-
-        height_logique = max_y - min_y
-
-        def to_pixels(v: tuple[int, int, int]) -> tuple[float, float]:
-            ux, uy = proj_coords[v]
-            # Inverser verticalement pour que a000 soit en bas comme sur la grille
-            rel_x = ux - min_x
-            rel_y = uy - min_y
-            x_pix = offset_x + rel_x * scale
-            y_pix = offset_y + (height_logique - rel_y) * scale
-            return x_pix, y_pix
-
-        # Dessiner l'ossature du cube en noir fin
-        cube_edges = [
-            ((0, 0, 0), (1, 0, 0)),
-            ((0, 1, 0), (1, 1, 0)),
-            ((0, 0, 1), (1, 0, 1)),
-            ((0, 1, 1), (1, 1, 1)),
-            ((0, 0, 0), (0, 1, 0)),
-            ((1, 0, 0), (1, 1, 0)),
-            ((0, 0, 1), (0, 1, 1)),
-            ((1, 0, 1), (1, 1, 1)),
-            ((0, 0, 0), (0, 0, 1)),
-            ((1, 0, 0), (1, 0, 1)),
-            ((0, 1, 0), (0, 1, 1)),
-            ((1, 1, 0), (1, 1, 1)),
-        ]
-
-        for v1, v2 in cube_edges:
-            x1, y1 = to_pixels(v1)
-            x2, y2 = to_pixels(v2)
-            canvas.create_line(x1, y1, x2, y2, fill="black", width=1)
-
-        # Dessiner les sommets avec les étiquettes a000, a001, ...
-        for v in vertices:
-            x_pix, y_pix = to_pixels(v)
-            canvas.create_oval(
-                x_pix - 3,
-                y_pix - 3,
-                x_pix + 3,
-                y_pix + 3,
-                fill="black",
-                outline="black",
-            )
-            x, y, z = v
-            label = f"a{x}{y}{z}"
-            canvas.create_text(
-                x_pix + 4,
-                y_pix - 4,
-                text=label,
-                font=("Arial", 7),
-                fill="black",
-                anchor="nw",
-            )
-
+        pixels, _scale = self.prepare_canvas(canvas, "cube")
+        self.draw_overlay(canvas, self.cube_path_overlay(path_3d, pixels))
+
+    @staticmethod
+    def cube_path_overlay(path_3d: list[tuple[int, int, int]],
+                          pixels: Dict[tuple, Tuple[float, float]]) -> List[tuple]:
+        """Éléments à dessiner pour un chemin sur le cube (voir draw_overlay)."""
+        items = []
         # Dessiner le chemin sur le cube avec couleurs par direction et flèches
         for i in range(len(path_3d) - 1):
             x1, y1, z1 = path_3d[i]
@@ -416,8 +861,8 @@ class GridPathsViewer:
             else:
                 color = "black"
 
-            px1, py1 = to_pixels((x1, y1, z1))
-            px2, py2 = to_pixels((x2, y2, z2))
+            px1, py1 = pixels[(x1, y1, z1)]
+            px2, py2 = pixels[(x2, y2, z2)]
 
             # Dernier segment d'une suite même direction ?
             if i == len(path_3d) - 2:
@@ -430,16 +875,195 @@ class GridPathsViewer:
                 next_dz = nz2 - nz1
                 last_in_run = (next_dx != dx) or (next_dy != dy) or (next_dz != dz)
 
-            arrow_kwargs = {
-                "arrow": tk.LAST,
+            items.append(("line", (px1, py1, px2, py2), {
+                "fill": color,
+                "width": 5,
+                "arrow": tk.LAST if last_in_run else tk.NONE,
                 "arrowshape": (10, 12, 6),
-            } if last_in_run else {}
+            }))
+        return items
+
+    # --- Fond fixe des vignettes (dessiné une fois par mode et par taille) ---
+    BACKGROUND_TAG = "fond"   # points de la grille, ou ossature du cube / de l'hypercube
+    PATH_TAG = "chemin"       # chemin tracé par-dessus : seuls ces éléments changent de page en page
+
+    def prepare_canvas(self, canvas, mode: str) -> Tuple[Dict[tuple, Tuple[float, float]], float]:
+        """Met en place le fond d'une vignette et renvoie la position en pixels
+        de chaque point (grille) ou sommet (cube, hypercube), avec l'échelle
+        (taille d'une case ou d'une arête, en pixels).
+
+        Le fond reste sur le canevas (tag BACKGROUND_TAG) tant que le mode, la
+        grille et la taille du canevas ne changent pas ; les éléments du chemin
+        précédent (tag PATH_TAG) sont réutilisés par le chemin suivant (voir
+        CanvasItemPool). Les positions sont calculées une seule fois par
+        (mode, grille, taille).
+        """
+        key, layout = self.canvas_layout(canvas, mode)
+        self.canvas_pools[canvas].begin()
+        if self.canvas_backgrounds.get(canvas) == key:
+            return layout
+        canvas.delete("all")
+        self.canvas_pools[canvas].clear()
+        self.canvas_images.pop(canvas, None)
+        if mode == "grid":
+            self.draw_grid_background(canvas, *layout)
+        else:
+            self.draw_wireframe_background(canvas, layout[0])
+        self.canvas_backgrounds[canvas] = key
+        return layout
+
+    def canvas_layout(self, canvas, mode: str) -> Tuple[tuple, Tuple[Dict[tuple, Tuple[float, float]], float]]:
+        """Clé (mode, grille, largeur, hauteur) d'une vignette et positions
+        correspondantes (calculées une fois par clé)."""
+        if mode == "grid":
+            grid_size = (self.m.get(), self.n.get())
+            minimum = 100
+        else:
+            grid_size = None
+            minimum = 120 if mode == "cube4" else 100
+        canvas_width = max(canvas.winfo_width(), minimum)
+        canvas_height = max(canvas.winfo_height(), minimum)
+        key = (mode, grid_size, canvas_width, canvas_height)
+
+        layout = self.canvas_layouts.get(key)
+        if layout is None:
+            if len(self.canvas_layouts) >= 64:   # tailles de fenêtre successives
+                self.canvas_layouts.clear()
+            if mode == "grid":
+                layout = self.grid_layout(*grid_size, canvas_width, canvas_height)
+            elif mode == "cube":
+                layout = self.projected_layout(self.cube_projection(), canvas_width, canvas_height)
+            else:
+                layout = self.projected_layout(self.hypercube_projection(), canvas_width, canvas_height)
+            self.canvas_layouts[key] = layout
+        return key, layout
 
-            canvas.create_line(
-                px1, py1, px2, py2,
-                fill=color,
-                width=5,
-                **arrow_kwargs,
+    def clear_canvas(self, canvas) -> None:
+        """Vide une vignette, fond compris (il sera redessiné au prochain chemin)."""
+        canvas.delete("all")
+        self.canvas_pools[canvas].clear()
+        self.canvas_backgrounds.pop(canvas, None)
+        self.canvas_images.pop(canvas, None)
+
+    @staticmethod
+    def grid_layout(m: int, n: int, canvas_width: int,
+                    canvas_height: int) -> Tuple[Dict[tuple, Tuple[float, float]], float]:
+        """Position en pixels de chaque point (x, y) de la grille, (0,0) en bas
+        à gauche, et taille d'une case."""
+        margin = 20
+        usable_width = max(canvas_width - 2 * margin, 1)
+        usable_height = max(canvas_height - 2 * margin, 1)
+        cell_size = min(usable_width / max(m, 1), usable_height / max(n, 1))
+        pixels = {
+            (x, y): (margin + x * cell_size, canvas_height - margin - y * cell_size)
+            for x in range(m + 1)
+            for y in range(n + 1)
+        }
+        return pixels, cell_size
+
+    @staticmethod
+    def cube_projection() -> Dict[tuple, Tuple[float, float]]:
+        # Projection simple : on décale légèrement selon z pour donner un effet de profondeur
+        return {(x, y, z): (x + 0.5 * z, y + 0.5 * z) for x in (0, 1) for y in (0, 1) for z in (0, 1)}
+
+    @staticmethod
+    def hypercube_projection() -> Dict[tuple, Tuple[float, float]]:
+        # même projection que pour le cube 3D, le cube t=1 décalé davantage
+        # pour bien séparer les sommets
+        return {
+            (x, y, z, t): (x + 0.5 * z + 2.5 * t, y + 0.5 * z + 0.8 * t)
+            for x in (0, 1) for y in (0, 1) for z in (0, 1) for t in (0, 1)
+        }
+
+    @staticmethod
+    def projected_layout(proj_coords: Dict[tuple, Tuple[float, float]], canvas_width: int,
+                         canvas_height: int) -> Tuple[Dict[tuple, Tuple[float, float]], float]:
+        """Position en pixels de sommets projetés en 2D : échelle uniforme (pour
+        garder les proportions), dessin centré et axe vertical inversé pour que
+        a000 / a0000 soit en bas, comme sur la grille."""
+        xs = [p[0] for p in proj_coords.values()]
+        ys = [p[1] for p in proj_coords.values()]
+        min_x, max_x = min(xs), max(xs)
+        min_y, max_y = min(ys), max(ys)
+
+        margin = 10
+        usable_width = max(canvas_width - 2 * margin, 1)
+        usable_height = max(canvas_height - 2 * margin, 1)
+        scale = min(
+            usable_width / max(max_x - min_x, 1e-3),
+            usable_height / max(max_y - min_y, 1e-3),
+        )
+
+        # Centrer le dessin dans le canevas
+        shape_width = (max_x - min_x) * scale
+        shape_height = (max_y - min_y) * scale
+        offset_x = margin + (usable_width - shape_width) / 2
+        offset_y = margin + (usable_height - shape_height) / 2
+
+        height_logique = max_y - min_y
+        pixels = {
+            v: (offset_x + (ux - min_x) * scale, offset_y + (height_logique - (uy - min_y)) * scale)
+            for v, (ux, uy) in proj_coords.items()
+        }
+        return pixels, scale
+
+    def draw_grid_background(self, canvas, pixels: Dict[tuple, Tuple[float, float]],
+                             cell_size: float) -> None:
+        """Fond d'une vignette de grille : les points avec leurs coordonnées (x,y),
+        selon la place (voir LABEL_MIN_CELL, DOT_MIN_CELL) ; quand les points
+        sont trop serrés, seulement le contour de la grille."""
+        if cell_size < self.DOT_MIN_CELL:
+            (x0, y0), (x1, y1) = pixels[(0, 0)], pixels[max(pixels)]
+            canvas.create_rectangle(x0, y0, x1, y1, outline="#a0a0a0", tags=self.BACKGROUND_TAG)
+            return
+        for (x, y), (x_pixel, y_pixel) in pixels.items():
+            canvas.create_oval(
+                x_pixel - 2, y_pixel - 2, x_pixel + 2, y_pixel + 2,
+                fill="black", outline="black", tags=self.BACKGROUND_TAG
+            )
+            if cell_size < self.LABEL_MIN_CELL:
+                continue
+
+            # Étiquette de point (x,y)
+            canvas.create_text(
+                x_pixel + 4, y_pixel - 4,
+                text=f"({x},{y})",
+                font=("Arial", 6),
+                fill="black",
+                anchor="nw",
+                tags=self.BACKGROUND_TAG,
+            )
+
+    def draw_wireframe_background(self, canvas, pixels: Dict[tuple, Tuple[float, float]]) -> None:
+        """Fond d'une vignette de cube ou d'hypercube : les arêtes (sommets qui ne
+        diffèrent que sur une coordonnée) en noir fin, puis les sommets étiquetés
+        a000, a001... ou a0000, a0001..."""
+        for v in pixels:
+            for i, coordinate in enumerate(v):
+                if coordinate == 0:   # chaque arête une seule fois, depuis son sommet « 0 »
+                    w = v[:i] + (1,) + v[i + 1:]
+                    x1, y1 = pixels[v]
+                    x2, y2 = pixels[w]
+                    canvas.create_line(x1, y1, x2, y2, fill="black", width=1, tags=self.BACKGROUND_TAG)
+
+        for v, (x_pix, y_pix) in pixels.items():
+            canvas.create_oval(
+                x_pix - 3,
+                y_pix - 3,
+                x_pix + 3,
+                y_pix + 3,
+                fill="black",
+                outline="black",
+                tags=self.BACKGROUND_TAG,
+            )
+            canvas.create_text(
+                x_pix + 4,
+                y_pix - 4,
+                text="a" + "".join(str(coordinate) for coordinate in v),
+                font=("Arial", 7),
+                fill="black",
+                anchor="nw",
+                tags=self.BACKGROUND_TAG,
             )
 
     def get_paths_per_page(self) -> int:
@@ -475,8 +1099,8 @@ class GridPathsViewer:
         for c in range(4):
             self.canvas_frame.columnconfigure(c, weight=1 if c < cols else 0)
 
-        # Réinsérer seulement les canevas nécessaires
-        for i in range(active):
+        # Réinsérer seulement les canevas nécessaires (s'ils sont déjà créés)
+        for i in range(min(active, len(self.thumbnail_canvases))):
             r = i // cols
             c = i % cols
             canvas = self.thumbnail_canvases[i]
@@ -487,96 +1111,19 @@ class GridPathsViewer:
         """Dessine un cube 4D projeté en 2D (deux cubes reliés) et surligne un chemin.
 
         Les sommets sont (0,0,0,0) à (1,1,1,1) et sont annotés a0000, ..., a1111.
+        L'hypercube lui-même est le fond fixe de la vignette (voir prepare_canvas).
         """
-        canvas.delete("all")
         if not path_4d:
+            self.clear_canvas(canvas)
             return
-
-        def project3(x: int, y: int, z: int) -> tuple[float, float]:
-            # même projection que pour le cube 3D
-            return x + 0.5 * z, y + 0.5 * z
-
-        def project4(v: tuple[int, int, int, int]) -> tuple[float, float]:
-            x, y, z, t = v
-            ux, uy = project3(x, y, z)
-            # décaler le cube t=1 davantage pour bien séparer les sommets
-            return ux + 2.5 * t, uy + 0.8 * t
-
-        vertices = [(x, y, z, t) for x in (0, 1) for y in (0, 1) for z in (0, 1) for t in (0, 1)]
-        proj_coords = {v: project4(v) for v in vertices}
-
-        xs = [p[0] for p in proj_coords.values()]
-        ys = [p[1] for p in proj_coords.values()]
-        min_x, max_x = min(xs), max(xs)
-        min_y, max_y = min(ys), max(ys)
-
-        canvas_width = max(canvas.winfo_width(), 120)
-        canvas_height = max(canvas.winfo_height(), 120)
-        margin = 10
-        usable_width = max(canvas_width - 2 * margin, 1)
-        usable_height = max(canvas_height - 2 * margin, 1)
-
-        # Échelle uniforme pour garder les proportions de l'hypercube
-        scale = min(
-            usable_width / max(max_x - min_x, 1e-3),
-            usable_height / max(max_y - min_y, 1e-3),
-        )
-
-        # Centrer le dessin dans le canevas
-        shape_width = (max_x - min_x) * scale
-        shape_height = (max_y - min_y) * scale
-        offset_x = margin + (usable_width - shape_width) / 2
-        offset_y = margin + (usable_height - shape_height) / 2
-
-        height_logique = max_y - min_y
-
-        def to_pixels(v: tuple[int, int, int, int]) -> tuple[float, float]:
-            ux, uy = proj_coords[v]
-            rel_x = ux - min_x
-            rel_y = uy - min_y
-            x_pix = offset_x + rel_x * scale
-            # Inversion verticale pour cohérence avec la grille (a0000 en bas)
-            y_pix = offset_y + (height_logique - rel_y) * scale
-            return x_pix, y_pix
-
-        # Arêtes du cube 4D : paires de sommets qui ne diffèrent que sur une coordonnée
-        edges: list[tuple[tuple[int, int, int, int], tuple[int, int, int, int]]] = []
-        for v in vertices:
-            for i in range(4):
-                w = list(v)
-                w[i] = 1 - w[i]
-                w_t = tuple(w)  # type: ignore[list-item]
-                if v < w_t:  # éviter les doublons
-                    edges.append((v, w_t))
-
-        # Dessiner la structure du hypercube en gris
-        for v1, v2 in edges:
-            x1, y1 = to_pixels(v1)
-            x2, y2 = to_pixels(v2)
-            canvas.create_line(x1, y1, x2, y2, fill="black", width=1)
-
-        # Dessiner les sommets avec les étiquettes a0000, ...
-        for v in vertices:
-            x_pix, y_pix = to_pixels(v)
-            canvas.create_oval(
-                x_pix - 3,
-                y_pix - 3,
-                x_pix + 3,
-                y_pix + 3,
-                fill="black",
-                outline="black",
-            )
-            x, y, z, t = v
-            label = f"a{x}{y}{z}{t}"
-            canvas.create_text(
-                x_pix + 4,
-                y_pix - 4,
-                text=label,
-                font=("Arial", 7),
-                fill="black",
-                anchor="nw",
-            )
-
+        pixels, _scale = self.prepare_canvas(canvas, "cube4")
+        self.draw_overlay(canvas, self.hypercube_path_overlay(path_4d, pixels))
+
+    @staticmethod
+    def hypercube_path_overlay(path_4d: list[tuple[int, int, int, int]],
+                               pixels: Dict[tuple, Tuple[float, float]]) -> List[tuple]:
+        """Éléments à dessiner pour un chemin sur l'hypercube (voir draw_overlay)."""
+        items = []
         # Dessiner le chemin en couleurs selon la coordonnée qui change
         for i in range(len(path_4d) - 1):
             x1, y1, z1, t1 = path_4d[i]
@@ -596,8 +1143,8 @@ class GridPathsViewer:
             else:
                 color = "red"
 
-            px1, py1 = to_pixels((x1, y1, z1, t1))
-            px2, py2 = to_pixels((x2, y2, z2, t2))
+            px1, py1 = pixels[(x1, y1, z1, t1)]
+            px2, py2 = pixels[(x2, y2, z2, t2)]
 
             # Dernier segment d'une suite dans la même direction 4D ?
             if i == len(path_4d) - 2:
@@ -616,170 +1163,328 @@ class GridPathsViewer:
                     or next_dt != dt
                 )
 
-            arrow_kwargs = {
-                "arrow": tk.LAST,
+            items.append(("line", (px1, py1, px2, py2), {
+                "fill": color,
+                "width": 5,
+                "arrow": tk.LAST if last_in_run else tk.NONE,
                 "arrowshape": (10, 12, 6),
-            } if last_in_run else {}
-
-            canvas.create_line(
-                px1, py1, px2, py2,
-                fill=color,
-                width=5,
-                **arrow_kwargs,
-            )
+            }))
+        return items
 
     # --- Dessin des grilles et des chemins (16 par page) ---
-    def draw_single_path_on_canvas(self, canvas, path):
-        canvas.delete("all")
-
-        if not path:
-            return
-
+    # Niveau de détail selon la taille d'une case en pixels : on retire d'abord
+    # les étiquettes (x,y), puis les points ; en dessous de RUN_MIN_CELL, le
+    # chemin n'est plus qu'une ligne brisée, sans couleurs ni flèches.
+    LABEL_MIN_CELL = 30
+    DOT_MIN_CELL = 6
+    RUN_MIN_CELL = 12
+    GRID_STEP_COLORS = {
+        (1, 0): "#303030",   # droite : gris plus foncé
+        (-1, 0): "blue",     # gauche
+        (0, 1): "green",     # haut
+        (0, -1): "red",      # bas
+    }
+
+    def draw_single_path_on_canvas(self, canvas, path, run_ends: Optional[List[bool]] = None):
+        """Dessine un chemin de la grille ; run_ends (voir run_end_flags) dit
+        où finit chaque suite de pas dans la même direction, calculé ici s'il
+        n'est pas fourni. Les points de la grille sont le fond fixe de la
+        vignette (voir prepare_canvas)."""
         m = self.m.get()
         n = self.n.get()
-        if m < 0 or n < 0:
+        if not path or m < 0 or n < 0:
+            self.clear_canvas(canvas)
             return
-
-        canvas_width = max(canvas.winfo_width(), 100)
-        canvas_height = max(canvas.winfo_height(), 100)
-        margin = 20
-
-        usable_width = max(canvas_width - 2 * margin, 1)
-        usable_height = max(canvas_height - 2 * margin, 1)
-        cell_size = min(usable_width / max(m, 1), usable_height / max(n, 1))
-
-        # Dessiner la grille avec les coordonnées (x,y) pour chaque point
-        for x in range(m + 1):
-            for y in range(n + 1):
-                x_pixel = margin + x * cell_size
-                y_pixel = canvas_height - margin - y * cell_size
-
-                canvas.create_oval(
-                    x_pixel - 2, y_pixel - 2, x_pixel + 2, y_pixel + 2,
-                    fill="black", outline="black"
-                )
-
-                # Étiquette de point (x,y)
-                canvas.create_text(
-                    x_pixel + 4, y_pixel - 4,
-                    text=f"({x},{y})",
-                    font=("Arial", 6),
-                    fill="black",
-                    anchor="nw"
-                )
-
-        # Dessiner le chemin
-        for i in range(len(path) - 1):
-            x1, y1 = path[i]
-            x2, y2 = path[i + 1]
-
-            dx = x2 - x1
-            dy = y2 - y1
-
-            if dx == 1 and dy == 0:          # droite
-                color = "#303030"  # gris plus foncé
-            elif dx == -1 and dy == 0:       # gauche
-                color = "blue"
-            elif dx == 0 and dy == 1:        # haut
-                color = "green"
-            elif dx == 0 and dy == -1:       # bas
-                color = "red"
-            else:
-                color = "red"
-
-            x1_pixel = margin + x1 * cell_size
-            y1_pixel = canvas_height - margin - y1 * cell_size
-            x2_pixel = margin + x2 * cell_size
-            y2_pixel = canvas_height - margin - y2 * cell_size
-
-            # Déterminer si ce segment est le dernier d'une suite dans la même direction
-            if i == len(path) - 2:
-                last_in_run = True
-            else:
-                nx1, ny1 = path[i + 1]
-                nx2, ny2 = path[i + 2]
-                next_dx = nx2 - nx1
-                next_dy = ny2 - ny1
-                last_in_run = (next_dx != dx) or (next_dy != dy)
-
-            arrow_kwargs = {
-                "arrow": tk.LAST,
-                "arrowshape": (10, 12, 6),
-            } if last_in_run else {}
-
-            canvas.create_line(
-                x1_pixel, y1_pixel, x2_pixel, y2_pixel,
-                fill=color,
-                width=5,
-                **arrow_kwargs,
-            )
+        if run_ends is None:
+            run_ends = run_end_flags(path_to_codes(path))
+        pixels, cell_size = self.prepare_canvas(canvas, "grid")
+        self.draw_overlay(canvas, self.grid_path_overlay(path, run_ends, pixels, cell_size))
+
+    @classmethod
+    def grid_path_overlay(cls, path: Chemin, run_ends: List[bool],
+                          pixels: Dict[tuple, Tuple[float, float]], cell_size: float) -> List[tuple]:
+        """Éléments à dessiner pour un chemin de la grille (voir draw_overlay).
+
+        Chaque suite de pas dans la même direction est une seule ligne, avec
+        une flèche au bout ; sur de très petites cases tout le chemin est une
+        seule ligne. Le nombre d'éléments par vignette reste donc borné par la
+        taille du canevas, quelle que soit la grille.
+        """
+        items = []
+        width = min(5, max(1, cell_size / 4))
+        arrowshape = (2 * width, 2.4 * width, 1.2 * width)   # (10, 12, 6) pour un trait de 5
+
+        if cell_size < cls.RUN_MIN_CELL:
+            points = [coordinate for point in path for coordinate in pixels[point]]
+            if len(points) == 2:
+                points *= 2   # chemin réduit à un point : une ligne doit avoir deux points
+            items.append(("line", tuple(points), {
+                "fill": "#303030", "width": width, "arrow": tk.NONE, "arrowshape": arrowshape,
+            }))
+        else:
+            run_start = 0
+            for i in range(len(path) - 1):
+                if not run_ends[i]:
+                    continue
+                (x1, y1), (x2, y2) = path[i], path[i + 1]
+                color = cls.GRID_STEP_COLORS.get((x2 - x1, y2 - y1), "red")
+                x1_pixel, y1_pixel = pixels[path[run_start]]
+                x2_pixel, y2_pixel = pixels[path[i + 1]]
+                items.append(("line", (x1_pixel, y1_pixel, x2_pixel, y2_pixel), {
+                    "fill": color, "width": width, "arrow": tk.LAST, "arrowshape": arrowshape,
+                }))
+                run_start = i + 1
 
         # A en vert, B en bleu
-        xA, yA = path[0]
-        xB, yB = path[-1]
-
-        xA_pixel = margin + xA * cell_size
-        yA_pixel = canvas_height - margin - yA * cell_size
-        xB_pixel = margin + xB * cell_size
-        yB_pixel = canvas_height - margin - yB * cell_size
-
-        canvas.create_oval(
-            xA_pixel - 4, yA_pixel - 4, xA_pixel + 4, yA_pixel + 4,
-            fill="green", outline="green"
-        )
-        canvas.create_oval(
-            xB_pixel - 4, yB_pixel - 4, xB_pixel + 4, yB_pixel + 4,
-            fill="blue", outline="blue"
-        )
+        xA_pixel, yA_pixel = pixels[path[0]]
+        xB_pixel, yB_pixel = pixels[path[-1]]
+        radius = 4 if cell_size >= cls.RUN_MIN_CELL else 2
+        items.append(("oval", (xA_pixel - radius, yA_pixel - radius, xA_pixel + radius, yA_pixel + radius),
+                      {"fill": "green", "outline": "green"}))
+        items.append(("oval", (xB_pixel - radius, yB_pixel - radius, xB_pixel + radius, yB_pixel + radius),
+                      {"fill": "blue", "outline": "blue"}))
+        return items
+
+    def draw_overlay(self, canvas, items: List[tuple]) -> None:
+        """Dessine le chemin d'une vignette à partir de ses éléments
+        (("line" | "oval", coordonnées, options)), en réutilisant ceux du
+        dessin précédent (CanvasItemPool) ; cache l'image pré-rendue s'il y en a une."""
+        pool = self.canvas_pools[canvas]
+        for kind, coords, options in items:
+            if kind == "line":
+                pool.line(coords, **options)
+            else:
+                pool.oval(coords, **options)
+        pool.finish()
+        shown = self.canvas_images.get(canvas)
+        if shown is not None and shown[1] is not None:
+            canvas.itemconfig(shown[0], state="hidden")
+            shown[1] = None
+
+    def schedule_draw(self, delay_ms: int = 0) -> None:
+        """Demande le dessin de la page courante dès que la fenêtre est libre
+        (ou après delay_ms). Les demandes rapprochées (clics répétés sur
+        Suivant, événements <Configure> d'un redimensionnement) remplacent la
+        précédente : seule la dernière page demandée est dessinée."""
+        if self._draw_job is not None:
+            self.root.after_cancel(self._draw_job)
+        if delay_ms:
+            self._draw_job = self.root.after(delay_ms, self.draw_current_page)
+        else:
+            self._draw_job = self.root.after_idle(self.draw_current_page)
 
     def draw_current_page(self):
         """Dessine jusqu'à N chemins de la page courante (N dépend du mode)."""
-        total_paths = len(self.paths)
+        if self._draw_job is not None:
+            self.root.after_cancel(self._draw_job)
+            self._draw_job = None
+        total_paths = self.path_total()
         per_page = self.get_paths_per_page()
         start_index = self.current_page * per_page
         end_index = min(start_index + per_page, total_paths)
 
+        # page déjà rendue en images par le thread (voir prerender_neighbour_pages) ?
+        key = self.page_render_key(self.current_page)
+        images = self.page_renders.get(key) if key is not None else None
+        if images is not None:
+            for local_idx, canvas in enumerate(self.thumbnail_canvases):
+                if local_idx < len(images):
+                    self.show_rendered_thumbnail(canvas, images[local_idx])
+                else:
+                    self.clear_canvas(canvas)
+            self.schedule_prerender()
+            return
+
+        page_paths = self.page_paths(start_index, end_index)
+        if page_paths is None:
+            # page à énumérer (grande grille) : lue dans un thread, dessinée à son arrivée
+            self.request_page(start_index, end_index)
+            for canvas in self.thumbnail_canvases:
+                self.clear_canvas(canvas)
+            return
+        if self.current_mode == "grid":
+            # flèches de toute la page en un seul calcul (vectorisé si NumPy est là)
+            run_ends = page_run_ends(page_paths)
+
         # Pour chaque canevas, dessiner le chemin correspondant ou le vider
+        timing = instrumentation.enabled
         for local_idx, canvas in enumerate(self.thumbnail_canvases):
-            global_idx = start_index + local_idx
-            if start_index <= global_idx < end_index:
-                path = self.paths[global_idx]
+            if timing:
+                started = time.perf_counter()
+            if local_idx < len(page_paths):
+                path = page_paths[local_idx]
                 if self.current_mode == "cube":
                     self.draw_single_cube_path_on_canvas(canvas, path)
                 elif self.current_mode == "cube4":
                     self.draw_single_hypercube_path_on_canvas(canvas, path)
                 else:
-                    self.draw_single_path_on_canvas(canvas, path)
+                    self.draw_single_path_on_canvas(canvas, path, run_ends[local_idx])
             else:
-                canvas.delete("all")
+                self.clear_canvas(canvas)
+            if timing:
+                instrumentation.add_time(f"dessin vignette {local_idx + 1}", time.perf_counter() - started)
+        self.schedule_prerender()
+
+    # --- Lecture des pages des grandes grilles (thread) ---
+    def page_paths(self, start: int, stop: int) -> Optional[list]:
+        """Chemins start .. stop - 1 s'ils sont disponibles sans attendre
+        (liste, fichier, page déjà énumérée ou lue par page_fetcher), sinon None."""
+        if self.fetched_page is not None:
+            (version, first, last), paths = self.fetched_page
+            if version == self.paths_version and first <= start and stop <= last:
+                return paths[start - first:stop - first]
+        return cached_paths(self.paths, start, stop)
+
+    def request_page(self, start: int, stop: int) -> None:
+        """Fait lire les chemins start .. stop - 1 par le thread de page_fetcher
+        (retrouver une page lointaine d'une grande grille prend des secondes)."""
+        key = (self.paths_version, start, stop)
+        if key == self._requested_page and self.page_fetcher.busy():
+            return   # déjà en cours de lecture
+        self._requested_page = key
+        self.page_fetcher.request(key, self.paths, start, stop)
+        if not self._fetch_polling:
+            self._label_before_fetch = self.progress_label.cget("text")
+        self.progress_label.config(text="Lecture de la page…")
+        if not self._fetch_polling:
+            self._fetch_polling = True
+            self.root.after(self.POLL_MS, self.poll_page_fetch)
+
+    def poll_page_fetch(self) -> None:
+        """Lit les pages arrivées du thread de lecture (appelé par root.after)."""
+        busy = self.page_fetcher.busy()   # avant de vider la file : pas de message oublié
+        while True:
+            try:
+                kind, key, value = self.page_fetcher.messages.get_nowait()
+            except queue.Empty:
+                break
+            if key[0] != self.paths_version:
+                continue   # chemins remplacés entre-temps
+            if kind == "error":
+                self.progress_label.config(text=f"Erreur pendant la lecture de la page : {value}")
+                continue
+            self.fetched_page = (key, value)
+            self.progress_label.config(text=self._label_before_fetch)
+            self.draw_current_page()
+            self.update_current_path_details()
+        if busy:
+            self.root.after(self.POLL_MS, self.poll_page_fetch)
+        else:
+            self._fetch_polling = False
+
+    # --- Pré-rendu des pages voisines (images hors écran) ---
+    def page_render_key(self, page: int) -> Optional[tuple]:
+        """Clé d'une page dans page_renders (mode, grille, page, taille des
+        vignettes), ou None si la page ne peut pas être pré-rendue (calcul
+        en cours, page vide)."""
+        per_page = self.get_paths_per_page()
+        count = min(per_page, self.path_total() - page * per_page)
+        if self.search is not None or page < 0 or count <= 0:
+            return None
+        if self.current_mode == "grid" and (self.m.get() < 0 or self.n.get() < 0):
+            return None
+        sizes = tuple(self.canvas_layout(canvas, self.current_mode)[0]
+                      for canvas in self.thumbnail_canvases[:count])
+        return (self.paths_version, self.current_mode, page, sizes)
+
+    def schedule_prerender(self) -> None:
+        """Demande (quand la fenêtre est libre) le rendu des pages voisines."""
+        if self._prerender_job is not None:
+            self.root.after_cancel(self._prerender_job)
+        self._prerender_job = self.root.after_idle(self.prerender_neighbour_pages)
+
+    def prerender_neighbour_pages(self) -> None:
+        """Envoie au thread de rendu la page suivante et la précédente : on
+        ne prépare ici que les chemins et les positions, le dessin des images
+        (render_page) se fait hors de l'interface."""
+        self._prerender_job = None
+        per_page = self.get_paths_per_page()
+        for page in (self.current_page + 1, self.current_page - 1):
+            key = self.page_render_key(page)
+            if key is None or self.page_renders.get(key) is not None:
+                continue
+            start = page * per_page
+            page_paths = self.page_paths(start, min(start + per_page, self.path_total()))
+            if page_paths is None:
+                continue   # page pas encore énumérée : pas de lecture ici, voir request_page
+            layouts = [self.canvas_layout(canvas, self.current_mode)
+                       for canvas in self.thumbnail_canvases[:len(page_paths)]]
+            self.page_renders.request(key, (self.current_mode, page_paths, layouts))
+
+    @classmethod
+    def render_page(cls, job: tuple) -> List[bytes]:
+        """Dessine hors écran (OverlayRaster) les chemins d'une page, une
+        image PNG transparente par vignette ; appelé dans le thread de rendu."""
+        mode, page_paths, layouts = job
+        run_ends = page_run_ends(page_paths) if mode == "grid" else None
+        images = []
+        for local_idx, path in enumerate(page_paths):
+            key, (pixels, scale) = layouts[local_idx]
+            if mode == "cube":
+                items = cls.cube_path_overlay(path, pixels)
+            elif mode == "cube4":
+                items = cls.hypercube_path_overlay(path, pixels)
+            else:
+                items = cls.grid_path_overlay(path, run_ends[local_idx], pixels, scale)
+            raster = OverlayRaster(key[2], key[3])
+            raster.draw(items)
+            images.append(raster.png())
+        return images
+
+    def show_rendered_thumbnail(self, canvas, image: bytes) -> None:
+        """Affiche une image pré-rendue sur le fond de la vignette, à la place
+        des éléments du chemin (cachés)."""
+        import base64
+        self.prepare_canvas(canvas, self.current_mode)
+        self.canvas_pools[canvas].finish()
+        photo = tk.PhotoImage(data=base64.b64encode(image).decode("ascii"))
+        shown = self.canvas_images.get(canvas)
+        if shown is None:
+            item = canvas.create_image(0, 0, anchor="nw", image=photo, tags=self.PATH_TAG)
+            self.canvas_images[canvas] = [item, photo]
+        else:
+            canvas.itemconfig(shown[0], image=photo, state="normal")
+            canvas.tag_raise(shown[0])
+            shown[1] = photo   # garder une référence, sinon Tk efface l'image
 
     def update_page_label(self):
-        total = len(self.paths)
-        if total == 0:
-            self.page_label.config(text="Page: 0/0")
-            return
+        total = self.path_total()
         per_page = self.get_paths_per_page()
-        nb_pages = (total - 1) // per_page + 1
-        self.page_label.config(text=f"Page: {self.current_page + 1}/{nb_pages}")
+        nb_pages = (total - 1) // per_page + 1 if total else 0
+        text = f"Page: {self.current_page + 1 if total else 0}/{nb_pages}"
+        if isinstance(self.paths, FilteredPaths):
+            text += f" (filtre : {total} chemins)"
+        self.page_label.config(text=text)
 
     def on_thumbnail_click(self, local_index):
         """Sélection d'un chemin en cliquant sur une des 16 grilles."""
         start_index = self.current_page * self.paths_per_page
         global_index = start_index + local_index
-        if 0 <= global_index < len(self.paths):
+        if 0 <= global_index < self.path_total():
             self.selected_path_index = global_index
             self.update_current_path_details()
 
     def update_current_path_details(self):
         """Met à jour les résultats (coordonnées + directions + stats) dans la zone de texte."""
-        if self.selected_path_index is None or not self.paths:
+        if self.selected_path_index is None or not self.path_total():
             if hasattr(self, "user_text"):
                 self.user_text.delete("1.0", "end")
                 if self.last_stats:
                     self.user_text.insert("end", self.last_stats)
             return
 
-        path = self.paths[self.selected_path_index]
+        found = self.page_paths(self.selected_path_index, self.selected_path_index + 1)
+        if found is None:
+            # chemin d'une page pas encore lue : détails affichés à son arrivée
+            if hasattr(self, "user_text"):
+                self.user_text.delete("1.0", "end")
+                self.user_text.insert(
+                    "end",
+                    f"Chemin sélectionné : {self.selected_path_index + 1}/{self.path_total()} "
+                    f"(lecture en cours…)\n\n" + self.last_stats,
+                )
+            return
+        path = found[0]
 
         if self.current_mode == "cube":
             # Chemin sur le cube : afficher la suite des sommets aXYZ
@@ -787,7 +1492,7 @@ class GridPathsViewer:
             coords_str = " → ".join(labels)
             if hasattr(self, "user_text"):
                 self.user_text.delete("1.0", "end")
-                index_txt = f"Chemin sélectionné (cube) : {self.selected_path_index + 1}/{len(self.paths)}\n"
+                index_txt = f"Chemin sélectionné (cube) : {self.selected_path_index + 1}/{self.path_total()}\n"
                 self.user_text.insert(
                     "end",
                     index_txt
@@ -802,7 +1507,7 @@ class GridPathsViewer:
             coords_str = " → ".join(labels)
             if hasattr(self, "user_text"):
                 self.user_text.delete("1.0", "end")
-                index_txt = f"Chemin sélectionné (cube 4D) : {self.selected_path_index + 1}/{len(self.paths)}\n"
+                index_txt = f"Chemin sélectionné (cube 4D) : {self.selected_path_index + 1}/{self.path_total()}\n"
                 self.user_text.insert(
                     "end",
                     index_txt
@@ -814,25 +1519,26 @@ class GridPathsViewer:
         # Mode grille classique
         # Coordonnées du chemin
         coords_str = " → ".join(f"({x},{y})" for x, y in path)
-        # Compter les directions
-        up_count = left_count = right_count = 0
-        for (x1, y1), (x2, y2) in zip(path, path[1:]):
-            dx = x2 - x1
-            dy = y2 - y1
-            if dx == 1 and dy == 0:          # droite
-                right_count += 1
-            elif dx == -1 and dy == 0:       # gauche
-                left_count += 1
-            elif dx == 0 and dy == 1:        # haut
-                up_count += 1
+        # Pas par direction et virages : codes sur 2 bits du stockage s'il y en a
+        codes = stored_codes(self.paths, self.selected_path_index)
+        if codes is None:
+            codes = path_to_codes(path)
+        (right_count, up_count, left_count, down_count), turns = step_summary(codes)
 
         if hasattr(self, "user_text"):
             self.user_text.delete("1.0", "end")
-            index_txt = f"Chemin sélectionné : {self.selected_path_index + 1}/{len(self.paths)}\n"
+            index_txt = f"Chemin sélectionné : {self.selected_path_index + 1}/{self.path_total()}\n"
+            if isinstance(self.paths, FilteredPaths):
+                source_index = self.paths.source_index(self.selected_path_index)
+                index_txt = (f"Chemin sélectionné : {self.selected_path_index + 1}/{self.path_total()} "
+                             f"du filtre « {self.paths.query} » "
+                             f"(n° {source_index + 1}/{path_count(self.paths.source)})\n")
             directions_txt = (
                 f"Haut (vert) : {up_count}\n"
                 f"Gauche (bleu) : {left_count}\n"
-                f"Droite (gris foncé) : {right_count}"
+                f"Droite (gris foncé) : {right_count}\n"
+                f"Bas (rouge) : {down_count}\n"
+                f"Virages : {turns}"
             )
             self.user_text.insert(
                 "end",
@@ -844,25 +1550,129 @@ class GridPathsViewer:
 
     # --- Navigation entre les pages ---
     def next_page(self):
-        if not self.paths:
+        if not self.path_total():
             return
-        total = len(self.paths)
+        total = self.path_total()
         per_page = self.get_paths_per_page()
         nb_pages = (total - 1) // per_page + 1
         if self.current_page < nb_pages - 1:
             self.current_page += 1
-            self.draw_current_page()
+            self.schedule_draw()
             self.update_page_label()
 
     def previous_page(self):
-        if not self.paths:
+        if not self.path_total():
             return
         if self.current_page > 0:
             self.current_page -= 1
-            self.draw_current_page()
+            self.schedule_draw()
             self.update_page_label()
 
+    def read_goto_value(self) -> Optional[int]:
+        """Numéro saisi dans le champ « aller à » (None s'il n'est pas valide)."""
+        try:
+            return int(self.goto_value.get().strip().replace(" ", ""))
+        except ValueError:
+            return None
+
+    def go_to_page(self):
+        """Affiche directement la page demandée (sans parcourir les précédentes)."""
+        number = self.read_goto_value()
+        if number is None or not self.path_total():
+            return
+        nb_pages = (self.path_total() - 1) // self.get_paths_per_page() + 1
+        self.current_page = min(max(number, 1), nb_pages) - 1
+        self.schedule_draw()
+        self.update_page_label()
+
+    def go_to_path(self):
+        """Affiche la page du chemin demandé et le sélectionne."""
+        number = self.read_goto_value()
+        if number is None or not self.path_total():
+            return
+        index = min(max(number, 1), self.path_total()) - 1
+        self.current_page = index // self.get_paths_per_page()
+        self.selected_path_index = index
+        self.schedule_draw()
+        self.update_page_label()
+        self.update_current_path_details()
+
+
+# --- Mesure du démarrage (--startup-time) ---
+STARTUP_LOG = "demarrage.log"   # dans PATH_STORE_DIR
+
+
+def process_start_time() -> Optional[float]:
+    """Heure de création du processus (comme time.time()), ou None si le
+    système ne la donne pas. Exécutable PyInstaller en un seul fichier :
+    c'est le processus parent qui décompresse l'application, on prend donc
+    son heure de création."""
+    bundle = os.path.basename(getattr(sys, "_MEIPASS", ""))
+    pid = os.getppid() if getattr(sys, "frozen", False) and bundle.startswith("_MEI") else os.getpid()
+    try:
+        if sys.platform == "win32":
+            import ctypes
+            from ctypes import wintypes
+            kernel32 = ctypes.windll.kernel32
+            handle = kernel32.OpenProcess(0x1000, False, pid)   # PROCESS_QUERY_LIMITED_INFORMATION
+            if not handle:
+                return None
+            times = [wintypes.FILETIME() for _ in range(4)]
+            ok = kernel32.GetProcessTimes(handle, *(ctypes.byref(t) for t in times))
+            kernel32.CloseHandle(handle)
+            if not ok:
+                return None
+            ticks = (times[0].dwHighDateTime << 32) | times[0].dwLowDateTime   # 100 ns depuis 1601
+            return ticks / 1e7 - 11644473600
+        with open(f"/proc/{pid}/stat", "r") as handle:
+            start_ticks = int(handle.read().rsplit(")", 1)[1].split()[19])
+        with open("/proc/uptime", "r") as handle:
+            uptime = float(handle.read().split()[0])
+        return time.time() - (uptime - start_ticks / os.sysconf("SC_CLK_TCK"))
+    except (OSError, ValueError, IndexError, AttributeError):
+        return None
+
+
+def report_startup(started: float, origin: str, first_frame: float, complete: float) -> str:
+    """Écrit les temps de démarrage sur la sortie standard (s'il y en a une :
+    pas dans l'exécutable sans console) et à la fin de STARTUP_LOG."""
+    text = (f"Premier affichage : {first_frame - started:.3f} s, "
+            f"fenêtre complète : {complete - started:.3f} s (depuis {origin})")
+    if sys.stdout is not None:
+        print(text, flush=True)
+    try:
+        os.makedirs(PATH_STORE_DIR, exist_ok=True)
+        with open(os.path.join(PATH_STORE_DIR, STARTUP_LOG), "a", encoding="utf-8") as handle:
+            handle.write(f"{time.strftime('%Y-%m-%d %H:%M:%S')} {text}\n")
+    except OSError:
+        pass
+    return text
+
+
 if __name__ == "__main__":
+    script_started = time.time()
+    if getattr(sys, "frozen", False):
+        # nécessaire pour l'exécutable PyInstaller (et seulement pour lui :
+        # multiprocessing coûte ~20 ms à importer au démarrage)
+        import multiprocessing
+        multiprocessing.freeze_support()
+    if "--batch" in sys.argv[1:]:
+        # calcul en lot, sans fenêtre (voir moteur_chemins.batch_main)
+        sys.exit(batch_main(sys.argv[1:]))
     root = tk.Tk()
-    app = GridPathsViewer(root)
+    # la fenêtre s'affiche d'abord avec ses commandes, les vignettes ensuite
+    app = GridPathsViewer(root, defer_thumbnails=True)
+    root.update()
+    first_frame = time.time()
+    app.create_thumbnails()
+    root.update_idletasks()
+    if "--startup-time" in sys.argv[1:]:
+        # mesure du démarrage : temps jusqu'au premier affichage, puis on quitte
+        process_started = process_start_time()
+        if process_started is None:
+            report_startup(script_started, "le début du script", first_frame, time.time())
+        else:
+            report_startup(process_started, "le lancement du processus", first_frame, time.time())
+        root.destroy()
+        sys.exit(0)
     root.mainloop()
@@ -1,12 +1,18 @@
 # -*- mode: python ; coding: utf-8 -*-
 
+# Construction en dossier (« one-dir ») et sans UPX : l'exécutable démarre
+# directement depuis dist/chemins_grille/, sans se décompresser dans un
+# dossier temporaire à chaque lancement ni décompresser ses DLL (UPX).
+# À distribuer en zippant tout le dossier dist/chemins_grille/.
 
 a = Analysis(
     ['chemins_grille.py'],
     pathex=[],
     binaries=[],
     datas=[],
-    hiddenimports=[],
+    # NumPy est importé à la demande (moteur_chemins._LazyModule) : PyInstaller
+    # ne le voit pas tout seul. Ignoré s'il n'est pas installé.
+    hiddenimports=['numpy'],
     hookspath=[],
     hooksconfig={},
     runtime_hooks=[],
@@ -19,16 +25,13 @@ pyz = PYZ(a.pure)
 exe = EXE(
     pyz,
     a.scripts,
-    a.binaries,
-    a.datas,
     [],
+    exclude_binaries=True,
     name='chemins_grille',
     debug=False,
     bootloader_ignore_signals=False,
     strip=False,
-    upx=True,
-    upx_exclude=[],
-    runtime_tmpdir=None,
+    upx=False,
     console=False,
     disable_windowed_traceback=False,
     argv_emulation=False,
@@ -36,3 +39,13 @@ exe = EXE(
     codesign_identity=None,
     entitlements_file=None,
 )
+
+coll = COLLECT(
+    exe,
+    a.binaries,
+    a.datas,
+    strip=False,
+    upx=False,
+    upx_exclude=[],
+    name='chemins_grille',
+)
@@ -0,0 +1,3012 @@
+"""Moteur de calcul des chemins (grille, cube, hypercube), sans interface.
+
+Tout ce qui compte, énumère, stocke ou résume des chemins est ici, sans
+tkinter : on peut l'utiliser dans un script, un calcul en lot ou un processus
+de travail sans fenêtre ni serveur X. chemins_grille.py (l'interface) ne fait
+qu'appeler ces fonctions.
+"""
+import importlib
+import importlib.util
+import json
+import mmap
+import math
+import os
+import queue
+import random
+import re
+import struct
+import sys
+import threading
+import time
+from array import array
+from collections import OrderedDict
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+
+
+class _LazyModule:
+    """Module importé seulement au premier accès à un de ses attributs, puis
+    mis à sa place dans les globales de ce module (nom `global_name`)."""
+
+    def __init__(self, name: str, global_name: str):
+        self._name = name
+        self._global_name = global_name
+
+    def __getattr__(self, attr: str):
+        module = importlib.import_module(self._name)
+        globals()[self._global_name] = module
+        return getattr(module, attr)
+
+
+# facultatif : calculs vectorisés sur les lots de chemins. NumPy met environ
+# 0,1 s à s'importer : on ne le charge qu'au premier lot, pas au démarrage.
+np = _LazyModule("numpy", "np") if importlib.util.find_spec("numpy") is not None else None
+try:
+    import resource      # mémoire de pointe du processus (pas sous Windows)
+except ImportError:
+    resource = None
+
+Point = Tuple[int, int]
+Chemin = List[Tuple[int, int]]
+
+# Au-delà de ce nombre de chemins, la grille est parcourue page par page
+# (LazyPathSequence) au lieu d'être énumérée entièrement dans un PackedPathStore.
+FULL_ENUMERATION_LIMIT = 200_000
+# En dessous de ce nombre de chemins, lancer des processus coûte plus cher que le calcul.
+PARALLEL_MIN_PATHS = 5_000
+
+
+# --- Comptage des chemins sans énumération (DP « frontière ») ---
+def count_grid_paths(m: int, n: int) -> int:
+    """Compte les chemins simples de (0,0) à (m,n) sans les énumérer.
+
+    On balaie les sommets colonne par colonne (numéro v = x * (n+1) + y) et on
+    décide pour chaque arête « utilisée / pas utilisée ». L'état ne garde que la
+    frontière (n+2 sommets) : pour chacun, -1 s'il est déjà plein (degré 2),
+    son propre numéro s'il n'est pas encore touché, sinon le numéro de l'autre
+    extrémité de son morceau de chemin. Le départ et l'arrivée sont reliés au
+    début par une arête « virtuelle » : fermer ce morceau revient à terminer un
+    chemin de (0,0) à (m,n).
+    """
+    return count_simple_paths(m, n, (0, 0), (m, n))
+
+
+def count_simple_paths(m: int, n: int, source: Point, target: Point, blocked=()) -> int:
+    """Compte les chemins simples de `source` à `target` dans la grille (m, n)
+    qui ne passent par aucune case de `blocked`, sans les énumérer.
+
+    Même DP que count_grid_paths : les cases interdites entrent dans la
+    frontière déjà « pleines » (-1), et l'arête virtuelle relie source et cible.
+    """
+    if m < 0 or n < 0:
+        return 0
+    blocked = set(blocked)
+    if source in blocked or target in blocked:
+        return 0
+    if n > m:
+        # symétrie diagonale : la frontière la plus courte coûte le moins cher
+        m, n = n, m
+        source = (source[1], source[0])
+        target = (target[1], target[0])
+        blocked = {(y, x) for x, y in blocked}
+    rows = n + 1
+    last = m * rows + n
+    s = source[0] * rows + source[1]
+    t = target[0] * rows + target[1]
+    if s == t:
+        return 1
+    if s > t:
+        s, t = t, s
+    forbidden = {x * rows + y for x, y in blocked}
+
+    # fenêtre initiale : sommets 0 .. rows
+    init = [-1 if v in forbidden else v for v in range(rows + 1)]
+    if s <= rows:
+        init[s] = t
+    if t <= rows:
+        init[t] = s
+    states = {tuple(init): 1}
+    total = 0
+
+    def use_edge(state: tuple, i: int, j: int, base: int):
+        """Ajoute l'arête entre les positions i et j. Renvoie le nouvel état,
+        "done" si le chemin est terminé, ou None si l'ajout est interdit."""
+        vi = base + i
+        vj = base + j
+        a = state[i]
+        b = state[j]
+        if a == -1 or b == -1:
+            return None
+        if a == vj:
+            # on referme un morceau : valable seulement si c'est celui de
+            # l'arête virtuelle (la source est déjà entrée) et qu'il ne reste
+            # rien d'autre
+            if s > base + len(state) - 1:
+                return None
+            for k, val in enumerate(state):
+                if val != -1 and val != base + k and k != i and k != j:
+                    return None
+            return "done"
+        new = list(state)
+        size = len(state)
+        pa = a - base
+        pb = b - base
+        if 0 <= pa < size:
+            new[pa] = b
+        if 0 <= pb < size:
+            new[pb] = a
+        if a != vi:
+            new[i] = -1
+        if b != vj:
+            new[j] = -1
+        return tuple(new)
+
+    for u in range(last + 1):
+        x, y = divmod(u, rows)
+        new_states: dict = {}
+        # valeur du sommet w qui entre dans la frontière (pour la cible : son partenaire)
+        w = u + rows + 1
+        if w in forbidden:
+            entering = -1
+        elif w == s:
+            entering = t
+        else:
+            entering = w
+        for state, weight in states.items():
+            # arête vers le haut (u, u+1) puis vers la droite (u, u+rows)
+            candidates = [state]
+            if y < n:
+                nxt = []
+                for st in candidates:
+                    nxt.append(st)
+                    res = use_edge(st, 0, 1, u)
+                    if res == "done":
+                        total += weight
+                    elif res is not None:
+                        nxt.append(res)
+                candidates = nxt
+            if x < m:
+                nxt = []
+                for st in candidates:
+                    nxt.append(st)
+                    res = use_edge(st, 0, rows, u)
+                    if res == "done":
+                        total += weight
+                    elif res is not None:
+                        nxt.append(res)
+                candidates = nxt
+
+            for st in candidates:
+                # le sommet u quitte la frontière : il ne doit pas rester une extrémité
+                if st[0] != -1 and st[0] != u:
+                    continue
+                if w == t and entering != -1:
+                    partner = w
+                    for k, val in enumerate(st):
+                        if val == t:
+                            partner = u + k
+                            break
+                    shifted = st[1:] + (partner,)
+                else:
+                    shifted = st[1:] + (entering,)
+                new_states[shifted] = new_states.get(shifted, 0) + weight
+        states = new_states
+    return total
+
+
+def grid_path_stats(m: int, n: int) -> Tuple[int, int, int]:
+    """Renvoie (total, avec_haut, avec_gauche) sans énumérer les chemins.
+
+    - si n > 0, tout chemin monte au moins une fois (il faut passer de y=0 à y=n) ;
+    - un chemin sans pas vers la gauche parcourt chaque colonne verticalement
+      puis passe à droite : il y en a exactement (n+1)^m.
+    """
+    total = count_grid_paths(m, n)
+    if total == 0:
+        return 0, 0, 0
+    with_up = total if n > 0 else 0
+    with_left = total - (n + 1) ** m
+    return total, with_up, with_left
+
+
+# --- Énumération paresseuse et reprenable ---
+def grid_neighbor_table(m: int, n: int) -> List[Tuple[Tuple[int, int, int], ...]]:
+    """Table des voisins de la grille, cellule par cellule.
+
+    La grille est entourée d'une bordure d'une case : la cellule (x, y) a le
+    numéro (y+1) * (m+3) + (x+1). Pour chaque cellule on garde les mouvements
+    possibles (voisin, bit du voisin, code de direction) dans l'ordre droite (0),
+    haut (1), gauche (2), bas (3), comme find_all_paths. Les cases de bordure
+    n'ont aucun mouvement.
+    """
+    width = m + 3
+    table: List[Tuple[Tuple[int, int, int], ...]] = [()] * ((n + 3) * width)
+    for y in range(n + 1):
+        for x in range(m + 1):
+            moves = []
+            for code, (dx, dy) in enumerate(GridPathWalker.DIRECTIONS):
+                nx, ny = x + dx, y + dy
+                if 0 <= nx <= m and 0 <= ny <= n:
+                    nb = (ny + 1) * width + nx + 1
+                    moves.append((nb, 1 << nb, code))
+            table[(y + 1) * width + x + 1] = tuple(moves)
+    return table
+
+
+def _local_cut_table() -> Tuple[int, ...]:
+    """Pour chaque motif 3x3 de cases bloquées (bit r*3+c, r=0 en bas), nombre de
+    groupes de voisins libres (0, 1, ou 2 pour « au moins 2 ») autour du centre.
+
+    Deux voisins directs libres sont dans le même groupe s'ils se rejoignent en
+    faisant le tour du centre par des cases libres. S'il n'y a qu'un groupe,
+    bloquer le centre ne peut déconnecter aucune case libre.
+    """
+    ring = (5, 8, 7, 6, 3, 0, 1, 2)   # E, NE, N, NO, O, SO, S, SE
+    orth = {5, 7, 3, 1}
+    table = []
+    for pattern in range(512):
+        free = [not (pattern >> pos) & 1 for pos in ring]
+        if all(free):
+            table.append(1)
+            continue
+        # partir d'une case bloquée pour ne pas couper un groupe en deux
+        start = free.index(False)
+        groups = 0
+        in_group = False
+        counted = False
+        for k in range(1, 9):
+            idx = (start + k) % 8
+            if free[idx]:
+                if not in_group:
+                    in_group = True
+                    counted = False
+                if ring[idx] in orth and not counted:
+                    groups += 1
+                    counted = True
+            else:
+                in_group = False
+        table.append(min(groups, 2))
+    return tuple(table)
+
+
+_LOCAL_CUT = _local_cut_table()
+
+
+class GridPathWalker:
+    """DFS à pile explicite sur la grille, qu'on peut arrêter et reprendre.
+
+    Les cellules sont des entiers (voir grid_neighbor_table) et l'ensemble des
+    cellules visitées est un seul entier utilisé comme masque de bits ; la
+    bordure y est marquée dès le départ. La pile contient, pour chaque cellule
+    du chemin courant, un itérateur sur les mouvements qui restent à essayer :
+    pas de récursion, donc pas de limite de profondeur.
+
+    Avec prune=True, on abandonne une branche dès que l'arrivée n'est plus
+    atteignable par des cases libres. On garde pour cela, à chaque niveau, la
+    composante libre de l'arrivée ; elle n'est recalculée (remplissage par
+    décalages de bits) que si la nouvelle case peut couper la zone libre en
+    deux, ce qui se lit sur ses 8 voisines dans _LOCAL_CUT. Les chemins
+    produits et leur ordre sont les mêmes qu'avec prune=False.
+
+    `nodes` compte les cases empilées depuis la création (progression) et
+    `prunes` les branches abandonnées par prune=True (voir Instrumentation ;
+    mis à jour seulement à la fin de l'énumération).
+    Avec track_stats=True, chaque niveau de la pile porte aussi le résumé du
+    préfixe (pas par direction, virages, dernier pas : voir _SUMMARY_STEP),
+    mis à jour en O(1) à chaque case ; `summary` est celui du dernier chemin
+    produit et iter_summaries() ne donne que ces résumés.
+    Avec first_move (code de direction), on ne garde que les chemins dont le
+    premier pas va dans cette direction (voir MirroredPaths).
+
+    checkpoint() n'a besoin que du chemin courant (le mouvement suivant d'une
+    cellule est celui qui suit la cellule d'après dans la table) et restore()
+    reconstruit la pile à partir de là : c'est ce qui permet de reprendre
+    l'énumération au début de n'importe quelle page déjà vue.
+    """
+
+    DIRECTIONS: Tuple[Point, ...] = ((1, 0), (0, 1), (-1, 0), (0, -1))
+
+    def __init__(self, m: int, n: int, prune: bool = False, first_move: Optional[int] = None,
+                 track_stats: bool = False):
+        self.m = m
+        self.n = n
+        self.prune = prune
+        self.first_move = first_move
+        self.track_stats = track_stats
+        self.nodes = 0
+        self.prunes = 0
+        self.width = width = m + 3
+        if m >= 0 and n >= 0:
+            self.start = width + 1
+            self.end = (n + 1) * width + m + 1
+            self.table = grid_neighbor_table(m, n)
+            self.coords: List[Optional[Point]] = [None] * len(self.table)
+            self.interior = 0
+            for y in range(n + 1):
+                for x in range(m + 1):
+                    cell = (y + 1) * width + x + 1
+                    self.coords[cell] = (x, y)
+                    self.interior |= 1 << cell
+            self.border = ((1 << len(self.table)) - 1) & ~self.interior
+            if first_move is not None:
+                self.table = list(self.table)
+                self.table[self.start] = tuple(
+                    move for move in self.table[self.start] if move[2] == first_move
+                )
+        else:
+            self.start = self.end = -1
+            self.table = []
+            self.coords = []
+            self.interior = self.border = 0
+        self.restore(self.initial_checkpoint())
+
+    def initial_checkpoint(self) -> tuple:
+        if self.m < 0 or self.n < 0:
+            return ((), True)
+        return ((self.start,), False)
+
+    def checkpoint(self) -> tuple:
+        """Copie de l'état du DFS : (cellules du chemin courant, fini ?)."""
+        return (tuple(self.path), self.done)
+
+    def restore(self, state: tuple, subtree: bool = False) -> None:
+        """Repart d'un état donné par checkpoint().
+
+        Avec subtree=True, le chemin de l'état est un préfixe fixe : on
+        n'énumère que les chemins qui le prolongent (utile pour répartir le
+        travail entre processus, voir split_grid_prefixes).
+        """
+        path, done = state
+        table = self.table
+        self.path: List[int] = list(path)
+        self.done = done
+        visited = self.border
+        stack = []
+        reach = []
+        last = len(self.path) - 1
+        for i, cell in enumerate(self.path):
+            visited |= 1 << cell
+            moves = table[cell]
+            if i < last:
+                if subtree:
+                    stack.append(iter(()))
+                else:
+                    nxt = self.path[i + 1]
+                    k = next(j for j, move in enumerate(moves) if move[0] == nxt)
+                    stack.append(iter(moves[k + 1:]))
+            elif cell == self.end:
+                stack.append(iter(()))
+            else:
+                stack.append(iter(moves))
+            if self.prune:
+                if cell == self.end or (subtree and i < last):
+                    reach.append(0)
+                else:
+                    reach.append(self.end_component(visited))
+        self.visited = visited
+        self._stack = stack
+        self._reach = reach
+        self._summaries = [0]
+        if self.track_stats:
+            for code in self.to_codes(self.path):
+                last = self._summaries[-1]
+                self._summaries.append(last + _SUMMARY_STEP[last & 7][code])
+        self.summary = self._summaries[-1]
+        self._cells = self._run_pruned() if self.prune else self._run()
+
+    def end_component(self, visited: int) -> int:
+        """Masque des cases libres reliées à l'arrivée, arrivée exclue
+        (remplissage par décalages de bits)."""
+        end_bit = 1 << self.end
+        free = self.interior & ~visited
+        width = self.width
+        reach = end_bit & free
+        while True:
+            grown = (reach | (reach << 1) | (reach >> 1) | (reach << width) | (reach >> width)) & free
+            if grown == reach:
+                return reach & ~end_bit
+            reach = grown
+
+    def to_points(self, cells) -> Chemin:
+        coords = self.coords
+        return [coords[c] for c in cells]
+
+    def to_codes(self, cells) -> List[int]:
+        """Codes de direction (0 droite, 1 haut, 2 gauche, 3 bas) d'un chemin."""
+        width = self.width
+        code_of = {1: 0, width: 1, -1: 2, -width: 3}
+        return [code_of[b - a] for a, b in zip(cells, cells[1:])]
+
+    def next_path(self) -> Optional[Chemin]:
+        """Renvoie le chemin suivant dans l'ordre du DFS, ou None à la fin."""
+        cells = next(self._cells, None)
+        return None if cells is None else self.to_points(cells)
+
+    def iter_paths(self) -> Iterator[Chemin]:
+        """Chemins restants, en coordonnées (x, y)."""
+        to_points = self.to_points
+        for cells in self._cells:
+            yield to_points(cells)
+
+    def iter_codes(self) -> Iterator[List[int]]:
+        """Chemins restants, en codes de direction."""
+        to_codes = self.to_codes
+        for cells in self._cells:
+            yield to_codes(cells)
+
+    def iter_summaries(self) -> Iterator[int]:
+        """Résumés (voir PathStats) des chemins restants, sans les convertir.
+        Demande track_stats=True."""
+        for _cells in self._cells:
+            yield self.summary
+
+    def _run(self) -> Iterator[List[int]]:
+        # produit la liste des cellules du chemin courant (modifiée ensuite) :
+        # l'appelant la convertit tout de suite (to_points / to_codes)
+        path = self.path
+        if self.done:
+            return
+        if path == [self.end]:
+            # cas (0,0) == (m,n) : le chemin réduit au départ
+            self.done = True
+            yield path
+            return
+
+        stack = self._stack
+        visited = self.visited
+        end = self.end
+        table = self.table
+        nodes = self.nodes
+        track = self.track_stats
+        summaries = self._summaries
+        no_moves = ()
+        while stack:
+            for nb, bit, code in stack[-1]:
+                if not visited & bit:
+                    visited |= bit
+                    path.append(nb)
+                    nodes += 1
+                    if track:
+                        last = summaries[-1]
+                        summaries.append(last + _SUMMARY_STEP[last & 7][code])
+                    if nb == end:
+                        stack.append(iter(no_moves))
+                        self.nodes = nodes
+                        if track:
+                            self.summary = summaries[-1]
+                        yield path
+                    else:
+                        stack.append(iter(table[nb]))
+                    break
+            else:
+                stack.pop()
+                visited ^= 1 << path.pop()
+                if track:
+                    summaries.pop()
+        self.nodes = nodes
+        self.done = True
+
+    def _run_pruned(self) -> Iterator[List[int]]:
+        path = self.path
+        if self.done:
+            return
+        if path == [self.end]:
+            self.done = True
+            yield path
+            return
+
+        stack = self._stack
+        reach_stack = self._reach
+        visited = self.visited
+        end = self.end
+        end_bit = 1 << end
+        table = self.table
+        width = self.width
+        # motif 3x3 autour d'une case c : (visited >> (c - width - 1)) & window
+        window = 0b111 | (0b111 << width) | (0b111 << (2 * width))
+        local_cut = {}
+        for pattern, groups in enumerate(_LOCAL_CUT):
+            key = (pattern & 7) | (((pattern >> 3) & 7) << width) | ((pattern >> 6) << (2 * width))
+            local_cut[key] = groups
+        nodes = self.nodes
+        prunes = self.prunes
+        track = self.track_stats
+        summaries = self._summaries
+        no_moves = ()
+        while stack:
+            for nb, bit, code in stack[-1]:
+                # les masques « reach » n'incluent jamais l'arrivée elle-même
+                if not reach_stack[-1] & bit:
+                    if bit == end_bit:
+                        visited |= bit
+                        path.append(nb)
+                        stack.append(iter(no_moves))
+                        reach_stack.append(0)
+                        nodes += 1
+                        self.nodes = nodes
+                        if track:
+                            last = summaries[-1]
+                            summaries.append(last + _SUMMARY_STEP[last & 7][code])
+                            self.summary = summaries[-1]
+                        yield path
+                        break
+                    # case déjà visitée, ou dans une poche coupée de l'arrivée
+                    continue
+                visited |= bit
+                groups = local_cut[(visited >> (nb - width - 1)) & window]
+                if groups == 1:
+                    reach = reach_stack[-1] ^ bit
+                else:
+                    reach = self.end_component(visited) if groups else 0
+                    # comptés seulement après un remplissage : coût négligeable
+                    if not any((reach | end_bit) & b for _nb, b, _c in table[nb]):
+                        visited ^= bit
+                        prunes += 1
+                        continue
+                    if reach != reach_stack[-1] ^ bit:
+                        prunes += 1   # poche coupée de l'arrivée : jamais explorée
+                path.append(nb)
+                nodes += 1
+                stack.append(iter(table[nb]))
+                reach_stack.append(reach)
+                if track:
+                    last = summaries[-1]
+                    summaries.append(last + _SUMMARY_STEP[last & 7][code])
+                break
+            else:
+                stack.pop()
+                reach_stack.pop()
+                visited ^= 1 << path.pop()
+                if track:
+                    summaries.pop()
+        self.nodes = nodes
+        self.prunes = prunes
+        self.done = True
+
+
+# --- Statistiques des chemins, accumulées pendant l'énumération ---
+# Résumé d'un préfixe dans un entier : bits 0-2 dernier pas (code + 1, 0 au
+# départ), puis un champ de SUMMARY_FIELD_BITS bits par direction (nombre de
+# pas droite, haut, gauche, bas) et un dernier pour le nombre de virages.
+SUMMARY_FIELD_BITS = 12
+_SUMMARY_FIELD_MASK = (1 << SUMMARY_FIELD_BITS) - 1
+_SUMMARY_TURNS_SHIFT = 3 + 4 * SUMMARY_FIELD_BITS
+
+
+def _summary_step_table() -> Tuple[Tuple[int, ...], ...]:
+    """_SUMMARY_STEP[dernier][code] : ce qu'on ajoute au résumé pour un pas `code`."""
+    rows = []
+    for last in range(8):
+        row = []
+        for code in range(4):
+            turn = 1 if last and last != code + 1 else 0
+            row.append((1 << (3 + SUMMARY_FIELD_BITS * code))
+                       + (turn << _SUMMARY_TURNS_SHIFT)
+                       + (code + 1 - last))
+        rows.append(tuple(row))
+    return tuple(rows)
+
+
+_SUMMARY_STEP = _summary_step_table()
+
+
+def _codes_summary(codes: List[int]) -> int:
+    summary = 0
+    for code in codes:
+        summary += _SUMMARY_STEP[summary & 7][code]
+    return summary
+
+
+def step_summary(codes: List[int]) -> Tuple[List[int], int]:
+    """Pas par direction [droite, haut, gauche, bas] et nombre de virages
+    d'un chemin donné par ses codes (même résumé que PathStats)."""
+    key = _codes_summary(codes) >> 3
+    bits = SUMMARY_FIELD_BITS
+    return [(key >> (bits * k)) & _SUMMARY_FIELD_MASK for k in range(4)], key >> (4 * bits)
+
+
+class PathStats:
+    """Statistiques sur un ensemble de chemins, remplies un chemin à la fois
+    (sans garder les chemins) et fusionnables (un accumulateur par processus).
+
+    - total, with_up, with_left (comme grid_path_stats), with_down ;
+    - lengths : nombre de chemins par longueur (en pas) ;
+    - steps[code] : nombre de chemins par nombre de pas dans la direction
+      code (0 droite, 1 haut, 2 gauche, 3 bas) ;
+    - turns : nombre de chemins par nombre de virages (changements de direction).
+
+    Le plus rapide est add_summary avec les résumés de GridPathWalker
+    (track_stats=True) ; add_codes fait la même chose depuis des codes et
+    add_batch pour tout un lot de chemins déjà calculés (PathBatch).
+    """
+
+    def __init__(self):
+        self.total = 0
+        self.with_up = 0
+        self.with_left = 0
+        self.with_down = 0
+        self._summaries: Dict[int, int] = {}   # résumé sans le dernier pas -> nombre de chemins
+        self._counted = True
+
+    def add_summary(self, summary: int) -> None:
+        key = summary >> 3
+        self._summaries[key] = self._summaries.get(key, 0) + 1
+        self._counted = False
+
+    def add_codes(self, codes: List[int]) -> None:
+        self.add_summary(_codes_summary(codes))
+
+    def add_batch(self, batch: "PathBatch") -> None:
+        """Ajoute tous les chemins d'un PathBatch (NumPy) d'un coup."""
+        keys, counts = np.unique(batch.summary_keys(), return_counts=True)
+        for key, count in zip(keys.tolist(), counts.tolist()):
+            self._summaries[key] = self._summaries.get(key, 0) + count
+        self._counted = False
+
+    def merge(self, other: "PathStats") -> None:
+        for key, count in other._summaries.items():
+            self._summaries[key] = self._summaries.get(key, 0) + count
+        self._counted = False
+
+    def mirrored(self) -> "PathStats":
+        """Statistiques des images par la diagonale (droite <-> haut, gauche <-> bas)."""
+        result = PathStats()
+        bits = SUMMARY_FIELD_BITS
+        for key, count in self._summaries.items():
+            right, up, left, down = ((key >> (bits * k)) & _SUMMARY_FIELD_MASK for k in range(4))
+            swapped = (key >> (4 * bits) << (4 * bits)) | up | (right << bits) | (down << 2 * bits) | (left << 3 * bits)
+            result._summaries[swapped] = count
+        result._counted = False
+        return result
+
+    def _count(self) -> None:
+        if self._counted:
+            return
+        bits = SUMMARY_FIELD_BITS
+        self.total = self.with_up = self.with_left = self.with_down = 0
+        self.lengths: Dict[int, int] = {}
+        self.steps: List[Dict[int, int]] = [{} for _ in range(4)]
+        self.turns: Dict[int, int] = {}
+        for key, count in self._summaries.items():
+            counts = [(key >> (bits * k)) & _SUMMARY_FIELD_MASK for k in range(4)]
+            turns = key >> (4 * bits)
+            self.total += count
+            if counts[1]:
+                self.with_up += count
+            if counts[2]:
+                self.with_left += count
+            if counts[3]:
+                self.with_down += count
+            length = sum(counts)
+            self.lengths[length] = self.lengths.get(length, 0) + count
+            for code, steps in enumerate(counts):
+                self.steps[code][steps] = self.steps[code].get(steps, 0) + count
+            self.turns[turns] = self.turns.get(turns, 0) + count
+        self._counted = True
+
+    def counts(self) -> Tuple[int, int, int]:
+        """(total, avec_haut, avec_gauche), comme grid_path_stats."""
+        self._count()
+        return self.total, self.with_up, self.with_left
+
+    def describe(self) -> str:
+        """Texte pour la zone de statistiques (longueurs, pas par direction, virages)."""
+        self._count()
+        if not self.total:
+            return ""
+
+        def mean(histogram: Dict[int, int]) -> float:
+            return sum(value * count for value, count in histogram.items()) / self.total
+
+        def summary(histogram: Dict[int, int]) -> str:
+            return f"min {min(histogram)}, moyenne {mean(histogram):.2f}, max {max(histogram)}"
+
+        names = ("droite", "haut", "gauche", "bas")
+        lines = [
+            f"Longueur (pas) : {summary(self.lengths)}",
+            "  " + ", ".join(f"{length}: {count}" for length, count in sorted(self.lengths.items())),
+            f"Virages : {summary(self.turns)}",
+            "Pas par chemin : " + ", ".join(
+                f"{name} {mean(self.steps[code]):.2f} (max {max(self.steps[code])})"
+                for code, name in enumerate(names)
+            ),
+        ]
+        return "\n".join(lines)
+
+
+def iter_grid_paths(m: int, n: int, prune: bool = False) -> Iterator[Chemin]:
+    """Génère les chemins de (0,0) à (m,n) un par un, dans l'ordre du DFS.
+
+    prune=True active l'abandon des impasses (voir GridPathWalker).
+    """
+    yield from GridPathWalker(m, n, prune).iter_paths()
+
+
+# --- Stockage compact des chemins (codes de direction sur 2 bits) ---
+def pack_codes(codes: List[int], first_step: int = 0) -> bytes:
+    """Range des codes de direction sur 2 bits (4 pas par octet), le premier à
+    la position `first_step` % 4 de son octet."""
+    value = 0
+    for k, code in enumerate(codes):
+        value |= code << (2 * k)
+    shift = 2 * (first_step % 4)
+    nbits = shift + 2 * len(codes)
+    return (value << shift).to_bytes((nbits + 7) // 8, "little")
+
+
+def unpack_codes(buffer, start: int, stop: int) -> List[int]:
+    """Relit les codes des pas start..stop-1 d'un tampon rempli par pack_codes."""
+    if stop <= start:
+        return []
+    value = int.from_bytes(buffer[start // 4:(stop + 3) // 4], "little") >> (2 * (start % 4))
+    return [(value >> (2 * k)) & 3 for k in range(stop - start)]
+
+
+def path_to_codes(path: Chemin) -> List[int]:
+    """Codes de direction (0 droite, 1 haut, 2 gauche, 3 bas) des pas d'un chemin."""
+    code_of = {(1, 0): 0, (0, 1): 1, (-1, 0): 2, (0, -1): 3}
+    return [code_of[(x2 - x1, y2 - y1)] for (x1, y1), (x2, y2) in zip(path, path[1:])]
+
+
+def codes_to_points(codes: List[int], start: Point = (0, 0)) -> Chemin:
+    """Reconstruit les coordonnées d'un chemin à partir de ses codes."""
+    x, y = start
+    points = [(x, y)]
+    for code in codes:
+        dx, dy = GridPathWalker.DIRECTIONS[code]
+        x += dx
+        y += dy
+        points.append((x, y))
+    return points
+
+
+class PackedPathStore:
+    """Chemins de la grille rangés en codes de direction sur 2 bits.
+
+    Tous les pas sont mis bout à bout dans un seul bytearray ; la table
+    `offsets` (array d'entiers 64 bits) donne le numéro du premier pas de
+    chaque chemin. Un chemin de L pas coûte donc L/4 octets plus 8 octets
+    d'index, au lieu d'une liste Python de L+1 tuples. Les coordonnées ne sont
+    reconstruites qu'à la lecture (dessin, détails du chemin sélectionné).
+    """
+
+    def __init__(self):
+        self._codes = bytearray()
+        self._offsets = array("Q", [0])
+
+    @classmethod
+    def from_paths(cls, paths) -> "PackedPathStore":
+        store = cls()
+        for path in paths:
+            store.append(path)
+        return store
+
+    def __len__(self) -> int:
+        return len(self._offsets) - 1
+
+    def __getitem__(self, index: int) -> Chemin:
+        return codes_to_points(self.codes(index))
+
+    def __iter__(self) -> Iterator[Chemin]:
+        for index in range(len(self)):
+            yield self[index]
+
+    def codes(self, index: int) -> List[int]:
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("indice de chemin hors limites")
+        return unpack_codes(self._codes, self._offsets[index], self._offsets[index + 1])
+
+    def append_codes(self, codes: List[int]) -> None:
+        position = self._offsets[-1]
+        chunk = pack_codes(codes, position)
+        if position % 4 and chunk:
+            self._codes[-1] |= chunk[0]
+            chunk = chunk[1:]
+        self._codes.extend(chunk)
+        self._offsets.append(position + len(codes))
+
+    def append(self, path: Chemin) -> None:
+        self.append_codes(path_to_codes(path))
+
+    def extend_store(self, other: "PackedPathStore") -> None:
+        """Ajoute à la suite tous les chemins d'un autre stockage."""
+        position = self._offsets[-1]
+        steps = other._offsets[-1]
+        if steps:
+            value = int.from_bytes(other._codes, "little") << (2 * (position % 4))
+            chunk = value.to_bytes((2 * (position % 4) + 2 * steps + 7) // 8, "little")
+            if position % 4:
+                self._codes[-1] |= chunk[0]
+                chunk = chunk[1:]
+            self._codes.extend(chunk)
+        self._offsets.extend(position + off for off in other._offsets[1:])
+
+    def nbytes(self) -> int:
+        """Mémoire occupée par les données (codes + index), en octets."""
+        return len(self._codes) + self._offsets.itemsize * len(self._offsets)
+
+    def save(self, filename: str, m: int, n: int, half: bool = False) -> None:
+        """Écrit le stockage dans un fichier relisible par MappedPathStore
+        (half : seulement la moitié qui commence vers la droite, voir MirroredPaths)."""
+        os.makedirs(os.path.dirname(filename) or ".", exist_ok=True)
+        offsets = array("Q", self._offsets)
+        if sys.byteorder != "little":
+            offsets.byteswap()
+        tmp_name = filename + ".part"
+        with open(tmp_name, "wb") as f:
+            flags = PATH_FILE_COMPLETE | (PATH_FILE_HALF if half else 0)
+            f.write(PATH_FILE_HEADER.pack(PATH_FILE_MAGIC, PATH_FILE_VERSION, m, n, flags, len(self)))
+            f.write(offsets.tobytes())
+            f.write(self._codes)
+        os.replace(tmp_name, filename)
+
+
+# --- Calculs vectorisés sur des lots de chemins (NumPy, facultatif) ---
+HAS_NUMPY = np is not None
+BATCH_SIZE = 1 << 16   # chemins décodés à la fois : borne la taille des matrices
+# Passages par point calculés après l'énumération jusqu'à ce nombre de chemins
+HEATMAP_MAX_PATHS = 10_000_000 if HAS_NUMPY else FULL_ENUMERATION_LIMIT
+
+
+def run_end_flags(codes: List[int]) -> List[bool]:
+    """Pour chaque pas, True s'il termine une suite de pas dans la même
+    direction (c'est là que le dessin met une flèche)."""
+    last = len(codes) - 1
+    return [k == last or codes[k + 1] != code for k, code in enumerate(codes)]
+
+
+class PathBatch:
+    """Lot de chemins de la grille rangé dans des tableaux NumPy.
+
+    `steps` est une matrice int8 avec un chemin par ligne : ses codes de
+    direction, complétés par -1 après le dernier pas ; `lengths` donne le
+    nombre de pas de chaque chemin. Les pas par direction, les virages, les
+    fins de suites de pas et les passages par case se calculent alors en
+    quelques opérations sur toute la matrice, sans boucle Python par chemin.
+    Ne s'utilise que si NumPy est installé (HAS_NUMPY) ; les fonctions
+    path_statistics, path_heatmap et page_run_ends font sans sinon.
+    """
+
+    # déplacement de chaque code ; le remplissage -1 tombe sur le dernier (0)
+    _DX = (1, 0, -1, 0, 0)
+    _DY = (0, 1, 0, -1, 0)
+
+    def __init__(self, steps, lengths):
+        self.steps = steps
+        self.lengths = lengths
+
+    def __len__(self) -> int:
+        return len(self.lengths)
+
+    @classmethod
+    def from_codes(cls, codes, lengths) -> "PathBatch":
+        """Lot à partir des codes de tous les chemins mis bout à bout."""
+        width = int(lengths.max()) if len(lengths) else 0
+        steps = np.full((len(lengths), width), -1, dtype=np.int8)
+        steps[np.arange(width) < lengths[:, None]] = codes   # rempli ligne par ligne
+        return cls(steps, lengths)
+
+    @classmethod
+    def from_store(cls, store: PackedPathStore, start: int = 0,
+                   stop: Optional[int] = None) -> "PathBatch":
+        """Chemins start..stop-1 d'un PackedPathStore (ou MappedPathStore),
+        décodés directement depuis les octets : 4 pas par octet, 2 bits chacun."""
+        stop = len(store) if stop is None else min(stop, len(store))
+        start = min(start, stop)
+        # copies : ni le bytearray ni la projection mmap ne doivent rester exportés
+        offsets = np.array(store._offsets[start:stop + 1], dtype=np.int64)
+        first, last = int(offsets[0]), int(offsets[-1])
+        raw = np.frombuffer(bytes(store._codes[first // 4:(last + 3) // 4]), dtype=np.uint8)
+        shifts = np.array([0, 2, 4, 6], dtype=np.uint8)
+        codes = ((raw[:, None] >> shifts) & 3).astype(np.int8).reshape(-1)
+        codes = codes[first % 4:first % 4 + last - first]
+        return cls.from_codes(codes, np.diff(offsets))
+
+    @classmethod
+    def from_paths(cls, paths) -> "PathBatch":
+        """Lot à partir de chemins en coordonnées (liste, page d'une séquence...)."""
+        all_codes = [path_to_codes(path) for path in paths]
+        lengths = np.array([len(codes) for codes in all_codes], dtype=np.int64)
+        codes = np.array([code for codes in all_codes for code in codes], dtype=np.int8)
+        return cls.from_codes(codes, lengths)
+
+    def mirrored(self) -> "PathBatch":
+        """Images par la diagonale : droite <-> haut et gauche <-> bas (code ^ 1)."""
+        steps = self.steps
+        return PathBatch(np.where(steps >= 0, steps ^ 1, steps), self.lengths)
+
+    def interleaved(self) -> "PathBatch":
+        """Chaque chemin suivi de son image, dans l'ordre de MirroredPaths."""
+        steps = np.empty((2 * len(self), self.steps.shape[1]), dtype=np.int8)
+        steps[0::2] = self.steps
+        steps[1::2] = self.mirrored().steps
+        return PathBatch(steps, np.repeat(self.lengths, 2))
+
+    def direction_counts(self):
+        """Nombre de pas de chaque chemin dans chaque direction : matrice (chemins, 4)."""
+        return np.stack([(self.steps == code).sum(axis=1) for code in range(4)], axis=1)
+
+    def turn_counts(self):
+        """Nombre de virages (changements de direction) de chaque chemin."""
+        steps = self.steps
+        return ((steps[:, 1:] != steps[:, :-1]) & (steps[:, 1:] >= 0)).sum(axis=1)
+
+    def run_ends(self):
+        """Matrice de booléens de la forme de `steps` : True sur les pas qui
+        terminent une suite de pas dans la même direction."""
+        steps = self.steps
+        following = np.full_like(steps, -1)
+        following[:, :-1] = steps[:, 1:]
+        return (steps >= 0) & (steps != following)
+
+    def global_stats(self) -> Tuple[int, int, int]:
+        """(total, avec_haut, avec_gauche), comme grid_path_stats."""
+        counts = self.direction_counts()
+        return len(self), int((counts[:, 1] > 0).sum()), int((counts[:, 2] > 0).sum())
+
+    def summary_keys(self):
+        """Clé de PathStats de chaque chemin (pas par direction et virages)."""
+        counts = self.direction_counts().astype(np.int64)
+        keys = self.turn_counts().astype(np.int64) << (4 * SUMMARY_FIELD_BITS)
+        for code in range(4):
+            keys |= counts[:, code] << (SUMMARY_FIELD_BITS * code)
+        return keys
+
+    def heatmap(self, m: int, n: int):
+        """Nombre de chemins du lot qui passent par chaque point : tableau
+        (m+1, n+1) indexé [x, y] (un chemin simple y passe au plus une fois)."""
+        steps = self.steps
+        # numéro du point x * (n+1) + y : une seule somme cumulée des déplacements
+        delta = np.array([dx * (n + 1) + dy for dx, dy in zip(self._DX, self._DY)], dtype=np.int32)
+        cells = np.cumsum(delta[steps], axis=1, dtype=np.int32)[steps >= 0]
+        visits = np.bincount(cells, minlength=(m + 1) * (n + 1))
+        visits[0] += len(self)   # le départ
+        return visits.reshape(m + 1, n + 1)
+
+
+def iter_path_batches(paths, size: int = BATCH_SIZE) -> Iterator[PathBatch]:
+    """Découpe des chemins en lots de `size` chemins au plus, dans l'ordre.
+    Les stockages compacts sont décodés sans passer par les coordonnées."""
+    if isinstance(paths, MirroredPaths):
+        for batch in iter_path_batches(paths.base, (size + 1) // 2):
+            yield batch.interleaved()
+        return
+    total = len(paths)
+    for start in range(0, total, size):
+        stop = min(start + size, total)
+        if isinstance(paths, PackedPathStore):
+            yield PathBatch.from_store(paths, start, stop)
+        else:
+            yield PathBatch.from_paths([paths[k] for k in range(start, stop)])
+
+
+def path_statistics(paths) -> PathStats:
+    """Statistiques (PathStats) d'un ensemble de chemins déjà calculés."""
+    if isinstance(paths, MirroredPaths):
+        stats = path_statistics(paths.base)
+        stats.merge(stats.mirrored())
+        return stats
+    stats = PathStats()
+    if not HAS_NUMPY:
+        for index in range(len(paths)):
+            codes = paths.codes(index) if isinstance(paths, PackedPathStore) else path_to_codes(paths[index])
+            stats.add_codes(codes)
+        return stats
+    for batch in iter_path_batches(paths):
+        stats.add_batch(batch)
+    return stats
+
+
+def path_heatmap(paths, m: int, n: int) -> List[List[int]]:
+    """Nombre de chemins qui passent par chaque point (x, y) : visits[x][y]."""
+    if isinstance(paths, MirroredPaths):
+        # l'image d'un chemin passe par (y, x) quand il passe par (x, y)
+        half = path_heatmap(paths.base, m, n)
+        return [[half[x][y] + half[y][x] for y in range(n + 1)] for x in range(m + 1)]
+    if HAS_NUMPY:
+        visits = np.zeros((m + 1, n + 1), dtype=np.int64)
+        for batch in iter_path_batches(paths):
+            visits += batch.heatmap(m, n)
+        return visits.tolist()
+    visits = [[0] * (n + 1) for _ in range(m + 1)]
+    for index in range(len(paths)):
+        for x, y in paths[index]:
+            visits[x][y] += 1
+    return visits
+
+
+def page_run_ends(paths: List[Chemin]) -> List[List[bool]]:
+    """Fins de suites de pas (voir run_end_flags) des chemins d'une page."""
+    if not HAS_NUMPY or not paths:
+        return [run_end_flags(path_to_codes(path)) for path in paths]
+    batch = PathBatch.from_paths(paths)
+    ends = batch.run_ends()
+    return [row[:length] for row, length in zip(ends.tolist(), batch.lengths.tolist())]
+
+
+def describe_heatmap(visits: List[List[int]], total: int) -> str:
+    """Tableau texte des passages par point, en % des chemins (haut de la grille en premier)."""
+    if not total:
+        return ""
+    m, n = len(visits) - 1, len(visits[0]) - 1
+    lines = ["Passages par point (% des chemins) :"]
+    for y in range(n, -1, -1):
+        lines.append(" ".join(f"{100 * visits[x][y] / total:5.1f}" for x in range(m + 1)))
+    return "\n".join(lines)
+
+
+# --- Énumération parallèle (plusieurs processus) ---
+_process_pool = None
+_process_pool_size = 0
+
+
+def _init_worker() -> None:
+    # processus créé (fork) depuis un calcul profilé (Instrumentation) : il
+    # hériterait du profileur du thread, qui le ralentirait beaucoup
+    sys.setprofile(None)
+
+
+def get_process_pool(workers: int):
+    """Renvoie un pool de processus partagé (recréé si le nombre change)."""
+    global _process_pool, _process_pool_size
+    if _process_pool is None or _process_pool_size != workers:
+        if _process_pool is not None:
+            _process_pool.shutdown(wait=False, cancel_futures=True)
+        from concurrent.futures import ProcessPoolExecutor   # pas au démarrage de la fenêtre
+        _process_pool = ProcessPoolExecutor(max_workers=workers, initializer=_init_worker)
+        _process_pool_size = workers
+    return _process_pool
+
+
+def split_grid_prefixes(m: int, n: int, min_units: int, prune: bool = True,
+                        max_depth: int = 64,
+                        first_move: Optional[int] = None) -> List[Tuple[str, Tuple[int, ...]]]:
+    """Découpe l'arbre du DFS en sous-arbres indépendants.
+
+    On descend niveau par niveau jusqu'à avoir au moins `min_units` préfixes.
+    Renvoie, dans l'ordre du DFS, des éléments ("chemin", cellules) pour les
+    chemins plus courts que la profondeur de coupe et ("prefixe", cellules)
+    pour chaque sous-arbre restant à énumérer.
+    """
+    walker = GridPathWalker(m, n, prune, first_move)
+    if walker.done:
+        return []
+    if walker.start == walker.end:
+        return [("chemin", (walker.start,))]
+    units = [("prefixe", (walker.start,))]
+    for _depth in range(max_depth):
+        if sum(1 for kind, _cells in units if kind == "prefixe") >= min_units:
+            break
+        new_units = []
+        expanded = False
+        for kind, cells in units:
+            if kind == "chemin":
+                new_units.append((kind, cells))
+                continue
+            expanded = True
+            visited = walker.border
+            for cell in cells:
+                visited |= 1 << cell
+            for nb, bit, _code in walker.table[cells[-1]]:
+                if visited & bit:
+                    continue
+                if nb == walker.end:
+                    new_units.append(("chemin", cells + (nb,)))
+                    continue
+                if prune:
+                    reach = walker.end_component(visited | bit) | (1 << walker.end)
+                    if not any(reach & b for _nb, b, _c in walker.table[nb]):
+                        continue
+                new_units.append(("prefixe", cells + (nb,)))
+        units = new_units
+        if not expanded:
+            break
+    return units
+
+
+def _grid_subtree_worker(args: tuple):
+    """Travail d'un processus : énumère un sous-arbre du DFS.
+
+    Renvoie (chemins, statistiques, (cases visitées, branches coupées)) : les
+    chemins dans un PackedPathStore (peu coûteux à transférer), ou None si
+    mode == "stats" ; les statistiques dans un PathStats.
+    """
+    m, n, prune, prefix, mode, first_move = args
+    walker = GridPathWalker(m, n, prune, first_move, track_stats=True)
+    walker.restore((prefix, False), subtree=True)
+    stats = PathStats()
+    if mode == "stats":
+        for summary in walker.iter_summaries():
+            stats.add_summary(summary)
+        return None, stats, (walker.nodes, walker.prunes)
+    store = PackedPathStore()
+    for codes in walker.iter_codes():
+        store.append_codes(codes)
+        stats.add_summary(walker.summary)
+    return store, stats, (walker.nodes, walker.prunes)
+
+
+def _run_grid_parallel(m: int, n: int, workers: int, prune: bool, mode: str,
+                       first_move: Optional[int] = None):
+    """Énumère la grille par sous-arbres ; renvoie les triplets (chemins,
+    statistiques, compteurs du DFS) de _grid_subtree_worker dans l'ordre du DFS.
+    Fermer le générateur annule les sous-arbres pas encore commencés."""
+    units = split_grid_prefixes(m, n, workers * 8, prune, first_move=first_move)
+    walker = GridPathWalker(m, n)
+    jobs = [(m, n, prune, cells, mode, first_move) for kind, cells in units if kind == "prefixe"]
+    results = get_process_pool(workers).map(_grid_subtree_worker, jobs)
+    try:
+        for kind, cells in units:
+            if kind == "chemin":
+                codes = walker.to_codes(cells)
+                stats = PathStats()
+                stats.add_codes(codes)
+                store = None
+                if mode != "stats":
+                    store = PackedPathStore()
+                    store.append_codes(codes)
+                yield store, stats, (0, 0)
+            else:
+                yield next(results)
+    finally:
+        results.close()
+
+
+def find_all_paths_packed(m: int, n: int, workers: Optional[int] = None,
+                          prune: bool = True,
+                          first_move: Optional[int] = None) -> PackedPathStore:
+    """Énumère tous les chemins de la grille dans un PackedPathStore, réparti
+    sur `workers` processus. L'ordre est exactement celui du DFS séquentiel."""
+    workers = workers or os.cpu_count() or 1
+    store = PackedPathStore()
+    if workers <= 1:
+        for codes in GridPathWalker(m, n, prune, first_move).iter_codes():
+            store.append_codes(codes)
+        return store
+    for chunk, _stats, _nodes in _run_grid_parallel(m, n, workers, prune, "paths", first_move):
+        store.extend_store(chunk)
+    return store
+
+
+def find_all_paths_symmetric(m: int, n: int, workers: Optional[int] = None,
+                             prune: bool = True):
+    """Tous les chemins de la grille ; pour une grille carrée, seule la moitié
+    qui commence vers la droite est énumérée (MirroredPaths reconstruit l'autre).
+
+    Pour une grille non carrée, c'est find_all_paths_packed (ordre du DFS).
+    """
+    if not has_diagonal_symmetry(m, n):
+        return find_all_paths_packed(m, n, workers, prune)
+    return MirroredPaths(find_all_paths_packed(m, n, workers, prune, first_move=0))
+
+
+def find_all_paths_parallel(m: int, n: int, workers: Optional[int] = None,
+                            prune: bool = True) -> List[Chemin]:
+    """Comme find_all_paths, mais réparti sur `workers` processus.
+
+    L'ordre des chemins est exactement celui du DFS séquentiel.
+    """
+    workers = workers or os.cpu_count() or 1
+    if workers <= 1:
+        return list(iter_grid_paths(m, n, prune))
+    return list(find_all_paths_packed(m, n, workers, prune))
+
+
+def grid_path_statistics(m: int, n: int, workers: Optional[int] = None,
+                         prune: bool = True) -> "PathStats":
+    """PathStats de tous les chemins de la grille, en une seule énumération
+    (répartie sur `workers` processus) qui ne garde aucun chemin.
+
+    Grille carrée : on ne parcourt que les chemins qui commencent vers la
+    droite et on ajoute les statistiques de leurs images par la diagonale.
+    """
+    workers = workers or os.cpu_count() or 1
+    first_move = 0 if has_diagonal_symmetry(m, n) else None
+    stats = PathStats()
+    if workers <= 1:
+        for summary in GridPathWalker(m, n, prune, first_move, track_stats=True).iter_summaries():
+            stats.add_summary(summary)
+    else:
+        for _chunk, chunk_stats, _nodes in _run_grid_parallel(m, n, workers, prune, "stats", first_move):
+            stats.merge(chunk_stats)
+    if first_move is not None:
+        stats.merge(stats.mirrored())
+    return stats
+
+
+def count_paths_parallel(m: int, n: int, workers: Optional[int] = None,
+                         prune: bool = True) -> Tuple[int, int, int]:
+    """(total, avec_haut, avec_gauche) par énumération parallèle, sans garder
+    les chemins (vérification de grid_path_stats)."""
+    return grid_path_statistics(m, n, workers, prune).counts()
+
+
+class LazyPathSequence:
+    """Séquence de chemins produite page par page, à la demande.
+
+    S'utilise comme une liste (indexation, total() pour le nombre de chemins :
+    len() ne dépasse pas sys.maxsize) mais ne garde en mémoire que
+    quelques pages récentes. Un point de reprise du DFS est mémorisé au début
+    de chaque page rencontrée, donc revenir en arrière ou avancer d'une page ne
+    coûte que l'énumération d'une page (plus la page d'avance préparée).
+
+    Avec un GridPathIndex, une page lointaine n'est pas atteinte en énumérant
+    toutes celles d'avant : le dernier chemin de la page précédente est
+    reconstruit directement (unrank) et sert de point de reprise.
+
+    Sur une grande grille, cela prend encore plusieurs secondes : l'interface
+    lit les pages dans un thread (PageFetcher) et ne regarde elle-même que les
+    pages déjà en mémoire (cached), sans attendre ce thread.
+    """
+
+    JUMP_PAGES = 2   # au-delà, on saute par l'index plutôt que d'énumérer
+
+    def __init__(self, walker_factory: Callable[[], GridPathWalker], total: int,
+                 page_size: int, lookahead: int = 1, max_pages: int = 4,
+                 index: Optional["GridPathIndex"] = None):
+        self._walker = walker_factory()
+        self._total = total
+        self.page_size = page_size
+        self.lookahead = lookahead
+        self.max_pages = max(max_pages, lookahead + 1)
+        self.index = index
+        self._checkpoints: Dict[int, tuple] = {0: self._walker.checkpoint()}  # début de page
+        self._pages: "OrderedDict[int, List[Chemin]]" = OrderedDict()
+        self._lock = threading.Lock()   # le DFS n'avance que dans un thread à la fois
+
+    def __len__(self) -> int:
+        return self._total
+
+    def total(self) -> int:
+        """Nombre de chemins, même au-delà de sys.maxsize (len() échoue alors)."""
+        return self._total
+
+    def __getitem__(self, index: int) -> Chemin:
+        if index < 0:
+            index += self._total
+        if not 0 <= index < self._total:
+            raise IndexError("indice de chemin hors limites")
+        page, offset = divmod(index, self.page_size)
+        return self.page(page)[offset]
+
+    def cached(self, start: int, stop: int) -> Optional[List[Chemin]]:
+        """Chemins start .. stop - 1 s'ils sont déjà en mémoire, sinon None
+        (sans énumérer ni attendre le thread qui énumère)."""
+        if not self._lock.acquire(blocking=False):
+            return None
+        try:
+            paths = []
+            for index in range(start, stop):
+                page, offset = divmod(index, self.page_size)
+                cached = self._pages.get(page)
+                if cached is None or offset >= len(cached):
+                    return None
+                paths.append(cached[offset])
+            return paths
+        finally:
+            self._lock.release()
+
+    def page(self, page: int) -> List[Chemin]:
+        """Renvoie les chemins de la page demandée (énumérés si besoin)."""
+        with self._lock:
+            return self._page(page)
+
+    def _page(self, page: int) -> List[Chemin]:
+        cached = self._pages.get(page)
+        if cached is not None:
+            self._pages.move_to_end(page)
+            return cached
+
+        # repartir du point de reprise connu le plus proche avant la page
+        current = max(p for p in self._checkpoints if p <= page)
+        if self.index is not None and page - current > self.JUMP_PAGES:
+            cells = self.index.unrank(page * self.page_size - 1)
+            self._checkpoints[page] = (tuple(cells), False)
+            current = page
+        self._walker.restore(self._checkpoints[current])
+        while current <= page + self.lookahead:
+            paths: List[Chemin] = []
+            while len(paths) < self.page_size:
+                path = self._walker.next_path()
+                if path is None:
+                    break
+                paths.append(path)
+            if current + 1 not in self._checkpoints and len(paths) == self.page_size:
+                self._checkpoints[current + 1] = self._walker.checkpoint()
+            if current >= page:
+                self._pages[current] = paths
+                self._pages.move_to_end(current)
+            if len(paths) < self.page_size:
+                break
+            current += 1
+
+        while len(self._pages) > self.max_pages:
+            self._pages.popitem(last=False)
+        return self._pages.get(page, [])
+
+
+def cached_paths(paths, start: int, stop: int) -> Optional[List[Chemin]]:
+    """Chemins start .. stop - 1 d'une source, ou None s'il faudrait les
+    énumérer (séquence page par page) : à lire alors avec PageFetcher."""
+    cached = getattr(paths, "cached", None)
+    if cached is not None:
+        return cached(start, stop)
+    return [paths[k] for k in range(start, stop)]
+
+
+class PageFetcher:
+    """Lecture de pages de chemins dans un thread, pour ne pas bloquer la
+    fenêtre quand une page doit être énumérée (LazyPathSequence).
+
+    request() remplace la demande en attente : seule la dernière page
+    demandée est lue (celle en cours de lecture se termine quand même).
+    L'interface lit la file `messages` avec root.after :
+
+    - ("page", clé, chemins) : chemins start .. stop - 1 de la demande ;
+    - ("error", clé, exception).
+
+    busy() reste vrai jusqu'à ce que le message de la dernière demande soit
+    dans la file.
+    """
+
+    def __init__(self):
+        self.messages: "queue.Queue[tuple]" = queue.Queue()
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._pending: Optional[tuple] = None
+        self._working = False
+        self._thread: Optional[threading.Thread] = None
+
+    def request(self, key, paths, start: int, stop: int) -> None:
+        with self._lock:
+            self._pending = (key, paths, start, stop)
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, daemon=True)
+                self._thread.start()
+        self._wakeup.set()
+
+    def busy(self) -> bool:
+        with self._lock:
+            return self._working or self._pending is not None
+
+    def _run(self) -> None:
+        while True:
+            self._wakeup.wait()
+            with self._lock:
+                job, self._pending = self._pending, None
+                self._wakeup.clear()
+                self._working = job is not None
+            if job is None:
+                continue
+            key, paths, start, stop = job
+            try:
+                message = ("page", key, [paths[k] for k in range(start, stop)])
+            except Exception as exc:   # remonté à l'interface
+                message = ("error", key, exc)
+            self.messages.put(message)
+            with self._lock:
+                self._working = False
+
+
+def stored_codes(paths, index: int) -> Optional[List[int]]:
+    """Codes de direction du chemin `index`, lus directement dans les codes
+    sur 2 bits d'un PackedPathStore / MappedPathStore (à travers
+    MirroredPaths et FilteredPaths), ou None si la source n'en garde pas
+    (liste, LazyPathSequence : utiliser path_to_codes sur le chemin)."""
+    if isinstance(paths, FilteredPaths):
+        return stored_codes(paths.source, paths.source_index(index))
+    if isinstance(paths, MirroredPaths):
+        codes = stored_codes(paths.base, index // 2)
+        if codes is None or index % 2 == 0:
+            return codes
+        return [code ^ 1 for code in codes]   # image : droite <-> haut, gauche <-> bas
+    read = getattr(paths, "codes", None)
+    return read(index) if read is not None else None
+
+
+def path_count(paths) -> int:
+    """Nombre de chemins d'une source : total() pour les séquences énumérées à
+    la demande (le nombre peut dépasser sys.maxsize, que len() ne sait pas
+    renvoyer), len() pour les chemins en mémoire ou sur disque."""
+    total = getattr(paths, "total", None)
+    return total() if total is not None else len(paths)
+
+
+# --- Accès direct au k-ième chemin (rang / « unrank ») ---
+class GridPathIndex:
+    """Numérotation des chemins de la grille dans l'ordre du DFS, sans énumérer.
+
+    Le nombre de chemins qui prolongent un préfixe ne dépend que de sa
+    dernière case et des cases déjà prises ; il se calcule avec
+    count_simple_paths (cases prises interdites) et est gardé en cache
+    (COUNT_CACHE_SIZE entrées, les plus anciennes oubliées). unrank(k) descend
+    l'arbre du DFS en sautant les sous-arbres entiers qui précèdent le k-ième
+    chemin, rank(chemin) fait l'inverse : chacun coûte un comptage par pas du
+    chemin, quel que soit k. first_move comme pour GridPathWalker.
+    """
+
+    COUNT_CACHE_SIZE = 100_000
+
+    def __init__(self, m: int, n: int, first_move: Optional[int] = None):
+        self.m = m
+        self.n = n
+        self._walker = GridPathWalker(m, n, first_move=first_move)
+        self._counts: "OrderedDict[Tuple[int, int], int]" = OrderedDict()
+        self._total: Optional[int] = None
+
+    def total(self) -> int:
+        """Nombre de chemins (pas de __len__ : il peut dépasser sys.maxsize)."""
+        if self._total is None:
+            walker = self._walker
+            if walker.start < 0:
+                self._total = 0
+            else:
+                self._total = self.completions([walker.start], walker.border | (1 << walker.start))
+        return self._total
+
+    def completions(self, cells: List[int], visited: int) -> int:
+        """Nombre de chemins complets qui prolongent le préfixe `cells`."""
+        walker = self._walker
+        head = cells[-1]
+        if head == walker.end:
+            return 1
+        if len(cells) == 1:
+            # départ : seulement les premiers pas autorisés (first_move)
+            return sum(
+                self.completions([head, nb], visited | bit)
+                for nb, bit, _code in walker.table[head] if not visited & bit
+            )
+        key = (head, visited)
+        count = self._counts.get(key)
+        if count is None:
+            coords = walker.coords
+            count = count_simple_paths(
+                self.m, self.n, coords[head], coords[walker.end], [coords[c] for c in cells[:-1]]
+            )
+            self._counts[key] = count
+            if len(self._counts) > self.COUNT_CACHE_SIZE:
+                self._counts.popitem(last=False)
+        else:
+            self._counts.move_to_end(key)
+        return count
+
+    def unrank(self, k: int) -> List[int]:
+        """Cellules (voir GridPathWalker) du k-ième chemin, en comptant depuis 0."""
+        if not 0 <= k < self.total():
+            raise IndexError("indice de chemin hors limites")
+        walker = self._walker
+        cells = [walker.start]
+        visited = walker.border | (1 << walker.start)
+        while cells[-1] != walker.end:
+            for nb, bit, _code in walker.table[cells[-1]]:
+                if visited & bit:
+                    continue
+                count = self.completions(cells + [nb], visited | bit)
+                if k < count:
+                    cells.append(nb)
+                    visited |= bit
+                    break
+                k -= count
+            else:
+                raise RuntimeError("comptage incohérent dans GridPathIndex")
+        return cells
+
+    def path(self, k: int) -> Chemin:
+        """Le k-ième chemin, en coordonnées (x, y)."""
+        return self._walker.to_points(self.unrank(k))
+
+    def rank(self, path: Chemin) -> int:
+        """Numéro d'un chemin (inverse de path) ; ValueError s'il n'en fait pas partie."""
+        walker = self._walker
+        width = walker.width
+        cells = [(y + 1) * width + x + 1 for x, y in path]
+        if not cells or cells[0] != walker.start or cells[-1] != walker.end:
+            raise ValueError("le chemin ne va pas du départ à l'arrivée")
+        k = 0
+        visited = walker.border | (1 << walker.start)
+        for i, nxt in enumerate(cells[1:], 1):
+            for nb, bit, _code in walker.table[cells[i - 1]]:
+                if nb == nxt:
+                    break
+                if not visited & bit:
+                    k += self.completions(cells[:i] + [nb], visited | bit)
+            else:
+                raise ValueError("pas impossible dans le chemin")
+            if visited & (1 << nxt):
+                raise ValueError("le chemin repasse par une case")
+            visited |= 1 << nxt
+        return k
+
+
+# --- Échantillon aléatoire de chemins (grandes grilles) ---
+SAMPLE_SIZE = 48                 # chemins affichés (4 pages de 12)
+EXACT_SAMPLING_MAX_CELLS = 40    # au-delà, les comptages exacts deviennent trop lents
+SAMPLE_WALKS = 2000              # marches aléatoires pour l'échantillonnage préférentiel
+SAMPLE_TIME_BUDGET = 1.5         # secondes, au plus, pour ces marches
+Z_95 = 1.96                      # quantile de la loi normale pour un intervalle à 95 %
+
+
+class GridPathSampler:
+    """Tirage aléatoire de chemins de (0,0) à (m,n), parmi les mêmes chemins
+    que find_all_paths.
+
+    - exact_sample : tirage uniforme exact, par numéro (GridPathIndex) ;
+    - importance_sample : pour les grilles où les comptages exacts sont trop
+      lents. Marche aléatoire qui choisit uniformément parmi les voisins d'où
+      l'arrivée reste atteignable (comme l'élagage de GridPathWalker) : elle
+      finit toujours, et le produit des nombres de choix vaut 1 / probabilité
+      du chemin. La moyenne de ces poids estime sans biais le nombre de
+      chemins ; les chemins affichés sont retirés parmi les marches selon leur
+      poids, ce qui les rend à peu près uniformes.
+    """
+
+    def __init__(self, m: int, n: int, rng: Optional[random.Random] = None):
+        self.m = m
+        self.n = n
+        self.rng = rng or random.Random()
+        self._walker = GridPathWalker(m, n)
+
+    def exact_possible(self) -> bool:
+        return (self.m + 1) * (self.n + 1) <= EXACT_SAMPLING_MAX_CELLS
+
+    def exact_sample(self, size: int = SAMPLE_SIZE) -> Tuple[List[Chemin], List[int]]:
+        """`size` chemins tirés uniformément (avec remise), rangés dans l'ordre
+        du DFS ; renvoie aussi leurs numéros."""
+        index = GridPathIndex(self.m, self.n)
+        total = index.total()
+        if total == 0:
+            return [], []
+        numbers = sorted(self.rng.randrange(total) for _ in range(size))
+        return [index.path(k) for k in numbers], numbers
+
+    def random_walk(self) -> Tuple[List[int], int]:
+        """Un chemin (cellules) tiré par la marche, et son poids 1 / probabilité."""
+        walker = self._walker
+        table = walker.table
+        end = walker.end
+        end_bit = 1 << end
+        cell = walker.start
+        cells = [cell]
+        visited = walker.border | (1 << cell)
+        reach = walker.end_component(visited)
+        weight = 1
+        while cell != end:
+            choices = [(nb, bit) for nb, bit, _code in table[cell] if bit == end_bit or reach & bit]
+            weight *= len(choices)
+            cell, bit = self.rng.choice(choices)
+            visited |= bit
+            cells.append(cell)
+            if cell != end:
+                reach = walker.end_component(visited)
+        return cells, weight
+
+    def importance_sample(self, size: int = SAMPLE_SIZE, walks: int = SAMPLE_WALKS,
+                          time_budget: float = SAMPLE_TIME_BUDGET) -> Tuple[List[Chemin], dict]:
+        """Chemins retirés parmi les marches selon leur poids, et estimations
+        (total, part des chemins avec haut / avec gauche, intervalles à 95 %)."""
+        walker = self._walker
+        if walker.start < 0:
+            return [], {}
+        deadline = time.monotonic() + time_budget
+        drawn: List[Tuple[List[int], int]] = []
+        while len(drawn) < walks and (len(drawn) < size or time.monotonic() < deadline):
+            drawn.append(self.random_walk())
+
+        # poids ramenés dans [0, 1] pour les calculs en flottants (ils peuvent
+        # dépasser la taille d'un float sur les très grandes grilles)
+        biggest = max(weight for _cells, weight in drawn)
+        scaled = [weight / biggest for _cells, weight in drawn]
+        codes = [walker.to_codes(cells) for cells, _weight in drawn]
+
+        mean, half_width = _mean_ci(scaled)
+        estimates = {
+            "walks": len(drawn),
+            "total": (_scale_big(mean, biggest),
+                      _scale_big(max(mean - half_width, 0.0), biggest),
+                      _scale_big(mean + half_width, biggest)),
+            **direction_shares(codes, scaled),
+        }
+        chosen = self.rng.choices(range(len(drawn)), weights=scaled, k=size)
+        return [walker.to_points(drawn[i][0]) for i in chosen], estimates
+
+
+def _mean_ci(values: List[float]) -> Tuple[float, float]:
+    """Moyenne et demi-largeur de l'intervalle de confiance à 95 %."""
+    count = len(values)
+    mean = sum(values) / count
+    if count < 2:
+        return mean, math.inf
+    variance = sum((v - mean) ** 2 for v in values) / (count - 1)
+    return mean, Z_95 * math.sqrt(variance / count)
+
+
+def _ratio_ci(weights: List[float], flags: List[float]) -> Tuple[float, float, float]:
+    """Part pondérée sum(w*f) / sum(w) et son intervalle à 95 % (méthode delta)."""
+    count = len(weights)
+    total_weight = sum(weights)
+    ratio = sum(w * f for w, f in zip(weights, flags)) / total_weight
+    if count < 2:
+        return ratio, 0.0, 1.0
+    mean_weight = total_weight / count
+    residuals = [w * (f - ratio) for w, f in zip(weights, flags)]
+    variance = sum(r * r for r in residuals) / (count - 1)
+    half_width = Z_95 * math.sqrt(variance / count) / mean_weight
+    return ratio, max(ratio - half_width, 0.0), min(ratio + half_width, 1.0)
+
+
+def direction_shares(codes: List[List[int]], weights: Optional[List[float]] = None
+                     ) -> Dict[str, Tuple[float, float, float]]:
+    """Part des chemins d'un échantillon (donnés par leurs codes de direction,
+    voir path_to_codes) qui ont un pas vers le haut / vers la gauche, avec
+    intervalles à 95 % : {"with_up": (part, bas, haut), "with_left": ...}.
+    Sans `weights`, chaque chemin compte pour un (tirage uniforme)."""
+    if weights is None:
+        weights = [1.0] * len(codes)
+    return {
+        "with_up": _ratio_ci(weights, [1.0 if 1 in c else 0.0 for c in codes]),
+        "with_left": _ratio_ci(weights, [1.0 if 2 in c else 0.0 for c in codes]),
+    }
+
+
+def _scale_big(fraction: float, big: int) -> int:
+    """fraction * big en entier, sans passer big en float."""
+    if math.isinf(fraction):
+        return -1
+    numerator, denominator = fraction.as_integer_ratio()
+    return big * numerator // denominator
+
+
+def format_big(value: int) -> str:
+    """Écrit un grand entier en notation scientifique courte (5.758e8)."""
+    if value < 0:
+        return "?"
+    if value < 10 ** 6:
+        return str(value)
+    digits = str(value)
+    return f"{digits[0]}.{digits[1:4]}e{len(digits) - 1}"
+
+
+# --- Symétrie diagonale des grilles carrées ---
+def has_diagonal_symmetry(m: int, n: int) -> bool:
+    """Vrai si (x, y) -> (y, x) envoie les chemins de la grille sur eux-mêmes."""
+    return m == n and m > 0
+
+
+def mirror_path(path: Chemin) -> Chemin:
+    """Image d'un chemin par la diagonale (codes : droite <-> haut, gauche <-> bas)."""
+    return [(y, x) for x, y in path]
+
+
+class MirroredPaths:
+    """Chemins d'une grille carrée reconstruits à partir de la moitié qui
+    commence vers la droite.
+
+    La symétrie (x, y) -> (y, x) échange les chemins qui commencent vers la
+    droite et ceux qui commencent vers le haut, sans point fixe : `base`
+    (PackedPathStore, MappedPathStore, LazyPathSequence...) n'en contient que
+    la moitié. Le chemin 2k est base[k], le chemin 2k+1 son image, calculée à
+    la lecture ; les numéros ne changent pas quand `base` grandit pendant un
+    calcul en arrière-plan.
+    """
+
+    def __init__(self, base):
+        self.base = base
+
+    def __len__(self) -> int:
+        return 2 * len(self.base)
+
+    def total(self) -> int:
+        """Nombre de chemins, même au-delà de sys.maxsize (len() échoue alors)."""
+        return 2 * path_count(self.base)
+
+    def __getitem__(self, index: int) -> Chemin:
+        total = self.total()
+        if index < 0:
+            index += total
+        if not 0 <= index < total:
+            raise IndexError("indice de chemin hors limites")
+        path = self.base[index // 2]
+        return mirror_path(path) if index % 2 else path
+
+    def __iter__(self) -> Iterator[Chemin]:
+        for path in self.base:
+            yield path
+            yield mirror_path(path)
+
+    def cached(self, start: int, stop: int) -> Optional[List[Chemin]]:
+        """Comme LazyPathSequence.cached (None si `base` doit énumérer)."""
+        base_start = start // 2
+        base = cached_paths(self.base, base_start, (stop + 1) // 2)
+        if base is None:
+            return None
+        paths = []
+        for index in range(start, stop):
+            path = base[index // 2 - base_start]
+            paths.append(mirror_path(path) if index % 2 else path)
+        return paths
+
+    def close(self) -> None:
+        close = getattr(self.base, "close", None)
+        if close is not None:
+            close()
+
+
+def lazy_grid_paths(m: int, n: int, total: int, page_size: int):
+    """Chemins d'une grande grille énumérés page par page (LazyPathSequence),
+    seulement sur une moitié pour une grille carrée."""
+    if not has_diagonal_symmetry(m, n):
+        return LazyPathSequence(lambda: GridPathWalker(m, n, prune=True), total, page_size,
+                                index=GridPathIndex(m, n))
+    half = LazyPathSequence(
+        lambda: GridPathWalker(m, n, prune=True, first_move=0), total // 2, (page_size + 1) // 2,
+        index=GridPathIndex(m, n, first_move=0),
+    )
+    return MirroredPaths(half)
+
+
+# --- Chemins sur l'hypercube de dimension d (sommets = entiers) ---
+def hypercube_vertex(vertex: int, d: int) -> Tuple[int, ...]:
+    """Coordonnées 0/1 d'un sommet : le bit i est la coordonnée i."""
+    return tuple((vertex >> i) & 1 for i in range(d))
+
+
+class HypercubePathWalker:
+    """DFS à pile explicite sur l'hypercube Q_d, du sommet 0 au sommet 2^d - 1.
+
+    Les sommets sont les entiers 0 .. 2^d - 1 et les voisins d'un sommet
+    s'obtiennent en changeant un seul bit (v ^ (1 << i)), essayés dans l'ordre
+    des coordonnées : c'est l'ordre des anciens modes cube 3D et cube 4D.
+    Chemins simples : les sommets visités sont un masque de 2^d bits (un
+    entier). Avec monotone=True, on ne fait que passer des bits de 0 à 1 :
+    chaque chemin a d pas et il y en a d!.
+
+    Comme GridPathWalker, l'énumération est paresseuse (iter_vertices /
+    iter_paths) : sur Q5 ou Q6, on lit les premiers chemins sans attendre
+    la fin. `nodes` compte les sommets empilés.
+    """
+
+    def __init__(self, d: int, monotone: bool = False):
+        self.d = d
+        self.monotone = monotone
+        self.start = 0
+        self.end = (1 << d) - 1 if d >= 0 else -1
+        self.nodes = 0
+        self._cells = self._run()
+
+    def iter_vertices(self) -> Iterator[Tuple[int, ...]]:
+        """Chemins restants, en numéros de sommets."""
+        for path in self._cells:
+            yield tuple(path)
+
+    def iter_paths(self) -> Iterator[List[Tuple[int, ...]]]:
+        """Chemins restants, en coordonnées 0/1 (comme les modes cube)."""
+        d = self.d
+        coords = [hypercube_vertex(v, d) for v in range(1 << d)]
+        for path in self._cells:
+            yield [coords[v] for v in path]
+
+    def _run(self) -> Iterator[List[int]]:
+        d = self.d
+        if d < 0:
+            return
+        end = self.end
+        path = [self.start]
+        if self.start == end:
+            yield path
+            return
+        bits = [1 << i for i in range(d)]
+        monotone = self.monotone
+        visited = 1 << self.start
+        stack = [iter(bits)]
+        nodes = 0
+        while stack:
+            current = path[-1]
+            for bit in stack[-1]:
+                nb = current ^ bit
+                if monotone:
+                    if current & bit:
+                        continue
+                elif visited >> nb & 1:
+                    continue
+                visited |= 1 << nb
+                path.append(nb)
+                nodes += 1
+                if nb == end:
+                    self.nodes = nodes
+                    yield path
+                    stack.append(iter(()))
+                else:
+                    stack.append(iter(bits))
+                break
+            else:
+                stack.pop()
+                visited ^= 1 << path.pop()
+        self.nodes = nodes
+
+
+HYPERCUBE_COUNT_MAX_DIM = 4   # chemins simples comptés jusqu'à Q4 (voir count_hypercube_paths)
+
+
+def count_hypercube_paths(d: int, monotone: bool = False) -> int:
+    """Nombre de chemins de 0 à 2^d - 1 sur Q_d, sans les énumérer.
+
+    Monotones : d!. Simples : DFS mémorisé sur (sommet courant, sommets
+    visités). Seuls comptent les sommets encore atteignables : on remplace
+    l'ensemble visité par le complémentaire de la composante libre du sommet
+    courant, ce qui fusionne beaucoup d'états, et on abandonne dès que
+    l'arrivée n'y est plus. Par symétrie des coordonnées, on ne compte que
+    les chemins dont le premier pas change le bit 0. Exact mais exponentiel :
+    instantané jusqu'à Q4 (6432 chemins) ; au-delà de HYPERCUBE_COUNT_MAX_DIM,
+    le comptage ne finit pas (plus de 2 Go sur Q5) et lève ValueError :
+    utiliser HypercubePathWalker pour parcourir les chemins.
+    """
+    if d < 0:
+        return 0
+    if monotone:
+        return math.factorial(d)
+    if d > HYPERCUBE_COUNT_MAX_DIM:
+        raise ValueError(f"comptage des chemins simples impossible au-delà de la "
+                         f"dimension {HYPERCUBE_COUNT_MAX_DIM} (demandé : {d})")
+    if d == 0:
+        return 1
+    end = (1 << d) - 1
+    everything = (1 << (1 << d)) - 1
+    bits = [1 << i for i in range(d)]
+    memo: Dict[Tuple[int, int], int] = {}
+
+    def free_component(current: int, visited: int) -> int:
+        seen = 1 << current
+        todo = [current]
+        while todo:
+            v = todo.pop()
+            for bit in bits:
+                nb = v ^ bit
+                if not (visited | seen) >> nb & 1:
+                    seen |= 1 << nb
+                    todo.append(nb)
+        return seen
+
+    def count_from(current: int, visited: int) -> int:
+        if current == end:
+            return 1
+        key = (current, visited)
+        total = memo.get(key)
+        if total is not None:
+            return total
+        component = free_component(current, visited)
+        total = 0
+        if component >> end & 1:
+            outside = everything & ~component
+            for bit in bits:
+                nb = current ^ bit
+                if component >> nb & 1:
+                    total += count_from(nb, outside | (1 << current) | (1 << nb))
+        memo[key] = total
+        return total
+
+    return d * count_from(1, 0b11)
+
+
+# --- Filtrage des chemins par propriétés (index de requêtes) ---
+# Propriétés d'un chemin qu'on peut filtrer ; « points » (points visités) vaut longueur + 1.
+QUERY_FEATURES = ("longueur", "droite", "haut", "gauche", "bas", "virages")
+QUERY_NAMES = QUERY_FEATURES + ("points",)
+_QUERY_TERM = re.compile(r"\s*(\w+)\s*(<=|>=|!=|==|=|<|>)\s*(\w+)\s*(?:,|;|\bet\b|$)?", re.IGNORECASE)
+
+
+def parse_path_query(text: str) -> List[Tuple[str, str, object]]:
+    """Lit un filtre comme « gauche=0 bas=3 » ou « longueur=min, virages<=4 ».
+
+    Renvoie les conditions (propriété, opérateur, valeur), toutes à vérifier ;
+    la valeur est un entier, ou "min" / "max" (extrêmes parmi les chemins).
+    """
+    conditions = []
+    position = 0
+    text = text.strip()
+    while position < len(text):
+        match = _QUERY_TERM.match(text, position)
+        if match is None or match.end() == position:
+            raise ValueError(f"filtre incompris près de « {text[position:]} »")
+        name, op, value = match.group(1).lower(), match.group(2), match.group(3).lower()
+        if name not in QUERY_NAMES:
+            raise ValueError(f"propriété inconnue « {name} » (possibles : {', '.join(QUERY_NAMES)})")
+        if value not in ("min", "max"):
+            if not value.isdigit():
+                raise ValueError(f"valeur invalide « {value} » pour {name}")
+            value = int(value)
+        conditions.append((name, "=" if op == "==" else op, value))
+        position = match.end()
+    return conditions
+
+
+def _iter_path_codes(paths) -> Iterator[List[int]]:
+    """Codes de direction de chaque chemin, sans repasser par les coordonnées
+    pour les stockages compacts."""
+    if isinstance(paths, MirroredPaths):
+        for codes in _iter_path_codes(paths.base):
+            yield codes
+            yield [code ^ 1 for code in codes]   # image par la diagonale
+    elif isinstance(paths, PackedPathStore):
+        for index in range(len(paths)):
+            yield paths.codes(index)
+    else:
+        for index in range(len(paths)):
+            yield path_to_codes(paths[index])
+
+
+class PathQueryIndex:
+    """Colonnes de propriétés et index triés sur un ensemble de chemins fixé,
+    pour répondre aux filtres (parse_path_query) sans reparcourir les chemins.
+
+    Pour chaque propriété de QUERY_FEATURES, `columns` donne sa valeur pour
+    chaque chemin, et l'index trié range les numéros de chemins par valeur
+    croissante (dans l'ordre d'origine à valeur égale) : les chemins dont la
+    valeur est dans [a, b] forment une tranche contiguë, trouvée en O(1) par
+    la table `_starts`. Un filtre part de la propriété la plus sélective, ne
+    vérifie les autres conditions que sur cette tranche, et les résultats des
+    derniers filtres sont gardés. Tableaux NumPy si HAS_NUMPY, array sinon.
+    """
+
+    RESULT_CACHE_SIZE = 32
+
+    def __init__(self, paths):
+        self.paths = paths
+        self.count = len(paths)
+        self.columns = self._build_columns(paths)
+        self._order = {}
+        self._starts: Dict[str, List[int]] = {}
+        for name, column in self.columns.items():
+            self._order[name], self._starts[name] = self._sort_column(column)
+        self._results: "OrderedDict[tuple, object]" = OrderedDict()
+
+    @staticmethod
+    def _build_columns(paths) -> dict:
+        if HAS_NUMPY:
+            parts: Dict[str, list] = {name: [] for name in QUERY_FEATURES}
+            for batch in iter_path_batches(paths):
+                counts = batch.direction_counts()
+                parts["longueur"].append(batch.lengths)
+                for code, name in enumerate(QUERY_FEATURES[1:5]):
+                    parts[name].append(counts[:, code])
+                parts["virages"].append(batch.turn_counts())
+            return {name: np.concatenate(chunks).astype(np.int32) if chunks else np.zeros(0, np.int32)
+                    for name, chunks in parts.items()}
+        columns = {name: array("H") for name in QUERY_FEATURES}
+        lengths, turns = columns["longueur"], columns["virages"]
+        per_direction = [columns[name] for name in QUERY_FEATURES[1:5]]
+        for codes in _iter_path_codes(paths):
+            counts = [0, 0, 0, 0]
+            changes = 0
+            previous = -1
+            for code in codes:
+                counts[code] += 1
+                if previous >= 0 and code != previous:
+                    changes += 1
+                previous = code
+            lengths.append(len(codes))
+            for column, count in zip(per_direction, counts):
+                column.append(count)
+            turns.append(changes)
+        return columns
+
+    @staticmethod
+    def _sort_column(column) -> tuple:
+        """Tri par dénombrement (les valeurs sont de petits entiers) :
+        numéros de chemins rangés par valeur, et début de chaque valeur."""
+        if HAS_NUMPY:
+            order = np.argsort(column, kind="stable")
+            sizes = np.bincount(column) if len(column) else np.zeros(0, np.int64)
+            return order, [0] + np.cumsum(sizes).tolist()
+        buckets: List[List[int]] = []
+        for index, value in enumerate(column):
+            while len(buckets) <= value:
+                buckets.append([])
+            buckets[value].append(index)
+        order = array("I" if len(column) < 1 << 32 else "Q")
+        starts = [0]
+        for bucket in buckets:
+            order.extend(bucket)
+            starts.append(len(order))
+        return order, starts
+
+    def minimum(self, name: str) -> int:
+        starts = self._starts[name]
+        return next((value for value in range(len(starts) - 1) if starts[value + 1] > starts[value]), 0)
+
+    def maximum(self, name: str) -> int:
+        return max(len(self._starts[name]) - 2, 0)
+
+    def _slice(self, name: str, low: int, high: int) -> Tuple[int, int]:
+        """Positions, dans l'index trié de `name`, des chemins de valeur low..high."""
+        starts = self._starts[name]
+        last = len(starts) - 1
+        return starts[min(max(low, 0), last)], starts[min(max(high + 1, 0), last)]
+
+    def query(self, conditions: List[Tuple[str, str, object]]):
+        """Numéros (croissants) des chemins qui vérifient toutes les conditions."""
+        bounds: Dict[str, List[int]] = {}
+        excluded: List[Tuple[str, int]] = []
+        for name, op, value in conditions:
+            shift = 0
+            if name == "points":
+                name, shift = "longueur", 1
+            if value == "min":
+                value = self.minimum(name) + shift
+            elif value == "max":
+                value = self.maximum(name) + shift
+            value -= shift
+            low, high = bounds.setdefault(name, [0, self.maximum(name)])
+            if op == "=":
+                low, high = max(low, value), min(high, value)
+            elif op == "<":
+                high = min(high, value - 1)
+            elif op == "<=":
+                high = min(high, value)
+            elif op == ">":
+                low = max(low, value + 1)
+            elif op == ">=":
+                low = max(low, value)
+            else:   # "!="
+                excluded.append((name, value))
+            bounds[name] = [low, high]
+        key = (tuple(sorted((name, tuple(b)) for name, b in bounds.items())), tuple(sorted(excluded)))
+        result = self._results.get(key)
+        if result is None:
+            result = self._run_query(bounds, excluded)
+            self._results[key] = result
+            while len(self._results) > self.RESULT_CACHE_SIZE:
+                self._results.popitem(last=False)
+        else:
+            self._results.move_to_end(key)
+        return result
+
+    def _run_query(self, bounds: Dict[str, List[int]], excluded: List[Tuple[str, int]]):
+        empty = np.zeros(0, np.int64) if HAS_NUMPY else array("Q")
+        if any(low > high for low, high in bounds.values()):
+            return empty
+        slices = {name: self._slice(name, low, high) for name, (low, high) in bounds.items()}
+        if slices:
+            # on part de la condition qui garde le moins de chemins
+            first = min(slices, key=lambda name: slices[name][1] - slices[name][0])
+            start, stop = slices.pop(first)
+            candidates = self._order[first][start:stop]
+        else:
+            candidates = np.arange(self.count) if HAS_NUMPY else range(self.count)
+        checks = [(name, bounds[name][0], bounds[name][1]) for name in slices]
+        if HAS_NUMPY:
+            candidates = np.sort(candidates)
+            keep = np.ones(len(candidates), dtype=bool)
+            for name, low, high in checks:
+                values = self.columns[name][candidates]
+                keep &= (values >= low) & (values <= high)
+            for name, value in excluded:
+                keep &= self.columns[name][candidates] != value
+            return candidates[keep]
+        columns = self.columns
+        return array("Q", sorted(
+            index for index in candidates
+            if all(low <= columns[name][index] <= high for name, low, high in checks)
+            and all(columns[name][index] != value for name, value in excluded)
+        ))
+
+
+class FilteredPaths:
+    """Vue sur les chemins retenus par un filtre : le chemin k de la vue est le
+    chemin indices[k] de `source` (ordre d'origine conservé)."""
+
+    def __init__(self, source, indices, query: str = ""):
+        self.source = source
+        self.indices = indices
+        self.query = query
+
+    def __len__(self) -> int:
+        return len(self.indices)
+
+    def __getitem__(self, index: int) -> Chemin:
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("indice de chemin hors limites")
+        return self.source[int(self.indices[index])]
+
+    def __iter__(self) -> Iterator[Chemin]:
+        for index in range(len(self)):
+            yield self[index]
+
+    def source_index(self, index: int) -> int:
+        """Numéro, dans `source`, du chemin k de la vue."""
+        return int(self.indices[index])
+
+
+# --- Stockage sur disque (fichier binaire relu par mmap) ---
+PATH_FILE_MAGIC = b"CHEMINS1"
+PATH_FILE_VERSION = 1
+# magic, version, m, n, drapeaux, nombre de chemins
+PATH_FILE_HEADER = struct.Struct("<8sIIIIQ")
+PATH_FILE_COMPLETE = 1   # énumération terminée
+PATH_FILE_HALF = 2       # grille carrée : seulement les chemins qui commencent vers la droite
+PATH_STORE_DIR = os.path.join(os.path.expanduser("~"), ".chemins_grille")
+
+
+def path_store_filename(m: int, n: int) -> str:
+    """Emplacement du fichier de chemins pour une grille (m, n)."""
+    return os.path.join(PATH_STORE_DIR, f"grille_{m}x{n}.chemins")
+
+
+class PathFileWriter:
+    """Écrit des chemins au fil de l'énumération dans un fichier binaire.
+
+    Le fichier contient un en-tête fixe (PATH_FILE_HEADER), la table des
+    offsets (count+1 entiers 64 bits, en pas) puis les codes sur 2 bits, dans le
+    même format que PackedPathStore. Le nombre de chemins doit être connu à
+    l'avance (count_grid_paths) pour placer les codes après la table. On écrit
+    dans un fichier « .part » renommé seulement à la fin : un fichier présent
+    sous son nom définitif est toujours complet.
+    """
+
+    FLUSH_BYTES = 1 << 20
+
+    def __init__(self, filename: str, m: int, n: int, count: int, half: bool = False):
+        self.filename = filename
+        self.m = m
+        self.n = n
+        self.count = count
+        self.half = half
+        os.makedirs(os.path.dirname(filename) or ".", exist_ok=True)
+        self._tmp_name = filename + ".part"
+        self._file = open(self._tmp_name, "w+b")
+        self._file.write(PATH_FILE_HEADER.pack(
+            PATH_FILE_MAGIC, PATH_FILE_VERSION, m, n, PATH_FILE_HALF if half else 0, count))
+        self._codes_start = PATH_FILE_HEADER.size + 8 * (count + 1)
+        self._steps = 0
+        self._paths = 0
+        self._offsets = array("Q", [0])   # offsets pas encore écrits
+        self._offsets_written = 0
+        self._pending = bytearray()        # codes pas encore écrits
+        self._bytes_written = 0
+
+    def append_codes(self, codes: List[int]) -> None:
+        if self._paths >= self.count:
+            raise ValueError("plus de chemins que prévu dans l'en-tête")
+        chunk = pack_codes(codes, self._steps)
+        if self._steps % 4 and chunk:
+            self._pending[-1] |= chunk[0]
+            chunk = chunk[1:]
+        self._pending.extend(chunk)
+        self._steps += len(codes)
+        self._paths += 1
+        self._offsets.append(self._steps)
+        if len(self._pending) >= self.FLUSH_BYTES:
+            self._flush()
+
+    def append_store(self, store: PackedPathStore) -> None:
+        for index in range(len(store)):
+            self.append_codes(store.codes(index))
+
+    def _flush(self, final: bool = False) -> None:
+        # le dernier octet reste en attente tant qu'il n'est pas complet
+        keep = 1 if self._steps % 4 and not final else 0
+        data = self._pending[:len(self._pending) - keep]
+        self._file.seek(self._codes_start + self._bytes_written)
+        self._file.write(data)
+        self._bytes_written += len(data)
+        del self._pending[:len(data)]
+
+        offsets = self._offsets
+        if sys.byteorder != "little":
+            offsets = array("Q", offsets)
+            offsets.byteswap()
+        self._file.seek(PATH_FILE_HEADER.size + 8 * self._offsets_written)
+        self._file.write(offsets.tobytes())
+        self._offsets_written += len(self._offsets)
+        self._offsets = array("Q")
+
+    def close(self) -> str:
+        """Termine le fichier (il doit contenir `count` chemins) et renvoie son nom."""
+        if self._paths != self.count:
+            self.abort()
+            raise ValueError(f"{self._paths} chemins écrits, {self.count} attendus")
+        self._flush(final=True)
+        self._file.seek(0)
+        flags = PATH_FILE_COMPLETE | (PATH_FILE_HALF if self.half else 0)
+        self._file.write(PATH_FILE_HEADER.pack(
+            PATH_FILE_MAGIC, PATH_FILE_VERSION, self.m, self.n, flags, self.count))
+        self._file.close()
+        os.replace(self._tmp_name, self.filename)
+        return self.filename
+
+    def abort(self) -> None:
+        """Abandonne l'écriture et supprime le fichier partiel."""
+        if not self._file.closed:
+            self._file.close()
+        if os.path.exists(self._tmp_name):
+            os.remove(self._tmp_name)
+
+
+class MappedPathStore(PackedPathStore):
+    """PackedPathStore lu directement dans un fichier projeté en mémoire (mmap).
+
+    Les offsets et les codes sont des memoryview sur la projection : rien n'est
+    copié, le système ne charge que les pages du fichier réellement lues.
+    """
+
+    def __init__(self, filename: str):
+        self.filename = filename
+        with open(filename, "rb") as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            magic, version, m, n, flags, count = PATH_FILE_HEADER.unpack_from(self._mmap, 0)
+            if magic != PATH_FILE_MAGIC or version != PATH_FILE_VERSION or not flags & PATH_FILE_COMPLETE:
+                raise ValueError(f"fichier de chemins invalide ou incomplet : {filename}")
+        except (ValueError, struct.error):
+            self._mmap.close()
+            raise
+        self.m = m
+        self.n = n
+        self.half = bool(flags & PATH_FILE_HALF)
+        view = memoryview(self._mmap)
+        start = PATH_FILE_HEADER.size
+        codes_start = start + 8 * (count + 1)
+        if sys.byteorder == "little":
+            self._offsets = view[start:codes_start].cast("Q")
+        else:
+            self._offsets = array("Q", view[start:codes_start].tobytes())
+            self._offsets.byteswap()
+        self._codes = view[codes_start:]
+
+    def append_codes(self, codes: List[int]) -> None:
+        raise TypeError("un MappedPathStore est en lecture seule")
+
+    def nbytes(self) -> int:
+        return 0   # tout est dans le fichier projeté
+
+    def close(self) -> None:
+        if self._mmap.closed:
+            return
+        if isinstance(self._offsets, memoryview):
+            self._offsets.release()
+        self._codes.release()
+        self._mmap.close()
+
+
+def write_grid_path_file(m: int, n: int, workers: int = 1,
+                         filename: Optional[str] = None) -> MappedPathStore:
+    """Énumère tous les chemins de la grille directement dans un fichier, puis
+    l'ouvre en mmap. La mémoire utilisée ne dépend pas du nombre de chemins."""
+    filename = filename or path_store_filename(m, n)
+    writer = PathFileWriter(filename, m, n, count_grid_paths(m, n))
+    try:
+        if workers <= 1:
+            for codes in GridPathWalker(m, n, prune=True).iter_codes():
+                writer.append_codes(codes)
+        else:
+            for store, _stats, _nodes in _run_grid_parallel(m, n, workers, True, "paths"):
+                writer.append_store(store)
+        writer.close()
+    except BaseException:
+        writer.abort()
+        raise
+    return MappedPathStore(filename)
+
+
+# --- Instrumentation (facultative) ---
+INSTRUMENTATION_ENV = "CHEMINS_INSTRUMENTATION"   # =1 : activée dès le démarrage
+
+
+class Instrumentation:
+    """Compteurs et temps des calculs, pour voir où passe le temps.
+
+    Désactivée par défaut. Les calculs ne l'appellent qu'à la fin d'une
+    étape, jamais dans les boucles du DFS (les compteurs de GridPathWalker,
+    `nodes` et `prunes`, existent de toute façon) : désactivée, elle ne coûte
+    qu'un test par étape. Activée (variable d'environnement
+    CHEMINS_INSTRUMENTATION=1 ou menu « Débogage » de la fenêtre), elle
+    garde pour chaque compteur la dernière valeur et le cumul, et chaque
+    énumération GridSearch est profilée avec cProfile (thread du calcul,
+    pas les processus du pool) ; dump_profile écrit le dernier profil.
+    Un seul profil à la fois : un calcul lancé pendant qu'un autre (annulé
+    mais pas encore arrêté) est profilé tourne sans profileur. Depuis
+    Python 3.12, cProfile refuse d'ailleurs deux profileurs actifs.
+    """
+
+    def __init__(self, enabled: bool = False):
+        self.enabled = enabled
+        self._lock = threading.Lock()
+        self.last: Dict[str, float] = {}
+        self.totals: Dict[str, float] = {}
+        self.units: Dict[str, str] = {}
+        self.last_profile = None   # cProfile.Profile du dernier calcul
+        self._profiling = False    # un profileur est actif (un seul à la fois)
+
+    def _add(self, name: str, value: float, unit: str) -> None:
+        with self._lock:
+            self.last[name] = value
+            self.totals[name] = self.totals.get(name, 0) + value
+            self.units[name] = unit
+
+    def add_count(self, name: str, value: int) -> None:
+        if self.enabled:
+            self._add(name, value, "")
+
+    def add_time(self, name: str, seconds: float) -> None:
+        if self.enabled:
+            self._add(name, seconds, "s")
+
+    def reset(self) -> None:
+        with self._lock:
+            self.last.clear()
+            self.totals.clear()
+            self.units.clear()
+
+    def describe(self) -> str:
+        """Texte du panneau des compteurs : dernière valeur et cumul."""
+        with self._lock:
+            if not self.last:
+                return "Aucune mesure pour l'instant."
+            lines = []
+            for name, value in self.last.items():
+                unit = self.units[name]
+                if unit == "s":
+                    lines.append(f"{name} : {value * 1000:.1f} ms (cumul {self.totals[name]:.2f} s)")
+                else:
+                    lines.append(f"{name} : {value:,} (cumul {self.totals[name]:,})".replace(",", " "))
+            return "\n".join(lines)
+
+    def start_profile(self):
+        """Profileur cProfile démarré pour le thread courant, ou None
+        (instrumentation désactivée ou autre profil en cours)."""
+        if not self.enabled:
+            return None
+        with self._lock:
+            if self._profiling:
+                return None
+            self._profiling = True
+        import cProfile   # seulement quand on profile
+        profiler = cProfile.Profile()
+        try:
+            profiler.enable()
+        except ValueError:   # autre outil de profilage actif (Python 3.12+)
+            with self._lock:
+                self._profiling = False
+            return None
+        return profiler
+
+    def stop_profile(self, profiler) -> None:
+        if profiler is not None:
+            profiler.disable()
+            self.last_profile = profiler
+            with self._lock:
+                self._profiling = False
+
+    def dump_profile(self, filename: str) -> bool:
+        """Écrit le profil du dernier calcul (fichier .prof, à lire avec
+        pstats ou snakeviz) ; False s'il n'y en a pas."""
+        if self.last_profile is None:
+            return False
+        self.last_profile.dump_stats(filename)
+        return True
+
+
+instrumentation = Instrumentation(os.environ.get(INSTRUMENTATION_ENV, "") not in ("", "0"))
+
+
+# --- Calcul en arrière-plan (thread) ---
+class GridSearch:
+    """Énumération des chemins de la grille dans un thread, pour ne pas
+    bloquer la fenêtre.
+
+    Le thread commence par le comptage (grid_path_stats, sauf si `total` est
+    déjà connu) puis énumère selon la taille : en mémoire, dans un fichier
+    (to_disk) ou pas du tout si la grille sera parcourue page par page.
+    L'interface lit la file `messages` avec root.after :
+
+    - ("stats", total, avec_haut, avec_gauche) : comptage terminé ;
+    - ("progress", chemins, cases visitées, secondes) : au plus toutes les
+      PROGRESS_INTERVAL secondes ;
+    - ("done", résultat) : PackedPathStore, MappedPathStore, ou None pour une
+      grille trop grande à parcourir page par page ;
+    - ("cancelled", chemins trouvés) ou ("error", exception).
+
+    Les chemins déjà trouvés sont lisibles dans `paths` pendant le calcul : on
+    ne fait qu'ajouter en fin de `store`, et un chemin n'est visible (len)
+    qu'une fois tous ses codes écrits. En mode fichier, `store` ne garde qu'un
+    aperçu d'environ FULL_ENUMERATION_LIMIT chemins. Pour une grille carrée,
+    seule la moitié qui commence vers la droite est énumérée et `paths` est un
+    MirroredPaths autour de `store`. Les statistiques (PathStats) sont
+    remplies au fil de l'énumération, voir path_stats() ; les passages par
+    point (`heatmap`) sont comptés à la fin, jusqu'à HEATMAP_MAX_PATHS chemins.
+    """
+
+    PROGRESS_INTERVAL = 0.2
+    CHECK_EVERY = 256   # chemins entre deux tests d'annulation (un seul processus)
+
+    def __init__(self, m: int, n: int, workers: int = 1, to_disk: bool = False,
+                 total: Optional[int] = None):
+        self.m = m
+        self.n = n
+        self.workers = workers
+        self.to_disk = to_disk
+        self.total = total
+        self.half = has_diagonal_symmetry(m, n)
+        self.first_move = 0 if self.half else None
+        self.store = PackedPathStore()
+        self.paths = MirroredPaths(self.store) if self.half else self.store
+        self.paths_found = 0   # chemins énumérés (images par symétrie comprises)
+        self.nodes = 0
+        self.prunes = 0
+        self.stats = PathStats()   # chemins énumérés seulement (sans les images)
+        self.heatmap: Optional[List[List[int]]] = None   # passages par point, voir path_heatmap
+        self.messages: "queue.Queue[tuple]" = queue.Queue()
+        self._cancel = threading.Event()
+        self._writing = threading.Lock()   # tenu pendant l'écriture du fichier
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._started = self._last_report = 0.0
+
+    def start(self) -> None:
+        self._started = self._last_report = time.monotonic()
+        self._thread.start()
+
+    def cancel(self) -> None:
+        """Demande l'arrêt ; le thread s'arrête au prochain test d'annulation."""
+        self._cancel.set()
+
+    def wait_file(self) -> None:
+        """Attend que le fichier en cours d'écriture soit fermé ou supprimé
+        (à appeler après cancel() avant de relancer la même grille)."""
+        with self._writing:
+            pass
+
+    def elapsed(self) -> float:
+        return time.monotonic() - self._started
+
+    def path_stats(self) -> PathStats:
+        """Statistiques des chemins trouvés, images par symétrie comprises
+        (à lire une fois le calcul terminé ou arrêté)."""
+        if not self.half:
+            return self.stats
+        stats = PathStats()
+        stats.merge(self.stats)
+        stats.merge(self.stats.mirrored())
+        return stats
+
+    def _run(self) -> None:
+        profiler = None
+        try:
+            profiler = instrumentation.start_profile()   # None si pas de profil
+            complete, result = self._search()
+        except Exception as exc:   # remonté à l'interface, le thread ne doit pas mourir en silence
+            self.messages.put(("error", exc))
+            return
+        finally:
+            instrumentation.stop_profile(profiler)
+        self.messages.put(("progress", self.paths_found, self.nodes, self.elapsed()))
+        if complete:
+            self.messages.put(("done", result))
+        else:
+            self.messages.put(("cancelled", self.paths_found))
+
+    def _tick(self) -> bool:
+        """Envoie la progression si besoin ; True si l'arrêt a été demandé."""
+        now = time.monotonic()
+        if now - self._last_report >= self.PROGRESS_INTERVAL:
+            self._last_report = now
+            self.messages.put(("progress", self.paths_found, self.nodes, now - self._started))
+        return self._cancel.is_set()
+
+    def _search(self) -> Tuple[bool, object]:
+        m, n = self.m, self.n
+        if self.total is None:
+            started = time.perf_counter()
+            total, with_up, with_left = grid_path_stats(m, n)
+            instrumentation.add_time("comptage (DP)", time.perf_counter() - started)
+            self.total = total
+            self.messages.put(("stats", total, with_up, with_left))
+        if self._cancel.is_set():
+            return False, None
+        # nombre de chemins vraiment énumérés et gardés
+        count = self.total // 2 if self.half else self.total
+        if count > FULL_ENUMERATION_LIMIT and not self.to_disk:
+            return True, None
+        workers = self.workers if count >= PARALLEL_MIN_PATHS else 1
+
+        started = time.perf_counter()
+        with self._writing:
+            if self._cancel.is_set():
+                return False, None
+            writer = None
+            if count > FULL_ENUMERATION_LIMIT:
+                writer = PathFileWriter(path_store_filename(m, n), m, n, count, self.half)
+            try:
+                if workers <= 1:
+                    complete = self._search_sequential(writer)
+                else:
+                    complete = self._search_parallel(workers, writer)
+                if not complete:
+                    if writer is not None:
+                        writer.abort()
+                    return False, None
+                if writer is None:
+                    result = self.paths
+                else:
+                    stored = MappedPathStore(writer.close())
+                    result = MirroredPaths(stored) if self.half else stored
+            except BaseException:
+                if writer is not None:
+                    writer.abort()
+                raise
+        if instrumentation.enabled:
+            instrumentation.add_time("énumération", time.perf_counter() - started)
+            instrumentation.add_count("cases visitées (DFS)", self.nodes)
+            instrumentation.add_count("branches coupées", self.prunes)
+            instrumentation.add_count("chemins produits", self.paths_found)
+        if count <= HEATMAP_MAX_PATHS:
+            started = time.perf_counter()
+            self.heatmap = path_heatmap(result, m, n)
+            instrumentation.add_time("carte des passages", time.perf_counter() - started)
+        return True, result
+
+    def _search_sequential(self, writer: Optional[PathFileWriter]) -> bool:
+        walker = GridPathWalker(self.m, self.n, prune=True, first_move=self.first_move,
+                                track_stats=True)
+        store = self.store
+        stats = self.stats
+        step = 2 if self.half else 1
+        check_every = self.CHECK_EVERY
+        found = 0
+        for codes in walker.iter_codes():
+            if writer is not None:
+                writer.append_codes(codes)
+                if found < FULL_ENUMERATION_LIMIT:
+                    store.append_codes(codes)
+            else:
+                store.append_codes(codes)
+            stats.add_summary(walker.summary)
+            found += 1
+            if found % check_every == 0:
+                self.paths_found = found * step
+                self.nodes = walker.nodes
+                if self._tick():
+                    return False
+        self.paths_found = found * step
+        self.nodes = walker.nodes
+        self.prunes = walker.prunes
+        return True
+
+    def _search_parallel(self, workers: int, writer: Optional[PathFileWriter]) -> bool:
+        chunks = _run_grid_parallel(self.m, self.n, workers, True, "paths", self.first_move)
+        try:
+            for chunk, chunk_stats, (nodes, prunes) in chunks:
+                self.stats.merge(chunk_stats)
+                if writer is not None:
+                    writer.append_store(chunk)
+                if writer is None or len(self.store) < FULL_ENUMERATION_LIMIT:
+                    self.store.extend_store(chunk)
+                self.paths_found += len(chunk) * (2 if self.half else 1)
+                self.nodes += nodes
+                self.prunes += prunes
+                if self._tick():
+                    return False
+        finally:
+            chunks.close()
+        return True
+
+
+# --- Cache des résultats (mémoire + disque) ---
+# À augmenter dès que le format ou le contenu des résultats change : les
+# entrées du cache disque d'une autre version sont supprimées à la lecture.
+CACHE_VERSION = 2
+
+
+class ResultCache:
+    """Cache à deux niveaux des calculs, par (mode, m, n).
+
+    - en mémoire : les `memory_entries` derniers résultats (LRU), objets tels
+      quels (PackedPathStore, MappedPathStore, LazyPathSequence, listes) ;
+    - sur disque, dans `directory` : un fichier JSON par entrée (version,
+      total, texte des statistiques, et les chemins du cube s'il y en a) plus,
+      pour la grille énumérée entièrement, le fichier de chemins binaire lu par
+      MappedPathStore (une moitié seulement pour une grille carrée). Au-delà
+      de `max_disk_bytes`, les entrées les moins récemment utilisées sont
+      supprimées.
+
+    Une entrée vaut {"paths": ..., "stats": str, "total": int} ; "paths" est
+    None quand seuls les nombres sont gardés (grille parcourue page par page).
+    """
+
+    def __init__(self, directory: str, memory_entries: int = 8,
+                 max_disk_bytes: int = 512 * 1024 * 1024):
+        self.directory = directory
+        self.memory_entries = memory_entries
+        self.max_disk_bytes = max_disk_bytes
+        self._memory: "OrderedDict[tuple, dict]" = OrderedDict()
+
+    def _meta_filename(self, mode: str, m: int, n: int) -> str:
+        return os.path.join(self.directory, f"{mode}_{m}x{n}.json")
+
+    def _paths_filename(self, mode: str, m: int, n: int) -> str:
+        return os.path.join(self.directory, f"grille_{m}x{n}.chemins")
+
+    def holds(self, paths) -> bool:
+        """Vrai si cet objet de chemins appartient au cache (à ne pas fermer)."""
+        return any(entry["paths"] is paths for entry in self._memory.values())
+
+    def get(self, mode: str, m: int, n: int) -> Optional[dict]:
+        key = (mode, m, n)
+        entry = self._memory.get(key)
+        if entry is not None:
+            self._memory.move_to_end(key)
+            return entry
+        entry = self._load(mode, m, n)
+        if entry is not None:
+            self._remember(key, entry)
+        return entry
+
+    def put(self, mode: str, m: int, n: int, paths, stats: str, total: int) -> None:
+        entry = {"paths": paths, "stats": stats, "total": total}
+        self._remember((mode, m, n), entry)
+        try:
+            self._store(mode, m, n, entry)
+        except OSError:
+            pass   # disque plein ou en lecture seule : le cache mémoire suffit
+
+    def _remember(self, key: tuple, entry: dict) -> None:
+        self._memory[key] = entry
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.memory_entries:
+            _key, old = self._memory.popitem(last=False)
+            close = getattr(old["paths"], "close", None)
+            if close is not None:
+                close()
+
+    def _load(self, mode: str, m: int, n: int) -> Optional[dict]:
+        meta_name = self._meta_filename(mode, m, n)
+        try:
+            with open(meta_name, encoding="utf-8") as f:
+                meta = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if meta.get("version") != CACHE_VERSION:
+            self._remove(mode, m, n)
+            return None
+        paths = meta.get("paths")
+        if paths is not None:
+            paths = [[tuple(v) for v in path] for path in paths]
+        if meta.get("paths_file"):
+            try:
+                paths = MappedPathStore(self._paths_filename(mode, m, n))
+            except (OSError, ValueError, struct.error):
+                self._remove(mode, m, n)
+                return None
+            if paths.half:
+                paths = MirroredPaths(paths)
+        os.utime(meta_name)
+        return {"paths": paths, "stats": meta["stats"], "total": meta["total"]}
+
+    def _store(self, mode: str, m: int, n: int, entry: dict) -> None:
+        os.makedirs(self.directory, exist_ok=True)
+        paths = entry["paths"]
+        half = isinstance(paths, MirroredPaths)
+        if half:
+            paths = paths.base
+        meta = {"version": CACHE_VERSION, "mode": mode, "m": m, "n": n,
+                "total": entry["total"], "stats": entry["stats"]}
+        paths_name = self._paths_filename(mode, m, n)
+        if isinstance(paths, MappedPathStore):
+            meta["paths_file"] = os.path.abspath(paths.filename) == os.path.abspath(paths_name)
+        elif isinstance(paths, PackedPathStore):
+            paths.save(paths_name, m, n, half)
+            meta["paths_file"] = True
+        elif isinstance(paths, list):
+            meta["paths"] = paths
+        with open(self._meta_filename(mode, m, n), "w", encoding="utf-8") as f:
+            json.dump(meta, f)
+        self._evict(keep=(mode, m, n))
+
+    def _entries_on_disk(self) -> List[Tuple[float, int, tuple]]:
+        """(dernier accès, taille, clé) de chaque entrée du cache disque."""
+        entries = []
+        for name in os.listdir(self.directory):
+            if not name.endswith(".json"):
+                continue
+            try:
+                mode, dims = name[:-5].split("_")
+                m, n = (int(v) for v in dims.split("x"))
+                meta_name = os.path.join(self.directory, name)
+                size = os.path.getsize(meta_name)
+                paths_name = self._paths_filename(mode, m, n)
+                if mode == "grid" and os.path.exists(paths_name):
+                    size += os.path.getsize(paths_name)
+                entries.append((os.path.getmtime(meta_name), size, (mode, m, n)))
+            except (ValueError, OSError):
+                continue
+        return entries
+
+    def _evict(self, keep: tuple) -> None:
+        entries = sorted(self._entries_on_disk())
+        used = sum(size for _t, size, _key in entries)
+        for _t, size, key in entries:
+            if used <= self.max_disk_bytes:
+                break
+            if key == keep or key in self._memory:
+                continue
+            self._remove(*key)
+            used -= size
+
+    def _remove(self, mode: str, m: int, n: int) -> None:
+        for name in (self._meta_filename(mode, m, n), self._paths_filename(mode, m, n)):
+            if mode != "grid" and name.endswith(".chemins"):
+                continue
+            try:
+                os.remove(name)
+            except OSError:
+                pass
+
+
+# --- Chemins du cube et de l'hypercube 4D (modes de l'interface) ---
+def find_all_cube_paths() -> List[List[Tuple[int, int, int]]]:
+    """Tous les chemins simples entre (0,0,0) et (1,1,1) sur le cube 0/1 (18 chemins)."""
+    return list(HypercubePathWalker(3).iter_paths())
+
+
+def find_all_hypercube_paths_4d() -> List[List[Tuple[int, int, int, int]]]:
+    """Tous les chemins monotones entre (0,0,0,0) et (1,1,1,1) : on ne fait
+    que passer des coordonnées de 0 à 1, donc 4! = 24 chemins de 4 pas."""
+    return list(HypercubePathWalker(4, monotone=True).iter_paths())
+
+
+# --- Calcul en lot (ligne de commande) ---
+BATCH_MODES = ("grid", "cube", "cube4")
+BATCH_FIELDS = ("mode", "m", "n", "total", "with_up", "with_left", "enumerated",
+                "mean_length", "mean_turns", "seconds", "peak_memory_kb")
+
+
+def parse_int_range(text: str) -> List[int]:
+    """« 4 », « 2-6 » ou « 1,3,5-7 » -> liste triée d'entiers (sans doublons)."""
+    values = set()
+    for part in text.replace(" ", "").split(","):
+        if not part:
+            continue
+        low, sep, high = part.partition("-")
+        try:
+            first = int(low)
+            last = int(high) if sep else first
+        except ValueError:
+            raise ValueError(f"intervalle invalide : « {part} »") from None
+        if last < first:
+            raise ValueError(f"intervalle vide : « {part} »")
+        values.update(range(first, last + 1))
+    if not values:
+        raise ValueError("aucune valeur")
+    return sorted(values)
+
+
+def batch_configurations(modes: List[str], ms: List[int], ns: List[int]) -> List[Tuple[str, int, int]]:
+    """(mode, m, n) à calculer ; le cube et le cube 4D ne dépendent pas de
+    (m, n) : une seule configuration (0, 0), comme dans ResultCache."""
+    configurations = []
+    for mode in modes:
+        if mode == "grid":
+            configurations.extend(("grid", m, n) for m in ms for n in ns)
+        else:
+            configurations.append((mode, 0, 0))
+    return configurations
+
+
+def batch_record(mode: str, m: int, n: int, workers: int = 1,
+                 max_paths: int = FULL_ENUMERATION_LIMIT) -> Dict[str, object]:
+    """Mêmes calculs que les boutons « Calculer » pour une configuration :
+    nombres de chemins (DP), puis, si la grille a au plus max_paths chemins,
+    une énumération (sans garder les chemins) pour les longueurs et virages.
+    Le temps est mesuré ici ; la mémoire est ajoutée par _batch_job.
+
+    Pour le cube et le cube 4D, pas de with_up / with_left (il n'y a ni haut
+    ni gauche) : ces champs sont absents de l'enregistrement, vides en CSV."""
+    started = time.perf_counter()
+    record: Dict[str, object] = dict.fromkeys(BATCH_FIELDS)
+    record.update(mode=mode, m=m, n=n, enumerated=False)
+    if mode == "grid":
+        total, with_up, with_left = grid_path_stats(m, n)
+        record.update(total=total, with_up=with_up, with_left=with_left)
+        if 0 < total <= max_paths:
+            stats = grid_path_statistics(m, n, workers if total >= PARALLEL_MIN_PATHS else 1)
+            stats.counts()
+            record.update(
+                enumerated=True,
+                mean_length=round(sum(k * c for k, c in stats.lengths.items()) / stats.total, 4),
+                mean_turns=round(sum(k * c for k, c in stats.turns.items()) / stats.total, 4),
+            )
+    else:
+        paths = find_all_cube_paths() if mode == "cube" else find_all_hypercube_paths_4d()
+        del record["with_up"], record["with_left"]
+        mean_length = sum(len(path) - 1 for path in paths) / len(paths)
+        record.update(
+            total=len(paths),
+            enumerated=True,
+            mean_length=round(mean_length, 4),
+            # deux pas de suite changent toujours deux coordonnées différentes
+            # (sinon on reviendrait au sommet d'avant) : un virage par pas après le premier
+            mean_turns=round(mean_length - 1, 4),
+        )
+    record["seconds"] = round(time.perf_counter() - started, 4)
+    return record
+
+
+def peak_rss_kb() -> Optional[int]:
+    """Mémoire de pointe (RSS) du processus depuis son démarrage, en Kio,
+    ou None si le système ne la donne pas."""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak // 1024 if sys.platform == "darwin" else peak   # octets sous macOS
+
+
+def read_batch_output(filename: str, output_format: str) -> set:
+    """Configurations (mode, m, n) déjà présentes dans un fichier de
+    résultats, pour reprendre un calcul interrompu. Une dernière ligne
+    incomplète (arrêt pendant l'écriture) est retirée du fichier."""
+    import csv   # modules du calcul en lot : importés seulement ici
+    done = set()
+    if not os.path.exists(filename):
+        return done
+    with open(filename, "r", encoding="utf-8", newline="") as handle:
+        content = handle.read()
+    complete = content if content.endswith("\n") else content[:content.rfind("\n") + 1]
+    if complete != content:
+        with open(filename, "w", encoding="utf-8", newline="") as handle:
+            handle.write(complete)
+    if output_format == "csv":
+        rows = csv.DictReader(complete.splitlines())
+    else:
+        rows = (json.loads(line) for line in complete.splitlines() if line.strip())
+    for row in rows:
+        done.add((str(row["mode"]), int(row["m"]), int(row["n"])))
+    return done
+
+
+def _batch_job(mode: str, m: int, n: int, max_paths: int, trace_memory: bool) -> Dict[str, object]:
+    """Une configuration du calcul en lot et sa mémoire de pointe, mesurée
+    dans le processus qui la calcule (principal ou processus du pool)."""
+    import tracemalloc
+    tracing = tracemalloc.is_tracing()
+    if trace_memory:
+        if tracing:
+            tracemalloc.reset_peak()
+        else:
+            tracemalloc.start()
+    try:
+        record = batch_record(mode, m, n, 1, max_paths)
+        if trace_memory:
+            record["peak_memory_kb"] = tracemalloc.get_traced_memory()[1] // 1024
+        else:
+            record["peak_memory_kb"] = peak_rss_kb()
+    finally:
+        if trace_memory and not tracing:
+            tracemalloc.stop()
+    return record
+
+
+def run_batch(configurations: List[Tuple[str, int, int]], output, output_format: str = "jsonl",
+              workers: int = 1, max_paths: int = FULL_ENUMERATION_LIMIT,
+              write_header: bool = True, progress=None, trace_memory: bool = False) -> int:
+    """Calcule les configurations et écrit un enregistrement par
+    configuration dès qu'il est prêt (JSON Lines ou CSV).
+
+    Avec workers > 1, chaque configuration entière est une tâche du pool de
+    processus partagé (get_process_pool) : plusieurs grilles sont calculées
+    en même temps, petites comprises, et les enregistrements sont écrits
+    dans l'ordre où elles se terminent (--resume ne dépend pas de l'ordre).
+    Avec workers = 1, tout se fait dans ce processus, dans l'ordre.
+
+    Mémoire de pointe : par défaut, le maximum de RSS du processus qui a
+    calculé la configuration, depuis son démarrage (il ne redescend pas
+    d'une configuration à la suivante). Avec trace_memory=True, le pic des
+    allocations Python de la configuration seule (tracemalloc), beaucoup
+    plus lent. Renvoie le nombre d'enregistrements écrits."""
+    import csv
+    writer = None
+    if output_format == "csv":
+        writer = csv.DictWriter(output, fieldnames=BATCH_FIELDS, lineterminator="\n")
+        if write_header:
+            writer.writeheader()
+    jobs = [(mode, m, n, max_paths, trace_memory) for mode, m, n in configurations]
+    futures = []
+    if workers <= 1:
+        records = (_batch_job(*job) for job in jobs)
+    else:
+        from concurrent.futures import as_completed
+        pool = get_process_pool(workers)
+        futures = [pool.submit(_batch_job, *job) for job in jobs]
+        records = (future.result() for future in as_completed(futures))
+    written = 0
+    try:
+        for record in records:
+            if writer is not None:
+                writer.writerow(record)
+            else:
+                output.write(json.dumps(record) + "\n")
+            output.flush()
+            written += 1
+            if progress is not None:
+                progress(record)
+    finally:
+        for future in futures:
+            future.cancel()   # erreur ou interruption : pas de calcul pour rien
+    return written
+
+
+def batch_main(argv: Optional[List[str]] = None) -> int:
+    """Point d'entrée de `python chemins_grille.py --batch ...` (ou de
+    `python moteur_chemins.py ...`). Renvoie le code de sortie."""
+    import argparse
+    parser = argparse.ArgumentParser(
+        prog="chemins_grille.py --batch",
+        description="Calcule les chemins pour une série de tailles de grille, sans fenêtre.",
+    )
+    parser.add_argument("--batch", action="store_true", help=argparse.SUPPRESS)
+    parser.add_argument("-m", "--m", default="1-4", help="valeurs de m : 4, 2-6 ou 1,3,5-7 (défaut 1-4)")
+    parser.add_argument("-n", "--n", default=None, help="valeurs de n (défaut : celles de m)")
+    parser.add_argument("--modes", default="grid",
+                        help="modes séparés par des virgules parmi grid, cube, cube4 (défaut grid)")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1,
+                        help="processus pour les énumérations (défaut : nombre de cœurs)")
+    parser.add_argument("--max-paths", type=int, default=FULL_ENUMERATION_LIMIT,
+                        help="au-delà, seulement les nombres (DP), sans énumération "
+                             f"(défaut {FULL_ENUMERATION_LIMIT})")
+    parser.add_argument("--format", choices=("jsonl", "csv"), default=None,
+                        help="format de sortie (défaut : d'après l'extension, sinon jsonl)")
+    parser.add_argument("-o", "--output", default=None, help="fichier de résultats (défaut : sortie standard)")
+    parser.add_argument("--resume", action="store_true",
+                        help="reprendre : sauter les configurations déjà dans le fichier de résultats")
+    parser.add_argument("--trace-memory", action="store_true",
+                        help="mémoire de pointe par configuration (tracemalloc, beaucoup plus lent)")
+    args = parser.parse_args(argv)
+
+    try:
+        ms = parse_int_range(args.m)
+        ns = parse_int_range(args.n) if args.n is not None else ms
+    except ValueError as exc:
+        parser.error(str(exc))
+    modes = [mode.strip() for mode in args.modes.split(",") if mode.strip()]
+    unknown = [mode for mode in modes if mode not in BATCH_MODES]
+    if unknown or not modes:
+        parser.error(f"mode inconnu : {', '.join(unknown) or '(aucun)'}")
+    if args.resume and args.output is None:
+        parser.error("--resume demande un fichier de résultats (--output)")
+    output_format = args.format
+    if output_format is None:
+        output_format = "csv" if args.output and args.output.lower().endswith(".csv") else "jsonl"
+
+    configurations = batch_configurations(modes, ms, ns)
+    done = read_batch_output(args.output, output_format) if args.resume else set()
+    remaining = [config for config in configurations if config not in done]
+
+    def progress(record: Dict[str, object]) -> None:
+        print(f"{record['mode']} {record['m']}x{record['n']} : {record['total']} chemins "
+              f"en {record['seconds']} s", file=sys.stderr)
+
+    if args.output is None:
+        output = sys.stdout
+        write_header = True
+    else:
+        write_header = not (args.resume and os.path.exists(args.output) and os.path.getsize(args.output))
+        output = open(args.output, "a" if args.resume else "w", encoding="utf-8", newline="")
+    try:
+        if len(remaining) < len(configurations):
+            print(f"Reprise : {len(configurations) - len(remaining)} configurations déjà calculées",
+                  file=sys.stderr)
+        run_batch(remaining, output, output_format, max(args.workers, 1), args.max_paths,
+                  write_header, progress if args.output is not None else None, args.trace_memory)
+    except KeyboardInterrupt:
+        print("Interrompu : relancer avec --resume pour continuer", file=sys.stderr)
+        return 130
+    finally:
+        if output is not sys.stdout:
+            output.close()
+        if _process_pool is not None:
+            _process_pool.shutdown(cancel_futures=True)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(batch_main())
@@ -0,0 +1,103 @@
+"""Tests du moteur (sans fenêtre) : python -m unittest test_moteur_chemins"""
+import queue
+import shutil
+import tempfile
+import time
+import unittest
+
+import moteur_chemins as moteur
+
+
+def wait_end(search: moteur.GridSearch, timeout: float = 60.0) -> tuple:
+    """Dernier message d'un calcul (done, cancelled ou error)."""
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            message = search.messages.get(timeout=0.1)
+        except queue.Empty:
+            continue
+        if message[0] in ("done", "cancelled", "error"):
+            return message
+    raise AssertionError("le calcul n'a envoyé ni done, ni cancelled, ni error")
+
+
+class OverlappingSearchTest(unittest.TestCase):
+    """Un calcul lancé avant la fin du précédent (bouton « Calculer » pendant
+    un calcul annulé) doit aboutir, instrumentation activée ou non."""
+
+    def setUp(self):
+        self.enabled = moteur.instrumentation.enabled
+        self.store_dir = moteur.PATH_STORE_DIR
+        moteur.instrumentation.enabled = True
+        moteur.PATH_STORE_DIR = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(moteur.PATH_STORE_DIR, ignore_errors=True)
+        moteur.instrumentation.enabled = self.enabled
+        moteur.PATH_STORE_DIR = self.store_dir
+
+    def test_two_overlapping_searches(self):
+        first = moteur.GridSearch(5, 4, workers=1, to_disk=True)
+        first.start()
+        while first.paths_found == 0:   # énumération commencée : profil en cours
+            time.sleep(0.01)
+        try:
+            second = moteur.GridSearch(3, 2, workers=1)
+            second.start()
+            message = wait_end(second)
+            self.assertEqual(message[0], "done", message)
+            self.assertEqual(len(message[1]), 38)
+        finally:
+            first.cancel()
+        self.assertEqual(wait_end(first)[0], "cancelled")
+        first.wait_file()
+        # plus aucun profil en cours : le calcul suivant est de nouveau profilé
+        third = moteur.GridSearch(3, 2, workers=1)
+        third.start()
+        self.assertEqual(wait_end(third)[0], "done")
+        self.assertIsNotNone(moteur.instrumentation.last_profile)
+
+
+class PageFetcherTest(unittest.TestCase):
+    def test_far_page_read_in_thread(self):
+        m, n = 6, 5   # pas carrée : même numérotation que GridPathIndex
+        total = moteur.grid_path_stats(m, n)[0]
+        paths = moteur.lazy_grid_paths(m, n, total, 12)
+        start = total // 2
+        self.assertIsNone(moteur.cached_paths(paths, start, start + 12))   # pas encore énuméré
+        fetcher = moteur.PageFetcher()
+        fetcher.request("page", paths, start, start + 12)
+        kind, key, fetched = fetcher.messages.get(timeout=60)
+        self.assertEqual((kind, key), ("page", "page"))
+        self.assertEqual(fetched, moteur.cached_paths(paths, start, start + 12))
+        index = moteur.GridPathIndex(m, n)
+        self.assertEqual(fetched[0], index.path(start))
+
+
+class PathSummaryTest(unittest.TestCase):
+    def test_summary_from_stored_codes(self):
+        store = moteur.find_all_paths_packed(4, 3, workers=1)
+        for index in range(0, 200, 7):
+            codes = moteur.stored_codes(store, index)
+            self.assertEqual(codes, moteur.path_to_codes(store[index]))
+            counts, turns = moteur.step_summary(codes)
+            self.assertEqual(counts, [codes.count(code) for code in range(4)])
+            self.assertEqual(turns, sum(1 for a, b in zip(codes, codes[1:]) if a != b))
+        mirrored = moteur.MirroredPaths(store)
+        self.assertEqual(moteur.stored_codes(mirrored, 5), moteur.path_to_codes(mirrored[5]))
+        self.assertIsNone(moteur.stored_codes([store[0]], 0))
+
+
+class HypercubeCountTest(unittest.TestCase):
+    def test_counts(self):
+        self.assertEqual(moteur.count_hypercube_paths(3), 18)
+        self.assertEqual(moteur.count_hypercube_paths(4), 6432)
+        self.assertEqual(moteur.count_hypercube_paths(6, monotone=True), 720)
+
+    def test_simple_paths_beyond_q4_refused(self):
+        with self.assertRaises(ValueError):
+            moteur.count_hypercube_paths(5)
+
+
+if __name__ == "__main__":
+    unittest.main()